@@ -0,0 +1,573 @@
+"""Accuracy vs latency evaluation of detector / embedder / liveness backends.
+
+Runs every available backend in models/ over a local labeled folder:
+
+    <data>/enroll/<person>/*.jpg     gallery images (one or more per person)
+    <data>/genuine/<person>/*.jpg    probes of enrolled people
+    <data>/impostor/**/*.jpg         probes of people NOT enrolled
+    <data>/spoof/**/*.jpg            presentation attacks (prints, screens, ...)
+
+and reports, per detector x embedder, TAR@FAR and a threshold table; per
+detector x liveness, APCER / BPCER; and per backend, per-image latency on
+this CPU.
+
+    python -m benchmarks.eval_models --data ~/doorbell_eval
+    python -m benchmarks.eval_models --data ~/doorbell_eval --detectors mediapipe \\
+        --embedders mobilenet_v2,w600k_r50 --liveness modelrgb --json eval.json
+
+Crops are not landmark-aligned, which understates the ArcFace models
+(w600k_r50 / glintr100) relative to their published numbers.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+try:
+    from config import MODEL_DIR, MODEL_PATH, IMG_SIZE, LIVENESS_MODEL_PATH, RECOGNITION_THRESHOLD
+except Exception:
+    MODEL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models")
+    MODEL_PATH = os.path.join(MODEL_DIR, "MobileNet-v2_float.tflite")
+    IMG_SIZE = (224, 224)
+    LIVENESS_MODEL_PATH = os.path.join(MODEL_DIR, "modelrgb.onnx")
+    RECOGNITION_THRESHOLD = 0.5
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+FAR_TARGETS = (1e-1, 1e-2, 1e-3)
+
+
+class BackendUnavailable(Exception):
+    pass
+
+
+def _require_file(path):
+    if not os.path.isfile(path):
+        raise BackendUnavailable(f"missing {os.path.basename(path)}")
+    return path
+
+
+def _onnx_session(path):
+    try:
+        import onnxruntime as ort
+    except Exception as exc:
+        raise BackendUnavailable(f"onnxruntime: {exc}")
+    return ort.InferenceSession(_require_file(path), providers=["CPUExecutionProvider"])
+
+
+def _tflite_interpreter(path):
+    try:
+        import tflite_runtime.interpreter as tflite
+    except Exception:
+        try:
+            from tensorflow import lite as tflite
+        except Exception as exc:
+            raise BackendUnavailable(f"tflite runtime: {exc}")
+    interp = tflite.Interpreter(model_path=_require_file(path), num_threads=4)
+    interp.allocate_tensors()
+    return interp
+
+
+def _largest(boxes):
+    return max(boxes, key=lambda b: (b[2] - b[0]) * (b[3] - b[1])) if boxes else None
+
+
+def _crop(img, box):
+    h, w = img.shape[:2]
+    x1, y1, x2, y2 = (int(round(v)) for v in box)
+    x1, y1 = max(0, x1), max(0, y1)
+    x2, y2 = min(w, x2), min(h, y2)
+    if x2 - x1 < 8 or y2 - y1 < 8:
+        return None
+    return img[y1:y2, x1:x2].copy()
+
+
+# ================================================================
+# Detectors: image -> largest face crop (BGR) or None
+# ================================================================
+class WholeImageDetector:
+    """For datasets that are already face crops."""
+
+    def detect(self, img):
+        return img
+
+
+class MediaPipeDetector:
+    def __init__(self):
+        try:
+            import mediapipe as mp
+        except Exception as exc:
+            raise BackendUnavailable(f"mediapipe: {exc}")
+        try:
+            from config import FACE_DETECTION_CONFIDENCE
+        except Exception:
+            FACE_DETECTION_CONFIDENCE = 0.5
+        self.detector = mp.solutions.face_detection.FaceDetection(
+            model_selection=0,
+            min_detection_confidence=FACE_DETECTION_CONFIDENCE,
+        )
+
+    def detect(self, img):
+        res = self.detector.process(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+        if not res or not res.detections:
+            return None
+        h, w = img.shape[:2]
+        boxes = []
+        for det in res.detections:
+            bb = det.location_data.relative_bounding_box
+            x1, y1 = bb.xmin * w, bb.ymin * h
+            boxes.append((x1, y1, x1 + bb.width * w, y1 + bb.height * h))
+        # Same box the runtime crops in FaceRecognition.update_last_face().
+        return _crop(img, _largest(boxes))
+
+
+class ScrfdDetector:
+    """scrfd_10g_bnkps.onnx: 3 strides x 2 anchors, distance-encoded boxes."""
+
+    STRIDES = (8, 16, 32)
+    INPUT = 640
+
+    def __init__(self, score_thresh=0.5, nms_thresh=0.4):
+        self.session = _onnx_session(os.path.join(MODEL_DIR, "scrfd_10g_bnkps.onnx"))
+        self.input_name = self.session.get_inputs()[0].name
+        self.score_thresh = score_thresh
+        self.nms_thresh = nms_thresh
+        self._centers = {}
+
+    def _anchor_centers(self, stride):
+        if stride not in self._centers:
+            n = self.INPUT // stride
+            ys, xs = np.mgrid[:n, :n]
+            centers = np.stack([xs, ys], axis=-1).reshape(-1, 2).astype(np.float32) * stride
+            self._centers[stride] = np.repeat(centers, 2, axis=0)
+        return self._centers[stride]
+
+    def detect(self, img):
+        h, w = img.shape[:2]
+        scale = self.INPUT / float(max(h, w))
+        resized = cv2.resize(img, (int(w * scale), int(h * scale)))
+        canvas = np.zeros((self.INPUT, self.INPUT, 3), dtype=np.uint8)
+        canvas[:resized.shape[0], :resized.shape[1]] = resized
+        blob = cv2.dnn.blobFromImage(canvas, 1.0 / 128, (self.INPUT, self.INPUT), (127.5, 127.5, 127.5), swapRB=True)
+        outs = self.session.run(None, {self.input_name: blob})
+        fmc = len(self.STRIDES)
+        boxes, scores = [], []
+        for i, stride in enumerate(self.STRIDES):
+            score = outs[i].reshape(-1)
+            dist = outs[i + fmc].reshape(-1, 4) * stride
+            centers = self._anchor_centers(stride)
+            keep = np.where(score >= self.score_thresh)[0]
+            for k in keep:
+                cx, cy = centers[k]
+                d = dist[k]
+                boxes.append([cx - d[0], cy - d[1], d[0] + d[2], d[1] + d[3]])
+                scores.append(float(score[k]))
+        if not boxes:
+            return None
+        idx = cv2.dnn.NMSBoxes(boxes, scores, self.score_thresh, self.nms_thresh)
+        idx = np.array(idx).reshape(-1)
+        picked = []
+        for k in idx:
+            x, y, bw, bh = boxes[k]
+            picked.append((x / scale, y / scale, (x + bw) / scale, (y + bh) / scale))
+        return _crop(img, _largest(picked))
+
+
+# ================================================================
+# Embedders: face crop -> L2-normalised vector
+# ================================================================
+def _unit(v):
+    v = np.asarray(v, dtype=np.float32).reshape(-1)
+    return v / max(float(np.linalg.norm(v)), 1e-12)
+
+
+class TfliteEmbedder:
+    def __init__(self, path, size, std=128.0):
+        self.interp = _tflite_interpreter(path)
+        self.size = tuple(size)
+        self.std = std
+        self.inp = self.interp.get_input_details()[0]
+        self.out = self.interp.get_output_details()[0]
+        self.batch = int(self.inp["shape"][0]) if len(self.inp["shape"]) else 1
+
+    def embed(self, crop):
+        face = cv2.resize(crop, self.size, interpolation=cv2.INTER_CUBIC)
+        face = cv2.cvtColor(face, cv2.COLOR_BGR2RGB).astype(np.float32)
+        face = (face - 127.5) / self.std
+        batch = np.repeat(face[None, ...], max(1, self.batch), axis=0)
+        self.interp.set_tensor(self.inp["index"], batch)
+        self.interp.invoke()
+        return _unit(self.interp.get_tensor(self.out["index"])[0])
+
+
+class ArcFaceOnnxEmbedder:
+    def __init__(self, path):
+        self.session = _onnx_session(path)
+        self.input_name = self.session.get_inputs()[0].name
+
+    def embed(self, crop):
+        blob = cv2.dnn.blobFromImage(crop, 1.0 / 127.5, (112, 112), (127.5, 127.5, 127.5), swapRB=True)
+        return _unit(self.session.run(None, {self.input_name: blob})[0][0])
+
+
+# ================================================================
+# Liveness: face crop -> spoof score (higher = more likely an attack)
+# ================================================================
+class ModelRgbLiveness:
+    # Single-frame part of LivenessChecker.is_real(): real_prob >= 0.25.
+    threshold = 0.75
+
+    def __init__(self):
+        try:
+            from face.anti_spoof import LivenessChecker
+        except Exception as exc:
+            raise BackendUnavailable(f"face.anti_spoof: {exc}")
+        self.checker = LivenessChecker(_require_file(LIVENESS_MODEL_PATH))
+
+    def spoof_score(self, crop):
+        return 1.0 - self.checker.predict_real_prob(crop)
+
+
+class FasTfliteLiveness:
+    """FaceAntiSpoofing.tflite (256x256, leaf-node tree head); > 0.2 means spoof."""
+
+    threshold = 0.2
+
+    def __init__(self):
+        self.interp = _tflite_interpreter(os.path.join(MODEL_DIR, "FaceAntiSpoofing.tflite"))
+        self.inp = self.interp.get_input_details()[0]
+        outs = self.interp.get_output_details()
+        if len(outs) < 2:
+            raise BackendUnavailable("unexpected FaceAntiSpoofing.tflite outputs")
+        self.outs = outs
+
+    def spoof_score(self, crop):
+        face = cv2.resize(crop, (256, 256))
+        face = cv2.cvtColor(face, cv2.COLOR_BGR2RGB).astype(np.float32) / 255.0
+        self.interp.set_tensor(self.inp["index"], face[None, ...])
+        self.interp.invoke()
+        clss = self.interp.get_tensor(self.outs[0]["index"]).reshape(-1)
+        mask = self.interp.get_tensor(self.outs[1]["index"]).reshape(-1)
+        return float(np.sum(np.abs(clss) * mask))
+
+
+class MiniFasNetLiveness:
+    def __init__(self):
+        # The .pth checkpoints need PyTorch and the MiniFASNet model definition,
+        # neither of which ships with this repo.
+        raise BackendUnavailable("MiniFASNet .pth needs torch + model code (not in repo); export to ONNX first")
+
+
+DETECTORS = {
+    "mediapipe": MediaPipeDetector,
+    "scrfd": ScrfdDetector,
+    "none": WholeImageDetector,
+}
+EMBEDDERS = {
+    "mobilenet_v2": lambda: TfliteEmbedder(MODEL_PATH, IMG_SIZE),
+    "mobilefacenet": lambda: TfliteEmbedder(os.path.join(MODEL_DIR, "MobileFaceNet.tflite"), (112, 112)),
+    "w600k_r50": lambda: ArcFaceOnnxEmbedder(os.path.join(MODEL_DIR, "w600k_r50.onnx")),
+    "glintr100": lambda: ArcFaceOnnxEmbedder(os.path.join(MODEL_DIR, "glintr100.onnx")),
+}
+LIVENESS = {
+    "modelrgb": ModelRgbLiveness,
+    "fas_tflite": FasTfliteLiveness,
+    "minifasnet": MiniFasNetLiveness,
+}
+
+
+# ================================================================
+# Dataset
+# ================================================================
+def _images_under(folder):
+    out = []
+    for root, _, files in os.walk(folder):
+        for name in sorted(files):
+            if name.lower().endswith(IMAGE_EXTS):
+                out.append(os.path.join(root, name))
+    return sorted(out)
+
+
+def load_dataset(root, limit=0):
+    """Return {"enroll": [(person, path)], "genuine": [...], "impostor": [(None, path)], "spoof": [...]}."""
+    data = {}
+    for split in ("enroll", "genuine"):
+        items = []
+        base = os.path.join(root, split)
+        if os.path.isdir(base):
+            for person in sorted(os.listdir(base)):
+                for path in _images_under(os.path.join(base, person)):
+                    items.append((person, path))
+        data[split] = items[:limit] if limit else items
+    for split in ("impostor", "spoof"):
+        items = [(None, p) for p in _images_under(os.path.join(root, split))]
+        data[split] = items[:limit] if limit else items
+    return data
+
+
+# ================================================================
+# Metrics
+# ================================================================
+def _pct(samples, p):
+    samples = sorted(samples)
+    if not samples:
+        return None
+    return samples[min(len(samples) - 1, int(round(p / 100.0 * (len(samples) - 1))))]
+
+
+def _latency(samples):
+    return {"p50_ms": _pct(samples, 50), "p95_ms": _pct(samples, 95), "n": len(samples)}
+
+
+def verification_metrics(genuine, impostor, thresholds):
+    """genuine: [(score_vs_own_template, rank1_correct)], impostor: [max score over gallery]."""
+    n_gen = len(genuine)
+    n_imp = len(impostor)
+    result = {"genuine": n_gen, "impostor": n_imp, "tar_at_far": {}, "table": []}
+    imp_sorted = sorted(impostor, reverse=True)
+    for far in FAR_TARGETS:
+        # Need at least 1/FAR impostors for the operating point to mean anything.
+        if n_imp < int(round(1.0 / far)) or n_gen == 0:
+            result["tar_at_far"][str(far)] = None
+            continue
+        k = max(0, int(far * n_imp) - 1)
+        thr = imp_sorted[k] + 1e-6
+        tar = sum(1 for s, ok in genuine if ok and s >= thr) / float(n_gen)
+        result["tar_at_far"][str(far)] = {"tar": tar, "threshold": thr}
+    for thr in thresholds:
+        tar = sum(1 for s, ok in genuine if ok and s >= thr) / float(n_gen) if n_gen else None
+        far = sum(1 for s in impostor if s >= thr) / float(n_imp) if n_imp else None
+        result["table"].append({"threshold": thr, "tar": tar, "far": far})
+    return result
+
+
+def pad_metrics(live_scores, spoof_scores, threshold):
+    """APCER = attacks accepted as live, BPCER = bona fide rejected (ISO/IEC 30107-3)."""
+    def rates(thr):
+        apcer = sum(1 for s in spoof_scores if s <= thr) / float(len(spoof_scores)) if spoof_scores else None
+        bpcer = sum(1 for s in live_scores if s > thr) / float(len(live_scores)) if live_scores else None
+        return apcer, bpcer
+
+    apcer, bpcer = rates(threshold)
+    out = {"bona_fide": len(live_scores), "attacks": len(spoof_scores),
+           "threshold": threshold, "apcer": apcer, "bpcer": bpcer, "eer": None, "bpcer_at_apcer": {}}
+    if live_scores and spoof_scores:
+        candidates = sorted(set(live_scores) | set(spoof_scores))
+        best = None
+        for thr in candidates:
+            a, b = rates(thr)
+            if best is None or abs(a - b) < abs(best[1] - best[2]):
+                best = (thr, a, b)
+        out["eer"] = {"threshold": best[0], "rate": (best[1] + best[2]) / 2.0}
+        for target in (0.05, 0.01):
+            ok = [(rates(t)[1], t) for t in candidates if rates(t)[0] <= target]
+            out["bpcer_at_apcer"][str(target)] = min(ok) if ok else None
+    return out
+
+
+# ================================================================
+# Runner
+# ================================================================
+def _instantiate(registry, names):
+    out, skipped = {}, {}
+    for name in names:
+        factory = registry.get(name)
+        if factory is None:
+            skipped[name] = "unknown backend"
+            continue
+        try:
+            out[name] = factory()
+        except BackendUnavailable as exc:
+            skipped[name] = str(exc)
+        except Exception as exc:
+            skipped[name] = f"init failed: {exc}"
+    return out, skipped
+
+
+def _detect_all(detector, dataset):
+    crops, lat, misses = {}, [], 0
+    for split, items in dataset.items():
+        out = []
+        for label, path in items:
+            img = cv2.imread(path)
+            if img is None:
+                continue
+            t0 = time.perf_counter()
+            crop = detector.detect(img)
+            lat.append((time.perf_counter() - t0) * 1000.0)
+            if crop is None:
+                misses += 1
+                continue
+            out.append((label, crop))
+        crops[split] = out
+    return crops, lat, misses
+
+
+def _evaluate_embedder(embedder, crops, thresholds):
+    lat = []
+
+    def emb(crop):
+        t0 = time.perf_counter()
+        v = embedder.embed(crop)
+        lat.append((time.perf_counter() - t0) * 1000.0)
+        return v
+
+    per_person = {}
+    for person, crop in crops.get("enroll", []):
+        per_person.setdefault(person, []).append(emb(crop))
+    if not per_person:
+        return {"error": "no enrollable faces"}, lat
+    names = sorted(per_person)
+    gallery = np.stack([_unit(np.mean(per_person[n], axis=0)) for n in names])
+
+    genuine = []
+    for person, crop in crops.get("genuine", []):
+        if person not in per_person:
+            continue
+        sims = gallery @ emb(crop)
+        own = float(sims[names.index(person)])
+        genuine.append((own, names[int(np.argmax(sims))] == person))
+    impostor = [float(np.max(gallery @ emb(crop))) for _, crop in crops.get("impostor", [])]
+    metrics = verification_metrics(genuine, impostor, thresholds)
+    metrics["rank1"] = sum(1 for _, ok in genuine if ok) / float(len(genuine)) if genuine else None
+    return metrics, lat
+
+
+def _evaluate_liveness(backend, crops):
+    lat = []
+
+    def score(crop):
+        t0 = time.perf_counter()
+        s = backend.spoof_score(crop)
+        lat.append((time.perf_counter() - t0) * 1000.0)
+        return s
+
+    live = [score(c) for split in ("enroll", "genuine", "impostor") for _, c in crops.get(split, [])]
+    spoof = [score(c) for _, c in crops.get("spoof", [])]
+    return pad_metrics(live, spoof, backend.threshold), lat
+
+
+def run_eval(data_root, detectors, embedders, liveness, limit=0, thresholds=None):
+    thresholds = thresholds or [round(0.2 + 0.05 * i, 2) for i in range(15)]
+    dataset = load_dataset(data_root, limit=limit)
+    report = {
+        "data": os.path.abspath(data_root),
+        "counts": {k: len(v) for k, v in dataset.items()},
+        "shipped": {"embedder": "mobilenet_v2", "liveness": "modelrgb", "threshold": RECOGNITION_THRESHOLD},
+        "skipped": {},
+        "latency": {},
+        "verification": {},
+        "pad": {},
+        "detection_misses": {},
+    }
+    dets, skipped = _instantiate(DETECTORS, detectors)
+    report["skipped"].update({f"detector:{k}": v for k, v in skipped.items()})
+    embs, skipped = _instantiate(EMBEDDERS, embedders)
+    report["skipped"].update({f"embedder:{k}": v for k, v in skipped.items()})
+    lives, skipped = _instantiate(LIVENESS, liveness)
+    report["skipped"].update({f"liveness:{k}": v for k, v in skipped.items()})
+
+    for dname, det in dets.items():
+        print(f"[eval] detector {dname} ...", file=sys.stderr)
+        crops, lat, misses = _detect_all(det, dataset)
+        report["latency"][f"detect:{dname}"] = _latency(lat)
+        report["detection_misses"][dname] = misses
+        for ename, emb in embs.items():
+            print(f"[eval]   embedder {ename} ...", file=sys.stderr)
+            metrics, lat = _evaluate_embedder(emb, crops, thresholds)
+            report["verification"][f"{dname}+{ename}"] = metrics
+            report["latency"].setdefault(f"embed:{ename}", _latency(lat))
+        for lname, live in lives.items():
+            print(f"[eval]   liveness {lname} ...", file=sys.stderr)
+            metrics, lat = _evaluate_liveness(live, crops)
+            report["pad"][f"{dname}+{lname}"] = metrics
+            report["latency"].setdefault(f"liveness:{lname}", _latency(lat))
+    return report
+
+
+def _f(value, fmt="{:.3f}"):
+    return "-" if value is None else fmt.format(value)
+
+
+def to_markdown(report):
+    lines = [f"Data: {report['data']}  counts: {report['counts']}", ""]
+    if report["skipped"]:
+        lines.append("Unavailable backends:")
+        for name, why in sorted(report["skipped"].items()):
+            lines.append(f"- {name}: {why}")
+        lines.append("")
+
+    lines += ["### Latency (per image, this CPU)", "", "| stage | p50 ms | p95 ms | n |", "|---|---:|---:|---:|"]
+    for name, lat in sorted(report["latency"].items()):
+        lines.append(f"| {name} | {_f(lat['p50_ms'], '{:.1f}')} | {_f(lat['p95_ms'], '{:.1f}')} | {lat['n']} |")
+
+    heads = " | ".join(f"TAR@FAR={far:g}" for far in FAR_TARGETS)
+    lines += ["", "### Verification", "", f"| stack | rank-1 | {heads} |",
+              "|---|---:|" + "---:|" * len(FAR_TARGETS)]
+    for stack, m in sorted(report["verification"].items()):
+        if "error" in m:
+            lines.append(f"| {stack} | {m['error']} |" + " |" * len(FAR_TARGETS))
+            continue
+        cells = []
+        for far in FAR_TARGETS:
+            point = m["tar_at_far"].get(str(far))
+            cells.append("-" if point is None else f"{point['tar']:.3f} @ {point['threshold']:.3f}")
+        lines.append(f"| {stack} | {_f(m.get('rank1'))} | " + " | ".join(cells) + " |")
+
+    for stack, m in sorted(report["verification"].items()):
+        if "error" in m:
+            continue
+        lines += ["", f"Threshold table — {stack}", "", "| threshold | TAR | FAR |", "|---:|---:|---:|"]
+        for row in m["table"]:
+            lines.append(f"| {row['threshold']:.2f} | {_f(row['tar'])} | {_f(row['far'])} |")
+
+    lines += ["", "### Presentation attack detection", "",
+              "| stack | threshold | APCER | BPCER | EER | BPCER@APCER=5% | BPCER@APCER=1% |",
+              "|---|---:|---:|---:|---:|---:|---:|"]
+    for stack, m in sorted(report["pad"].items()):
+        eer = m.get("eer")
+        at = m.get("bpcer_at_apcer", {})
+        cells = [
+            _f(m["threshold"]),
+            _f(m["apcer"]),
+            _f(m["bpcer"]),
+            "-" if eer is None else f"{eer['rate']:.3f}",
+            "-" if at.get("0.05") is None else f"{at['0.05'][0]:.3f}",
+            "-" if at.get("0.01") is None else f"{at['0.01'][0]:.3f}",
+        ]
+        lines.append(f"| {stack} | " + " | ".join(cells) + " |")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate detector / embedder / liveness backends")
+    parser.add_argument("--data", required=True, help="folder with enroll/ genuine/ impostor/ spoof/")
+    parser.add_argument("--detectors", default=",".join(DETECTORS))
+    parser.add_argument("--embedders", default=",".join(EMBEDDERS))
+    parser.add_argument("--liveness", default=",".join(LIVENESS))
+    parser.add_argument("--limit", type=int, default=0, help="max images per split (0 = all)")
+    parser.add_argument("--json", help="also write the full report as JSON")
+    args = parser.parse_args(argv)
+
+    def names(text):
+        return [n.strip() for n in text.split(",") if n.strip()]
+
+    report = run_eval(
+        args.data,
+        names(args.detectors),
+        names(args.embedders),
+        names(args.liveness),
+        limit=args.limit,
+    )
+    print(to_markdown(report))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
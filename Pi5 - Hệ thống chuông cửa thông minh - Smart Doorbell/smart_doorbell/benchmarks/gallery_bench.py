@@ -0,0 +1,234 @@
+"""Gallery-scale benchmark for FaceDB load/reload and embedding matching.
+
+Builds synthetic galleries (random unit embeddings) in a temp directory and
+measures, per size:
+
+  - cold FaceDB.load() + get_all_embeddings()
+  - FaceRecognition.reload_db() after one update_person() from another instance
+  - recognize_embedding() per query (the shipped loop) and, for comparison,
+    an exact cosine search over a pre-stacked float32 matrix
+  - file size and Python heap held by FaceDB.data and the id -> (name, emb) map
+
+    python -m benchmarks.gallery_bench                         # 10 .. 100k
+    python -m benchmarks.gallery_bench --sizes 10,1000 --queries 200 --json out.json
+"""
+import argparse
+import gc
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from face.face_db import FaceDB
+
+try:
+    from config import DB_PATH
+except Exception:
+    DB_PATH = None
+
+DEFAULT_SIZES = (10, 100, 1000, 10000, 100000)
+
+
+def _detect_dim(default=512):
+    # Match the embedder in use when a real gallery exists.
+    try:
+        with open(DB_PATH, "r") as f:
+            data = json.load(f)
+        return len(data[0]["embedding"])
+    except Exception:
+        return default
+
+
+def _unit_rows(rng, n, dim):
+    rows = rng.standard_normal((n, dim)).astype(np.float32)
+    rows /= np.linalg.norm(rows, axis=1, keepdims=True)
+    return rows
+
+
+def write_gallery(path, n, dim, seed=0):
+    """Write a face_db.json in the same layout FaceDB.save() produces."""
+    rng = np.random.default_rng(seed)
+    embs = _unit_rows(rng, n, dim)
+    data = [
+        {"id": f"{i + 1:03d}", "name": f"person_{i + 1}", "embedding": embs[i].tolist()}
+        for i in range(n)
+    ]
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+    return embs
+
+
+def _matcher():
+    """FaceRecognition without its models: recognize_embedding/reload_db only use DB state."""
+    try:
+        from face.face_recognition import FaceRecognition
+    except Exception as exc:
+        print(f"[gallery] FaceRecognition unavailable ({exc}); loop matcher skipped", file=sys.stderr)
+        return None, None
+    try:
+        from config import RECOGNITION_THRESHOLD
+    except Exception:
+        RECOGNITION_THRESHOLD = 0.5
+
+    def build(db):
+        face = FaceRecognition.__new__(FaceRecognition)
+        face.threshold = RECOGNITION_THRESHOLD
+        face.db = db
+        face.DB = db.get_all_embeddings()
+        return face
+
+    return FaceRecognition, build
+
+
+def _timed(fn, repeat=1):
+    best = None
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        fn()
+        ms = (time.perf_counter() - t0) * 1000.0
+        best = ms if best is None else min(best, ms)
+    return best
+
+
+def _heap_mb(fn):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        keep = fn()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del keep
+    return current / (1024.0 * 1024.0)
+
+
+def _pct(samples, p):
+    samples = sorted(samples)
+    if not samples:
+        return None
+    return samples[min(len(samples) - 1, int(round(p / 100.0 * (len(samples) - 1))))]
+
+
+def bench_size(n, dim, queries, workdir, loop_cap):
+    path = os.path.join(workdir, f"face_db_{n}.json")
+    embs = write_gallery(path, n, dim)
+    row = {"size": n, "dim": dim, "format": "json", "file_mb": os.path.getsize(path) / (1024.0 * 1024.0)}
+
+    holder = {}
+
+    def cold():
+        db = FaceDB(path)
+        holder["db"] = db
+        holder["map"] = db.get_all_embeddings()
+
+    row["cold_load_ms"] = _timed(cold)
+    row["heap_data_mb"] = _heap_mb(lambda: FaceDB(path))
+    db = holder["db"]
+    row["heap_map_mb"] = _heap_mb(db.get_all_embeddings)
+
+    cls, build = _matcher()
+    rng = np.random.default_rng(1)
+    probes = np.concatenate([
+        embs[rng.integers(0, n, size=queries // 2)]
+        + 0.05 * rng.standard_normal((queries // 2, dim)).astype(np.float32),
+        _unit_rows(rng, queries - queries // 2, dim),
+    ])
+
+    if cls is not None:
+        face = build(FaceDB(path))
+        writer = FaceDB(path)
+        # mtime_ns granularity on some filesystems; make sure the stamp moves.
+        time.sleep(0.01)
+        writer.update_person("001", name="renamed")
+        row["reload_after_1_edit_ms"] = _timed(lambda: cls.reload_db(face))
+
+        if n <= loop_cap:
+            lat = []
+            for q in probes:
+                t0 = time.perf_counter()
+                face.recognize_embedding(q)
+                lat.append((time.perf_counter() - t0) * 1000.0)
+            row["loop_match_p50_ms"] = _pct(lat, 50)
+            row["loop_match_p95_ms"] = _pct(lat, 95)
+
+    # Exact search over one contiguous matrix: the cost floor for any index.
+    ids = list(holder["map"].keys())
+    t0 = time.perf_counter()
+    mat = np.stack([holder["map"][i][1] for i in ids]).astype(np.float32)
+    mat /= np.maximum(np.linalg.norm(mat, axis=1, keepdims=True), 1e-12)
+    row["matrix_build_ms"] = (time.perf_counter() - t0) * 1000.0
+    lat = []
+    for q in probes:
+        t0 = time.perf_counter()
+        q = q / max(float(np.linalg.norm(q)), 1e-12)
+        int(np.argmax(mat @ q))
+        lat.append((time.perf_counter() - t0) * 1000.0)
+    row["matrix_match_p50_ms"] = _pct(lat, 50)
+    row["matrix_match_p95_ms"] = _pct(lat, 95)
+    return row
+
+
+COLUMNS = (
+    ("size", "{:d}"),
+    ("file_mb", "{:.2f}"),
+    ("cold_load_ms", "{:.1f}"),
+    ("reload_after_1_edit_ms", "{:.1f}"),
+    ("loop_match_p50_ms", "{:.3f}"),
+    ("loop_match_p95_ms", "{:.3f}"),
+    ("matrix_build_ms", "{:.1f}"),
+    ("matrix_match_p50_ms", "{:.3f}"),
+    ("matrix_match_p95_ms", "{:.3f}"),
+    ("heap_data_mb", "{:.1f}"),
+    ("heap_map_mb", "{:.1f}"),
+)
+
+
+def to_markdown(rows):
+    lines = [
+        "| " + " | ".join(name for name, _ in COLUMNS) + " |",
+        "|" + "|".join("---:" for _ in COLUMNS) + "|",
+    ]
+    for row in rows:
+        cells = []
+        for name, fmt in COLUMNS:
+            value = row.get(name)
+            cells.append("-" if value is None else fmt.format(value))
+        lines.append("| " + " | ".join(cells) + " |")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="FaceDB / matching scaling benchmark")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES))
+    parser.add_argument("--dim", type=int, default=None, help="embedding size (default: from face_db.json)")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--loop-cap", type=int, default=100000,
+                        help="skip the per-entry loop matcher above this gallery size")
+    parser.add_argument("--json", help="also write raw rows as JSON")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    dim = args.dim or _detect_dim()
+    workdir = tempfile.mkdtemp(prefix="gallery_bench_")
+    rows = []
+    try:
+        for n in sizes:
+            print(f"[gallery] {n} entries x {dim} dims ...", file=sys.stderr)
+            rows.append(bench_size(n, dim, max(2, args.queries), workdir, args.loop_cap))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(to_markdown(rows))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
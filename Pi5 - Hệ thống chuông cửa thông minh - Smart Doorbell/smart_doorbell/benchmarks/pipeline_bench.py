@@ -0,0 +1,222 @@
+"""Headless pipeline benchmark over a replayable frame source.
+
+Drives DoorbellRuntime.read_frame() + infer_frame() without Qt, GPIO or a
+camera and prints a JSON report (throughput, per-stage latency percentiles,
+peak RSS). With --baseline the run exits 1 when it regresses; a run where
+the face module did not load or every frame failed exits 2 and is never
+saved as a baseline.
+
+    python -m benchmarks.pipeline_bench --source synthetic:640x480 --frames 300
+    python -m benchmarks.pipeline_bench --source video:clips/door.mp4 --output run.json
+    python -m benchmarks.pipeline_bench --baseline benchmarks/baseline.json
+    python -m benchmarks.pipeline_bench --save-baseline benchmarks/baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+from camera.replay import build_replay_camera
+from metrics import get_metrics
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # KiB on Linux, bytes on macOS.
+        return peak / (1024.0 * 1024.0) if sys.platform == "darwin" else peak / 1024.0
+    except Exception:
+        return None
+
+
+def _percentiles(samples):
+    samples = sorted(samples)
+    if not samples:
+        return None
+    n = len(samples)
+
+    def pct(p):
+        return samples[min(n - 1, int(round(p / 100.0 * (n - 1))))]
+
+    return {
+        "p50": pct(50),
+        "p95": pct(95),
+        "p99": pct(99),
+        "max": samples[-1],
+        "mean": sum(samples) / n,
+        "count": n,
+    }
+
+
+def run_benchmark(source, frames=300, warmup=20, liveness=False, fixed_cadence=True):
+    # Imported here so --help works without the model stack.
+    from runtime import DoorbellRuntime
+
+    camera = build_replay_camera(source, loop=True)
+    runtime = DoorbellRuntime(enable_liveness=liveness, camera=camera)
+    runtime.idle.enabled = False
+    face_error = None if runtime.face is not None else str(runtime._face_import_error or "face module not loaded")
+    if fixed_cadence:
+        # Measure the pipeline, not the adaptive controller's reaction to it.
+        runtime.scheduler.enabled = False
+
+    metrics = get_metrics()
+    metrics.enabled = True
+    for _ in range(max(0, int(warmup))):
+        frame = runtime.read_frame()
+        if frame is None:
+            break
+        runtime.infer_frame(frame)
+    metrics.reset()
+
+    totals = []
+    faces = 0
+    errors = 0
+    done = 0
+    start = time.perf_counter()
+    for _ in range(max(1, int(frames))):
+        t0 = time.perf_counter()
+        frame = runtime.read_frame()
+        if frame is None:
+            break
+        result = runtime.infer_frame(frame)
+        totals.append((time.perf_counter() - t0) * 1000.0)
+        done += 1
+        if result.get("has_face") or result.get("bbox") is not None:
+            faces += 1
+        if result.get("error"):
+            errors += 1
+    wall = time.perf_counter() - start
+
+    snap = metrics.snapshot()
+    try:
+        runtime.camera.close()
+    except Exception:
+        pass
+    return {
+        "source": source,
+        "frames": done,
+        "warmup": warmup,
+        "liveness": bool(liveness),
+        "wall_sec": wall,
+        "fps": done / wall if wall > 0 else 0.0,
+        "frame_ms": _percentiles(totals),
+        "stages": snap.get("stages", {}),
+        "faces": faces,
+        "errors": errors,
+        "face_error": face_error,
+        "peak_rss_mb": _peak_rss_mb(),
+        "host": {
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+        },
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def compare(report, baseline, tolerance=0.15):
+    """Return human-readable regressions of ``report`` against ``baseline``."""
+    problems = []
+    base_fps = baseline.get("fps") or 0.0
+    if base_fps > 0 and report.get("fps", 0.0) < base_fps * (1.0 - tolerance):
+        problems.append(f"fps {report['fps']:.2f} < baseline {base_fps:.2f}")
+
+    def check(label, cur, base):
+        for key in ("p50", "p95"):
+            b = (base or {}).get(key)
+            c = (cur or {}).get(key)
+            # Sub-millisecond stages are too noisy to gate on.
+            if b is None or c is None or b < 1.0:
+                continue
+            if c > b * (1.0 + tolerance):
+                problems.append(f"{label} {key} {c:.2f} ms > baseline {b:.2f} ms")
+
+    check("frame", report.get("frame_ms"), baseline.get("frame_ms"))
+    base_stages = baseline.get("stages", {})
+    for stage, summary in report.get("stages", {}).items():
+        if stage in base_stages:
+            check(stage, summary, base_stages[stage])
+
+    base_rss = baseline.get("peak_rss_mb")
+    cur_rss = report.get("peak_rss_mb")
+    if base_rss and cur_rss and cur_rss > base_rss * (1.0 + tolerance):
+        problems.append(f"peak RSS {cur_rss:.0f} MB > baseline {base_rss:.0f} MB")
+    return problems
+
+
+def invalid_reason(report):
+    """Why ``report`` measured nothing useful (None when it is fine).
+
+    Failed frames return almost at once, so such a run reports a huge fps.
+    """
+    if report.get("face_error"):
+        return f"face module failed to load: {report['face_error']}"
+    frames = report.get("frames") or 0
+    if frames <= 0:
+        return "no frames were read from the source"
+    if report.get("errors", 0) >= frames:
+        return f"all {frames} frames failed in infer_frame()"
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline DoorbellRuntime benchmark")
+    parser.add_argument("--source", default=os.getenv("DOORBELL_CAMERA_SOURCE") or "synthetic:640x480",
+                        help="synthetic[:WxH] | file:<dir|image> | video:<path>")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--liveness", action="store_true", help="also run the liveness model")
+    parser.add_argument("--adaptive", action="store_true", help="keep the adaptive scheduler on")
+    parser.add_argument("--output", help="write the JSON report here (default: stdout)")
+    parser.add_argument("--baseline", help="fail (exit 1) when slower than this report")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed regression, fraction")
+    parser.add_argument("--save-baseline", help="write the report as the new baseline")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(
+        args.source,
+        frames=args.frames,
+        warmup=args.warmup,
+        liveness=args.liveness,
+        fixed_cadence=not args.adaptive,
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    reason = invalid_reason(report)
+    if reason:
+        print(f"[bench] INVALID RUN: {reason}", file=sys.stderr)
+        if args.save_baseline:
+            print(f"[bench] not saving baseline {args.save_baseline}", file=sys.stderr)
+        return 2
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        base_reason = invalid_reason(baseline)
+        if base_reason:
+            print(f"[bench] baseline {args.baseline} is not usable: {base_reason}", file=sys.stderr)
+            return 2
+        problems = compare(report, baseline, tolerance=args.tolerance)
+        if problems:
+            for line in problems:
+                print(f"[bench] REGRESSION: {line}", file=sys.stderr)
+            return 1
+        print(f"[bench] OK vs {args.baseline} (tolerance {args.tolerance:.0%})", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
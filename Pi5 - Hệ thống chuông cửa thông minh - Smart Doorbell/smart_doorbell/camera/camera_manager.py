@@ -4,11 +4,31 @@ from config import FRAME_WIDTH, FRAME_HEIGHT
 class CameraManager:
     def __init__(self):
         self.picam = Picamera2()
+        self.low_power = False
+        self._configure((FRAME_WIDTH, FRAME_HEIGHT))
+        self.picam.start()
+
+    def _configure(self, size, fps=None):
+        kwargs = {}
+        if fps:
+            kwargs["controls"] = {"FrameRate": float(fps)}
         cfg = self.picam.create_preview_configuration(
-            main={"format": "RGB888", "size": (FRAME_WIDTH, FRAME_HEIGHT)}
+            main={"format": "RGB888", "size": size},
+            **kwargs
         )
         self.picam.configure(cfg)
+
+    def set_low_power(self, enabled, width=None, height=None, fps=None):
+        enabled = bool(enabled)
+        if enabled == self.low_power:
+            return
+        self.picam.stop()
+        if enabled:
+            self._configure((int(width or FRAME_WIDTH), int(height or FRAME_HEIGHT)), fps)
+        else:
+            self._configure((FRAME_WIDTH, FRAME_HEIGHT))
         self.picam.start()
+        self.low_power = enabled
 
     def get_frame(self):
         return self.picam.capture_array()
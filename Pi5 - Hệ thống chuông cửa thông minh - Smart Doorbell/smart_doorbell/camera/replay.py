@@ -0,0 +1,166 @@
+"""Replayable frame sources with the same interface as the live cameras.
+
+``build_replay_camera(spec)`` understands:
+
+    synthetic[:WxH]        generated frames, no files needed
+    file:/path/to/dir      every image in a directory (sorted)
+    file:/path/to/img.jpg  a single still image
+    video:/path/to/clip    anything cv2.VideoCapture can open
+
+Used by DOORBELL_CAMERA_SOURCE and by benchmarks/pipeline_bench.py.
+"""
+import os
+import time
+
+import cv2
+import numpy as np
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+
+
+class _ReplayBase:
+    def __init__(self, loop=True, fps=None):
+        self.loop = bool(loop)
+        self.fps = float(fps or 0.0)
+        self.exhausted = False
+        self.frames_read = 0
+        self._next_ts = 0.0
+
+    def _pace(self):
+        # fps=0 means "as fast as the pipeline can pull".
+        if self.fps <= 0:
+            return
+        now = time.monotonic()
+        if self._next_ts > now:
+            time.sleep(self._next_ts - now)
+            now = self._next_ts
+        self._next_ts = now + 1.0 / self.fps
+
+    def set_low_power(self, enabled, width=None, height=None, fps=None):
+        return None
+
+    def get_frame(self):
+        if self.exhausted:
+            return None
+        self._pace()
+        frame = self._read()
+        if frame is None:
+            self.exhausted = True
+            return None
+        self.frames_read += 1
+        return frame
+
+    def _read(self):
+        raise NotImplementedError
+
+    def close(self):
+        return None
+
+
+class ImageFolderCamera(_ReplayBase):
+    def __init__(self, path, loop=True, fps=None):
+        super().__init__(loop=loop, fps=fps)
+        if os.path.isdir(path):
+            names = sorted(n for n in os.listdir(path) if n.lower().endswith(IMAGE_EXTS))
+            paths = [os.path.join(path, n) for n in names]
+        else:
+            paths = [path]
+        self._frames = []
+        for p in paths:
+            img = cv2.imread(p)
+            if img is not None:
+                self._frames.append(img)
+        if not self._frames:
+            raise ValueError(f"no readable images at {path}")
+        self._pos = 0
+
+    def _read(self):
+        if self._pos >= len(self._frames):
+            if not self.loop:
+                return None
+            self._pos = 0
+        frame = self._frames[self._pos]
+        self._pos += 1
+        # Callers may draw on frames; never hand out the cached original.
+        return frame.copy()
+
+
+class VideoFileCamera(_ReplayBase):
+    def __init__(self, path, loop=True, fps=None):
+        super().__init__(loop=loop, fps=fps)
+        self.path = path
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise ValueError(f"cannot open video {path}")
+
+    def _read(self):
+        ok, frame = self.cap.read()
+        if ok:
+            return frame
+        if not self.loop:
+            return None
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        ok, frame = self.cap.read()
+        return frame if ok else None
+
+    def close(self):
+        if self.cap:
+            self.cap.release()
+
+
+class SyntheticCamera(_ReplayBase):
+    """Deterministic moving-blob frames; exercises capture and the no-face path."""
+
+    def __init__(self, width=640, height=480, frames=0, fps=None, seed=0):
+        super().__init__(loop=frames <= 0, fps=fps)
+        self.width = int(width)
+        self.height = int(height)
+        self.limit = int(frames)
+        rng = np.random.default_rng(seed)
+        self._noise = rng.integers(0, 24, size=(self.height, self.width, 3), dtype=np.uint8)
+        gy = np.linspace(40, 160, self.height, dtype=np.float32)[:, None]
+        gx = np.linspace(0, 60, self.width, dtype=np.float32)[None, :]
+        base = (gy + gx).astype(np.uint8)
+        self._base = cv2.merge([base, base, base])
+        self._base = cv2.add(self._base, self._noise)
+        self._i = 0
+
+    def _read(self):
+        if self.limit > 0 and self._i >= self.limit:
+            return None
+        frame = self._base.copy()
+        t = self._i / 30.0
+        cx = int(self.width * (0.5 + 0.25 * np.sin(t)))
+        cy = int(self.height * (0.5 + 0.1 * np.cos(t * 0.7)))
+        axes = (max(8, self.width // 10), max(10, self.height // 6))
+        cv2.ellipse(frame, (cx, cy), axes, 0, 0, 360, (140, 170, 210), -1)
+        self._i += 1
+        return frame
+
+
+def _parse_size(text, default):
+    try:
+        w, h = str(text).lower().split("x", 1)
+        return int(w), int(h)
+    except Exception:
+        return default
+
+
+def build_replay_camera(spec, width=None, height=None, loop=True, fps=None, frames=0):
+    """Return a replay camera for ``spec`` or None when ``spec`` is empty."""
+    spec = str(spec or "").strip()
+    if not spec:
+        return None
+    kind, _, arg = spec.partition(":")
+    kind = kind.lower()
+    if kind == "synthetic":
+        w, h = _parse_size(arg, (int(width or 640), int(height or 480)))
+        return SyntheticCamera(w, h, frames=frames, fps=fps)
+    if kind == "file":
+        return ImageFolderCamera(arg, loop=loop, fps=fps)
+    if kind == "video":
+        return VideoFileCamera(arg, loop=loop, fps=fps)
+    # Bare path: pick by what is on disk.
+    if os.path.isdir(spec) or spec.lower().endswith(IMAGE_EXTS):
+        return ImageFolderCamera(spec, loop=loop, fps=fps)
+    return VideoFileCamera(spec, loop=loop, fps=fps)
@@ -17,8 +17,168 @@ EVENT_CAPTURE_INTERVAL_SEC = 5.0
 EVENT_CAPTURE_ENABLED = os.getenv("DOORBELL_EVENT_CAPTURE_ENABLED", "1").strip().lower() not in ("0", "false", "no")
 EVENT_MAX_ITEMS = 200
 EVENT_MEDIA_DIR = os.path.join(BASE_DIR, "media")
+# On-demand thumb / medium / face renditions for GET /media/{eventId}/{variant}.
+EVENT_MEDIA_CACHE_DIR = os.getenv("DOORBELL_EVENT_MEDIA_CACHE_DIR", os.path.join(BASE_DIR, "cache", "media"))
 EVENT_LOG_ENABLED = True
 EVENT_LOG_PATH = os.path.join(BASE_DIR, "logs", "events.jsonl")
+# Rotation of events.jsonl into gzip segments + sidecar index (server/event_log.py).
+EVENT_LOG_ROTATE_ENABLED = os.getenv("DOORBELL_EVENT_LOG_ROTATE", "1").strip().lower() not in ("0", "false", "no")
+try:
+    EVENT_LOG_ROTATE_MB = max(0.0, float(os.getenv("DOORBELL_EVENT_LOG_ROTATE_MB", "8")))
+except ValueError:
+    EVENT_LOG_ROTATE_MB = 8.0
+try:
+    EVENT_LOG_ROTATE_HOURS = max(0.0, float(os.getenv("DOORBELL_EVENT_LOG_ROTATE_HOURS", "24")))
+except ValueError:
+    EVENT_LOG_ROTATE_HOURS = 24.0
+try:
+    EVENT_LOG_KEEP_SEGMENTS = max(0, int(os.getenv("DOORBELL_EVENT_LOG_KEEP_SEGMENTS", "90")))
+except ValueError:
+    EVENT_LOG_KEEP_SEGMENTS = 90
+# Media retention (server/retention.py): new snapshots go to media/YYYY/MM/DD/.
+EVENT_MEDIA_SHARDED = os.getenv("DOORBELL_EVENT_MEDIA_SHARDED", "1").strip().lower() not in ("0", "false", "no")
+EVENT_RETENTION_ENABLED = os.getenv("DOORBELL_EVENT_RETENTION_ENABLED", "1").strip().lower() not in ("0", "false", "no")
+try:
+    EVENT_RETENTION_DAYS = max(0.0, float(os.getenv("DOORBELL_EVENT_RETENTION_DAYS", "30")))
+except ValueError:
+    EVENT_RETENTION_DAYS = 30.0
+try:
+    EVENT_RETENTION_MAX_FILES = max(0, int(os.getenv("DOORBELL_EVENT_RETENTION_MAX_FILES", "5000")))
+except ValueError:
+    EVENT_RETENTION_MAX_FILES = 5000
+try:
+    EVENT_RETENTION_MAX_MB = max(0.0, float(os.getenv("DOORBELL_EVENT_RETENTION_MAX_MB", "2048")))
+except ValueError:
+    EVENT_RETENTION_MAX_MB = 2048.0
+try:
+    EVENT_RETENTION_INTERVAL_SEC = max(10.0, float(os.getenv("DOORBELL_EVENT_RETENTION_INTERVAL_SEC", "600")))
+except ValueError:
+    EVENT_RETENTION_INTERVAL_SEC = 600.0
+# SQLite index over events.jsonl for /events queries (server/event_index.py).
+EVENT_INDEX_ENABLED = os.getenv("DOORBELL_EVENT_INDEX_ENABLED", "1").strip().lower() not in ("0", "false", "no")
+EVENT_INDEX_PATH = os.getenv("DOORBELL_EVENT_INDEX_PATH", os.path.join(BASE_DIR, "logs", "events.sqlite3"))
+# Snapshots + log lines are written by a background thread (server/event_writer.py).
+EVENT_WRITER_ASYNC = os.getenv("DOORBELL_EVENT_WRITER_ASYNC", "1").strip().lower() not in ("0", "false", "no")
+try:
+    EVENT_WRITER_QUEUE = max(1, int(os.getenv("DOORBELL_EVENT_WRITER_QUEUE", "8")))
+except ValueError:
+    EVENT_WRITER_QUEUE = 8
+try:
+    EVENT_WRITER_FLUSH_SEC = max(0.05, float(os.getenv("DOORBELL_EVENT_WRITER_FLUSH_SEC", "1.0")))
+except ValueError:
+    EVENT_WRITER_FLUSH_SEC = 1.0
+try:
+    EVENT_WRITER_FSYNC_SEC = max(0.0, float(os.getenv("DOORBELL_EVENT_WRITER_FSYNC_SEC", "5.0")))
+except ValueError:
+    EVENT_WRITER_FSYNC_SEC = 5.0
+# Coalesce near-identical events (same type/person, similar dHash + embedding) into one
+# event with a "count" (server/dedup.py).
+EVENT_DEDUP_ENABLED = os.getenv("DOORBELL_EVENT_DEDUP_ENABLED", "1").strip().lower() not in ("0", "false", "no")
+try:
+    EVENT_DEDUP_WINDOW_SEC = max(0.0, float(os.getenv("DOORBELL_EVENT_DEDUP_WINDOW_SEC", "60")))
+except ValueError:
+    EVENT_DEDUP_WINDOW_SEC = 60.0
+try:
+    EVENT_DEDUP_HASH_DISTANCE = max(0, min(64, int(os.getenv("DOORBELL_EVENT_DEDUP_HASH_DISTANCE", "10"))))
+except ValueError:
+    EVENT_DEDUP_HASH_DISTANCE = 10
+try:
+    EVENT_DEDUP_MIN_SIMILARITY = float(os.getenv("DOORBELL_EVENT_DEDUP_MIN_SIMILARITY", "0.8"))
+except ValueError:
+    EVENT_DEDUP_MIN_SIMILARITY = 0.8
+# Push channel: GET /events/stream (SSE) and /ws (server/push.py).
+try:
+    PUSH_QUEUE_SIZE = max(1, int(os.getenv("DOORBELL_PUSH_QUEUE_SIZE", "64")))
+except ValueError:
+    PUSH_QUEUE_SIZE = 64
+try:
+    PUSH_REPLAY_SIZE = max(1, int(os.getenv("DOORBELL_PUSH_REPLAY_SIZE", "256")))
+except ValueError:
+    PUSH_REPLAY_SIZE = 256
+try:
+    PUSH_HEARTBEAT_SEC = max(1.0, float(os.getenv("DOORBELL_PUSH_HEARTBEAT_SEC", "15")))
+except ValueError:
+    PUSH_HEARTBEAT_SEC = 15.0
+try:
+    PUSH_DOOR_POLL_SEC = max(0.05, float(os.getenv("DOORBELL_PUSH_DOOR_POLL_SEC", "0.25")))
+except ValueError:
+    PUSH_DOOR_POLL_SEC = 0.25
+# Live view: GET /stream.mjpg (server/live_stream.py), one shared encoder for all viewers.
+try:
+    STREAM_FPS = max(0.5, float(os.getenv("DOORBELL_STREAM_FPS", "10")))
+except ValueError:
+    STREAM_FPS = 10.0
+try:
+    STREAM_MAX_WIDTH = max(160, int(os.getenv("DOORBELL_STREAM_MAX_WIDTH", "640")))
+except ValueError:
+    STREAM_MAX_WIDTH = 640
+try:
+    STREAM_JPEG_QUALITY = max(30, min(95, int(os.getenv("DOORBELL_STREAM_JPEG_QUALITY", "70"))))
+except ValueError:
+    STREAM_JPEG_QUALITY = 70
+try:
+    STREAM_MAX_VIEWERS = max(1, int(os.getenv("DOORBELL_STREAM_MAX_VIEWERS", "4")))
+except ValueError:
+    STREAM_MAX_VIEWERS = 4
+# Door command executor (server/control.py): finished commands kept for GET /commands/{id}.
+try:
+    DOOR_COMMAND_HISTORY = max(16, int(os.getenv("DOORBELL_DOOR_COMMAND_HISTORY", "256")))
+except ValueError:
+    DOOR_COMMAND_HISTORY = 256
+try:
+    DOOR_COMMAND_WAIT_SEC = max(0.5, float(os.getenv("DOORBELL_DOOR_COMMAND_WAIT_SEC", "5")))
+except ValueError:
+    DOOR_COMMAND_WAIT_SEC = 5.0
+# POST /recognize micro-batching (server/recognize.py).
+try:
+    RECOGNIZE_BATCH_WINDOW_MS = max(0.0, float(os.getenv("DOORBELL_RECOGNIZE_BATCH_WINDOW_MS", "20")))
+except ValueError:
+    RECOGNIZE_BATCH_WINDOW_MS = 20.0
+try:
+    RECOGNIZE_MAX_BATCH = max(1, int(os.getenv("DOORBELL_RECOGNIZE_MAX_BATCH", "8")))
+except ValueError:
+    RECOGNIZE_MAX_BATCH = 8
+try:
+    RECOGNIZE_MAX_PENDING = max(1, int(os.getenv("DOORBELL_RECOGNIZE_MAX_PENDING", "32")))
+except ValueError:
+    RECOGNIZE_MAX_PENDING = 32
+try:
+    RECOGNIZE_MAX_BYTES = max(1024, int(os.getenv("DOORBELL_RECOGNIZE_MAX_BYTES", str(8 * 1024 * 1024))))
+except ValueError:
+    RECOGNIZE_MAX_BYTES = 8 * 1024 * 1024
+# Pre/post-roll clips around RING / UNKNOWN events (server/clip_recorder.py).
+CLIP_ENABLED = os.getenv("DOORBELL_CLIP_ENABLED", "1").strip().lower() not in ("0", "false", "no")
+CLIP_EVENT_TYPES = tuple(
+    t.strip().upper() for t in os.getenv("DOORBELL_CLIP_EVENT_TYPES", "RING,UNKNOWN").split(",") if t.strip()
+)
+try:
+    CLIP_PRE_SEC = max(0.0, float(os.getenv("DOORBELL_CLIP_PRE_SEC", "5")))
+except ValueError:
+    CLIP_PRE_SEC = 5.0
+try:
+    CLIP_POST_SEC = max(0.0, float(os.getenv("DOORBELL_CLIP_POST_SEC", "5")))
+except ValueError:
+    CLIP_POST_SEC = 5.0
+try:
+    CLIP_FPS = max(1.0, float(os.getenv("DOORBELL_CLIP_FPS", "8")))
+except ValueError:
+    CLIP_FPS = 8.0
+try:
+    CLIP_MAX_WIDTH = max(160, int(os.getenv("DOORBELL_CLIP_MAX_WIDTH", "640")))
+except ValueError:
+    CLIP_MAX_WIDTH = 640
+try:
+    CLIP_JPEG_QUALITY = max(30, min(95, int(os.getenv("DOORBELL_CLIP_JPEG_QUALITY", "70"))))
+except ValueError:
+    CLIP_JPEG_QUALITY = 70
+# RAM cap of the encoded pre-roll ring.
+try:
+    CLIP_RING_MB = max(1.0, float(os.getenv("DOORBELL_CLIP_RING_MB", "16")))
+except ValueError:
+    CLIP_RING_MB = 16.0
+# "mp4v" + ".mp4" works with stock OpenCV wheels; "MJPG" + ".avi" if mp4v is unavailable.
+CLIP_FOURCC = os.getenv("DOORBELL_CLIP_FOURCC", "mp4v").strip() or "mp4v"
+CLIP_EXT = os.getenv("DOORBELL_CLIP_EXT", ".mp4").strip() or ".mp4"
 
 # =========================================================
 # CAMERA CONFIG
@@ -26,6 +186,9 @@ EVENT_LOG_PATH = os.path.join(BASE_DIR, "logs", "events.jsonl")
 USE_PICAMERA2 = True
 FRAME_WIDTH = 1280
 FRAME_HEIGHT = 960
+# Replay source instead of the real camera (see camera/replay.py):
+# "synthetic", "synthetic:640x480", "file:/dir/of/jpgs", "video:/clip.mp4"
+CAMERA_SOURCE = os.getenv("DOORBELL_CAMERA_SOURCE", "").strip()
 
 # =====================================================
 # FACE RECOGNITION
@@ -55,6 +218,24 @@ try:
     GUI_INFER_TIMEOUT_SEC = max(2.0, float(os.getenv("DOORBELL_GUI_INFER_TIMEOUT_SEC", "8")))
 except ValueError:
     GUI_INFER_TIMEOUT_SEC = 8.0
+try:
+    PEOPLE_SEARCH_DEBOUNCE_MS = max(0, int(os.getenv("DOORBELL_PEOPLE_SEARCH_DEBOUNCE_MS", "150")))
+except ValueError:
+    PEOPLE_SEARCH_DEBOUNCE_MS = 150
+try:
+    PEOPLE_FETCH_CHUNK = max(16, int(os.getenv("DOORBELL_PEOPLE_FETCH_CHUNK", "256")))
+except ValueError:
+    PEOPLE_FETCH_CHUNK = 256
+try:
+    PEOPLE_THUMB_CACHE_ITEMS = max(1, int(os.getenv("DOORBELL_PEOPLE_THUMB_CACHE_ITEMS", "512")))
+except ValueError:
+    PEOPLE_THUMB_CACHE_ITEMS = 512
+PEOPLE_THUMB_PX = int(os.getenv("DOORBELL_PEOPLE_THUMB_PX", "40"))
+# Status labels/buttons/LCD are diffed and flushed at most once per this interval.
+try:
+    GUI_UI_REFRESH_MS = max(0, int(os.getenv("DOORBELL_GUI_UI_REFRESH_MS", "100")))
+except ValueError:
+    GUI_UI_REFRESH_MS = 100
 
 FACE_DISTANCE_PROMPT_ENABLED = os.getenv("DOORBELL_FACE_DISTANCE_PROMPT", "1").strip().lower() not in ("0", "false", "no")
 try:
@@ -63,6 +244,38 @@ except ValueError:
     FACE_DISTANCE_PROMPT_COOLDOWN_SEC = 3.0
 FACE_DISTANCE_PROMPT_CMD = os.getenv("DOORBELL_FACE_DISTANCE_PROMPT_CMD", "")
 
+# =========================================================
+# METRICS (About tab performance panel)
+# =========================================================
+METRICS_ENABLED = os.getenv("DOORBELL_METRICS_ENABLED", "1").strip().lower() not in ("0", "false", "no")
+try:
+    METRICS_WINDOW = max(16, int(os.getenv("DOORBELL_METRICS_WINDOW", "300")))
+except ValueError:
+    METRICS_WINDOW = 300
+try:
+    METRICS_RATE_WINDOW_SEC = max(1.0, float(os.getenv("DOORBELL_METRICS_RATE_WINDOW_SEC", "5")))
+except ValueError:
+    METRICS_RATE_WINDOW_SEC = 5.0
+
+# =========================================================
+# TRACING (per-frame spans, Chrome trace export)
+# =========================================================
+TRACE_ENABLED = os.getenv("DOORBELL_TRACE_ENABLED", "0").strip().lower() in ("1", "true", "yes")
+try:
+    TRACE_BUFFER_SIZE = max(256, int(os.getenv("DOORBELL_TRACE_BUFFER_SIZE", "16384")))
+except ValueError:
+    TRACE_BUFFER_SIZE = 16384
+TRACE_DUMP_DIR = os.getenv("DOORBELL_TRACE_DUMP_DIR", os.path.join(os.path.dirname(__file__), "logs"))
+
+# =========================================================
+# HEADLESS SERVICE
+# =========================================================
+HEADLESS = os.getenv("DOORBELL_HEADLESS", "0").strip().lower() not in ("0", "false", "no")
+try:
+    HEADLESS_FRAME_INTERVAL_SEC = max(0.0, float(os.getenv("DOORBELL_HEADLESS_FRAME_INTERVAL_SEC", "0.033")))
+except ValueError:
+    HEADLESS_FRAME_INTERVAL_SEC = 0.033
+
 # =========================================================
 # ABOUT TAB ACCESS
 # =========================================================
@@ -79,10 +292,52 @@ RECOGNITION_STABLE_HOLD_SEC = 1.0
 RECOGNITION_STABLE_MIN_SCORE = RECOGNITION_THRESHOLD
 N_DETECTION_FRAMES = 3
 
+# =========================================================
+# ADAPTIVE CADENCE
+# =========================================================
+# When enabled, detection interval / analysis scale / preview rate follow
+# measured latency, CPU temperature and face activity (scheduler.py).
+# When disabled, detection runs every N_DETECTION_FRAMES frames as before.
+CADENCE_ADAPTIVE_ENABLED = os.getenv("DOORBELL_CADENCE_ADAPTIVE", "1").strip().lower() not in ("0", "false", "no")
+CADENCE_TARGET_LATENCY_MS = float(os.getenv("DOORBELL_CADENCE_TARGET_LATENCY_MS", "120"))
+CADENCE_MAX_LATENCY_MS = float(os.getenv("DOORBELL_CADENCE_MAX_LATENCY_MS", "250"))
+CADENCE_ACTIVE_INTERVAL_SEC = float(os.getenv("DOORBELL_CADENCE_ACTIVE_INTERVAL_SEC", "0.0"))
+CADENCE_IDLE_INTERVAL_SEC = float(os.getenv("DOORBELL_CADENCE_IDLE_INTERVAL_SEC", "0.5"))
+CADENCE_ACTIVE_HOLD_SEC = float(os.getenv("DOORBELL_CADENCE_ACTIVE_HOLD_SEC", "2.0"))
+CADENCE_MIN_ANALYSIS_SCALE = float(os.getenv("DOORBELL_CADENCE_MIN_ANALYSIS_SCALE", "0.5"))
+CADENCE_ACTIVE_PREVIEW_MS = int(os.getenv("DOORBELL_CADENCE_ACTIVE_PREVIEW_MS", "33"))
+CADENCE_IDLE_PREVIEW_MS = int(os.getenv("DOORBELL_CADENCE_IDLE_PREVIEW_MS", "66"))
+CADENCE_MAX_PREVIEW_MS = int(os.getenv("DOORBELL_CADENCE_MAX_PREVIEW_MS", "200"))
+CADENCE_THERMAL_SOFT_C = float(os.getenv("DOORBELL_CADENCE_THERMAL_SOFT_C", "70"))
+CADENCE_THERMAL_HARD_C = float(os.getenv("DOORBELL_CADENCE_THERMAL_HARD_C", "80"))
+CADENCE_THERMAL_POLL_SEC = float(os.getenv("DOORBELL_CADENCE_THERMAL_POLL_SEC", "5"))
+
+# =========================================================
+# LOW-POWER IDLE
+# =========================================================
+# After IDLE_AFTER_SEC without a face or frame motion the runtime drops the
+# camera to IDLE_FRAME_* / IDLE_FPS, pauses the preview and parks the models.
+# Wake sources: PIR on MOTION_PIN, ring button, frame motion, API unlock.
+IDLE_ENABLED = os.getenv("DOORBELL_IDLE_ENABLED", "1").strip().lower() not in ("0", "false", "no")
+IDLE_AFTER_SEC = float(os.getenv("DOORBELL_IDLE_AFTER_SEC", "30"))
+IDLE_FRAME_WIDTH = int(os.getenv("DOORBELL_IDLE_FRAME_WIDTH", "640"))
+IDLE_FRAME_HEIGHT = int(os.getenv("DOORBELL_IDLE_FRAME_HEIGHT", "480"))
+IDLE_FPS = float(os.getenv("DOORBELL_IDLE_FPS", "5"))
+IDLE_POLL_MS = int(os.getenv("DOORBELL_IDLE_POLL_MS", "200"))
+IDLE_MOTION_THRESHOLD = float(os.getenv("DOORBELL_IDLE_MOTION_THRESHOLD", "6.0"))
+IDLE_UNLOAD_MODELS = os.getenv("DOORBELL_IDLE_UNLOAD_MODELS", "0").strip().lower() not in ("0", "false", "no")
+IDLE_PIR_ENABLED = os.getenv("DOORBELL_IDLE_PIR_ENABLED", "1").strip().lower() not in ("0", "false", "no")
+
 # =========================================================
 # FACE DATABASE
 # =========================================================
 DB_PATH = os.path.join(BASE_DIR, "face", "known_faces", "face_db.json")
+# Enrollment crops + thumbnails: <dir>/<shard>/<id>/{crop,thumb}.jpg
+FACE_THUMB_DIR = os.getenv("DOORBELL_FACE_THUMB_DIR", os.path.join(BASE_DIR, "face", "known_faces", "thumbs"))
+FACE_THUMB_SIZE = int(os.getenv("DOORBELL_FACE_THUMB_SIZE", "96"))
+FACE_THUMB_QUALITY = int(os.getenv("DOORBELL_FACE_THUMB_QUALITY", "85"))
+FACE_CROP_MAX_SIDE = int(os.getenv("DOORBELL_FACE_CROP_MAX_SIDE", "256"))
+FACE_THUMB_CACHE_MB = float(os.getenv("DOORBELL_FACE_THUMB_CACHE_MB", "8"))
 
 
 # =====================================================
@@ -14,10 +14,21 @@ class FaceDB:
         os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
         self.lock = threading.RLock()
         self.data = []
+        self._stamp = None
+        self.version = 0
         self.load()
 
+    def _file_stamp(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
     def load(self):
         with self.lock:
+            self._stamp = self._file_stamp()
+            self.version += 1
             if os.path.exists(self.path):
                 try:
                     with open(self.path, "r") as f:
@@ -27,11 +38,21 @@ class FaceDB:
             else:
                 self.data = []
 
+    def load_if_changed(self):
+        """Reload only if the file's mtime/size differ from the last load/save."""
+        with self.lock:
+            if self._file_stamp() == self._stamp:
+                return False
+            self.load()
+            return True
+
     def save(self):
         with self.lock:
             try:
                 with open(self.path, "w") as f:
                     json.dump(self.data, f, indent=2)
+                self._stamp = self._file_stamp()
+                self.version += 1
             except Exception as e:
                 print("[FaceDB] save failed:", e)
 
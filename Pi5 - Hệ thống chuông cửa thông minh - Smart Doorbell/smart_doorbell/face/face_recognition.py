@@ -1,5 +1,6 @@
 import cv2
 import math
+import time
 import numpy as np
 import mediapipe as mp
 try:
@@ -56,6 +57,8 @@ class FaceRecognition:
         self.last_bbox = None
 
     def reload_db(self):
+        # Pick up edits written by another FaceDB instance (e.g. People tab).
+        self.db.load_if_changed()
         self.DB = self.db.get_all_embeddings()
 
 
@@ -152,12 +155,18 @@ class FaceRecognition:
             return best_id, best_name, best_score
         return None, None, best_score
 
-    def detect_faces(self, frame):
+    def detect_faces(self, frame, timings=None, apply_roi=True):
+        t0 = time.perf_counter()
         rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        t1 = time.perf_counter()
         results = self.detector.process(rgb)
+        t2 = time.perf_counter()
+        if timings is not None:
+            timings["colour"] = (t1 - t0) * 1000.0
+            timings["detect"] = (t2 - t1) * 1000.0
         if not results or not results.detections:
             return results
-        if not FACE_ROI_ENABLED:
+        if not FACE_ROI_ENABLED or not apply_roi:
             return results
         min_cov = max(0.0, min(1.0, float(FACE_ROI_MIN_COVERAGE)))
         filtered = []
@@ -172,9 +181,11 @@ class FaceRecognition:
 
             filtered.append(det)
         results.detections = filtered
+        if timings is not None:
+            timings["roi_filter"] = (time.perf_counter() - t2) * 1000.0
         return results
 
-    def update_last_face(self, frame, detection):
+    def update_last_face(self, frame, detection, copy_crop=True):
         bbox = detection.location_data.relative_bounding_box
         h, w = frame.shape[:2]
 
@@ -187,10 +198,14 @@ class FaceRecognition:
         x2 = min(w, x1 + int(bbox.width * w))
         y2 = min(h, y1 + int(bbox.height * h))
 
-        face_crop = frame[y1:y2, x1:x2].copy()
+        # copy_crop=False hands back a view into the frame; the caller owns
+        # whatever copy it needs (runtime stores it in a pooled buffer).
+        face_crop = frame[y1:y2, x1:x2]
+        if copy_crop:
+            face_crop = face_crop.copy()
         embedding = self.get_embedding(face_crop)
 
-        self.last_face = face_crop
+        self.last_face = face_crop if copy_crop else None
         self.last_embedding = embedding
         self.last_bbox = (x1, y1, x2, y2)
 
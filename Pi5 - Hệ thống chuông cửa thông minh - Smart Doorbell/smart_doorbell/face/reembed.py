@@ -0,0 +1,62 @@
+"""Re-compute stored embeddings from the saved enrollment crops.
+
+Run after switching the embedding model (MODEL_PATH / IMG_SIZE):
+
+    python -m face.reembed            # update face_db.json in place
+    python -m face.reembed --dry-run  # only report what would change
+"""
+import argparse
+
+from face.face_recognition import FaceRecognition
+from face.thumb_store import get_thumb_store
+
+
+def reembed_all(face, store=None, dry_run=False):
+    store = store or get_thumb_store()
+    updated, missing, failed = [], [], []
+    new_embeddings = {}
+    for person in face.db.list_people():
+        pid = str(person.get("id", ""))
+        crop = store.load_crop(pid)
+        if crop is None:
+            missing.append(pid)
+            continue
+        try:
+            emb = face.extract_embedding(crop)
+        except Exception as exc:
+            failed.append((pid, str(exc)))
+            continue
+        new_embeddings[pid] = emb
+        updated.append(pid)
+    if not dry_run and updated:
+        # One save for the whole gallery; update_person() would rewrite face_db.json per person.
+        with face.db.lock:
+            for p in face.db.data:
+                emb = new_embeddings.get(str(p.get("id", "")))
+                if emb is None:
+                    continue
+                try:
+                    p["embedding"] = emb.tolist()
+                except Exception:
+                    p["embedding"] = list(emb)
+            face.db.save()
+        face.reload_db()
+    return updated, missing, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-embed enrolled people from stored crops")
+    parser.add_argument("--dry-run", action="store_true", help="do not write face_db.json")
+    args = parser.parse_args()
+
+    face = FaceRecognition()
+    updated, missing, failed = reembed_all(face, dry_run=args.dry_run)
+    print(f"[reembed] updated={len(updated)} missing_crop={len(missing)} failed={len(failed)}")
+    if missing:
+        print("[reembed] no crop (re-enroll these):", ", ".join(missing))
+    for pid, err in failed:
+        print(f"[reembed] {pid}: {err}")
+
+
+if __name__ == "__main__":
+    main()
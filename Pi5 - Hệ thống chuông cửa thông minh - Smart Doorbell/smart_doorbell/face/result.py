@@ -0,0 +1,174 @@
+import threading
+
+import numpy as np
+
+
+class CropPool:
+    """Small ring of reusable crop buffers.
+
+    Each store() overwrites the oldest slot, so a CropRef stays valid for the
+    next ``slots - 1`` stores. Readers copy out on demand via materialize().
+    """
+
+    def __init__(self, slots=4):
+        self._slots = max(2, int(slots))
+        self._buffers = [np.empty(0, dtype=np.uint8) for _ in range(self._slots)]
+        self._generations = [0] * self._slots
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def store(self, crop):
+        if crop is None or crop.size == 0:
+            return None
+        with self._lock:
+            slot = self._next
+            self._next = (slot + 1) % self._slots
+            buf = self._buffers[slot]
+            if buf.size < crop.size or buf.dtype != crop.dtype:
+                buf = np.empty(max(crop.size, buf.size), dtype=crop.dtype)
+                self._buffers[slot] = buf
+            np.copyto(buf[: crop.size].reshape(crop.shape), crop)
+            self._generations[slot] += 1
+            return CropRef(self, slot, self._generations[slot], crop.shape)
+
+    def _materialize(self, ref):
+        with self._lock:
+            if self._generations[ref.slot] != ref.generation:
+                return None
+            size = int(np.prod(ref.shape))
+            return self._buffers[ref.slot][:size].reshape(ref.shape).copy()
+
+
+class CropRef:
+    __slots__ = ("pool", "slot", "generation", "shape")
+
+    def __init__(self, pool, slot, generation, shape):
+        self.pool = pool
+        self.slot = slot
+        self.generation = generation
+        self.shape = tuple(shape)
+
+    def materialize(self):
+        return self.pool._materialize(self)
+
+
+class RecognitionResult:
+    """Immutable per-frame recognition result.
+
+    The face crop is held as an optional CropRef and only copied out when
+    someone asks for it (enrollment, event capture). ``get()``/``[]`` keep
+    the old dict-style access working for existing consumers.
+    """
+
+    __slots__ = (
+        "has_face",
+        "bbox",
+        "crop_ref",
+        "embedding",
+        "is_real",
+        "id",
+        "name",
+        "score",
+        "error",
+        "size_area",
+        "size_status",
+        "stabilizing",
+        "timings",
+        "latency_ms",
+        "token",
+    )
+
+    _ALIASES = {"_token": "token"}
+
+    def __init__(
+        self,
+        has_face=False,
+        bbox=None,
+        crop_ref=None,
+        embedding=None,
+        is_real=None,
+        id=None,
+        name=None,
+        score=None,
+        error=None,
+        size_area=None,
+        size_status=None,
+        stabilizing=None,
+        timings=None,
+        latency_ms=None,
+        token=None,
+    ):
+        _set = object.__setattr__
+        _set(self, "has_face", bool(has_face))
+        _set(self, "bbox", tuple(bbox) if bbox is not None else None)
+        _set(self, "crop_ref", crop_ref)
+        _set(self, "embedding", embedding)
+        _set(self, "is_real", is_real)
+        _set(self, "id", id)
+        _set(self, "name", name)
+        _set(self, "score", score)
+        _set(self, "error", error)
+        _set(self, "size_area", size_area)
+        _set(self, "size_status", size_status)
+        _set(self, "stabilizing", stabilizing)
+        _set(self, "timings", timings)
+        _set(self, "latency_ms", latency_ms)
+        _set(self, "token", token)
+
+    @classmethod
+    def failed(cls, message):
+        return cls(error=message)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("RecognitionResult is immutable; use replace()")
+
+    def __delattr__(self, key):
+        raise AttributeError("RecognitionResult is immutable")
+
+    def replace(self, **changes):
+        fields = {name: getattr(self, name) for name in self.__slots__}
+        for key, value in changes.items():
+            key = self._ALIASES.get(key, key)
+            if key not in fields:
+                raise KeyError(key)
+            fields[key] = value
+        return RecognitionResult(**fields)
+
+    def face_crop(self):
+        if self.crop_ref is None:
+            return None
+        return self.crop_ref.materialize()
+
+    def get(self, key, default=None):
+        if key == "face_crop":
+            crop = self.face_crop()
+            return default if crop is None else crop
+        key = self._ALIASES.get(key, key)
+        if key not in self.__slots__:
+            return default
+        value = getattr(self, key)
+        return default if value is None else value
+
+    def __getitem__(self, key):
+        if key == "face_crop":
+            return self.face_crop()
+        key = self._ALIASES.get(key, key)
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key == "face_crop" or self._ALIASES.get(key, key) in self.__slots__
+
+    def to_dict(self):
+        out = {name: getattr(self, name) for name in self.__slots__ if name != "crop_ref"}
+        out["bbox"] = list(self.bbox) if self.bbox is not None else None
+        if self.embedding is not None:
+            out["embedding"] = None
+        return out
+
+    def __repr__(self):
+        return (
+            f"RecognitionResult(has_face={self.has_face}, id={self.id!r}, "
+            f"name={self.name!r}, score={self.score!r}, error={self.error!r})"
+        )
@@ -0,0 +1,214 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+try:
+    from config import (
+        FACE_THUMB_DIR,
+        FACE_THUMB_SIZE,
+        FACE_THUMB_QUALITY,
+        FACE_CROP_MAX_SIDE,
+        FACE_THUMB_CACHE_MB,
+    )
+except Exception:
+    FACE_THUMB_DIR = os.path.join(os.path.dirname(__file__), "known_faces", "thumbs")
+    FACE_THUMB_SIZE = 96
+    FACE_THUMB_QUALITY = 85
+    FACE_CROP_MAX_SIDE = 256
+    FACE_THUMB_CACHE_MB = 8
+
+
+def _safe_id(person_id):
+    text = str(person_id or "").strip()
+    return "".join(ch for ch in text if ch.isalnum() or ch in "-_") or "_"
+
+
+class ThumbStore:
+    """Enrollment crops + fixed-size JPEG thumbnails on disk.
+
+    Layout: ``<root>/<shard>/<id>/crop.jpg`` and ``thumb.jpg`` where ``shard``
+    is two hex chars of sha1(id), so no directory grows past a few hundred
+    entries. Thumbnails are generated from the crop on first request and
+    encoded bytes are kept in a byte-bounded LRU.
+    """
+
+    def __init__(self, root=FACE_THUMB_DIR, size=FACE_THUMB_SIZE, quality=FACE_THUMB_QUALITY,
+                 crop_max_side=FACE_CROP_MAX_SIDE, cache_mb=FACE_THUMB_CACHE_MB):
+        self.root = root
+        self.size = max(16, int(size))
+        self.quality = max(10, min(100, int(quality)))
+        self.crop_max_side = max(self.size, int(crop_max_side))
+        self.cache_limit = max(0, int(float(cache_mb) * 1024 * 1024))
+        self._cache = OrderedDict()
+        self._cache_bytes = 0
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------
+    # Paths
+    # ------------------------------------------------------------
+    def _person_dir(self, person_id):
+        pid = _safe_id(person_id)
+        shard = hashlib.sha1(pid.encode("utf-8")).hexdigest()[:2]
+        return os.path.join(self.root, shard, pid)
+
+    def crop_path(self, person_id):
+        return os.path.join(self._person_dir(person_id), "crop.jpg")
+
+    def thumb_path(self, person_id):
+        return os.path.join(self._person_dir(person_id), "thumb.jpg")
+
+    def has_crop(self, person_id):
+        return os.path.isfile(self.crop_path(person_id))
+
+    # ------------------------------------------------------------
+    # Write
+    # ------------------------------------------------------------
+    def save_crop(self, person_id, crop_bgr):
+        if crop_bgr is None or getattr(crop_bgr, "size", 0) == 0:
+            return False
+        h, w = crop_bgr.shape[:2]
+        scale = min(1.0, self.crop_max_side / float(max(h, w)))
+        if scale < 1.0:
+            crop_bgr = cv2.resize(
+                crop_bgr,
+                (max(1, int(w * scale)), max(1, int(h * scale))),
+                interpolation=cv2.INTER_AREA,
+            )
+        ok, buf = cv2.imencode(".jpg", crop_bgr, [int(cv2.IMWRITE_JPEG_QUALITY), 92])
+        if not ok:
+            return False
+        folder = self._person_dir(person_id)
+        try:
+            os.makedirs(folder, exist_ok=True)
+            tmp = self.crop_path(person_id) + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(buf.tobytes())
+            os.replace(tmp, self.crop_path(person_id))
+            # The old thumbnail is stale; it is regenerated on next request.
+            if os.path.isfile(self.thumb_path(person_id)):
+                os.remove(self.thumb_path(person_id))
+        except Exception as exc:
+            print(f"[ThumbStore] save failed for {person_id}: {exc}")
+            return False
+        self._evict(person_id)
+        return True
+
+    def delete(self, person_id):
+        self._evict(person_id)
+        folder = self._person_dir(person_id)
+        for path in (self.crop_path(person_id), self.thumb_path(person_id)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        try:
+            os.rmdir(folder)
+        except OSError:
+            pass
+
+    # ------------------------------------------------------------
+    # Read
+    # ------------------------------------------------------------
+    def load_crop(self, person_id):
+        path = self.crop_path(person_id)
+        if not os.path.isfile(path):
+            return None
+        return cv2.imread(path)
+
+    def thumb_bytes(self, person_id):
+        key = _safe_id(person_id)
+        with self._lock:
+            data = self._cache.get(key)
+            if data is not None:
+                self._cache.move_to_end(key)
+                return data
+
+        data = None
+        path = self.thumb_path(person_id)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            data = self._generate_thumb(person_id)
+        if data:
+            self._remember(key, data)
+        return data
+
+    def _generate_thumb(self, person_id):
+        crop = self.load_crop(person_id)
+        if crop is None:
+            return None
+        h, w = crop.shape[:2]
+        scale = self.size / float(max(h, w))
+        resized = cv2.resize(
+            crop,
+            (max(1, int(w * scale)), max(1, int(h * scale))),
+            interpolation=cv2.INTER_AREA,
+        )
+        thumb = np.zeros((self.size, self.size, 3), dtype=np.uint8)
+        rh, rw = resized.shape[:2]
+        y0 = (self.size - rh) // 2
+        x0 = (self.size - rw) // 2
+        thumb[y0:y0 + rh, x0:x0 + rw] = resized
+        ok, buf = cv2.imencode(".jpg", thumb, [int(cv2.IMWRITE_JPEG_QUALITY), self.quality])
+        if not ok:
+            return None
+        data = buf.tobytes()
+        try:
+            tmp = self.thumb_path(person_id) + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self.thumb_path(person_id))
+        except OSError:
+            pass
+        return data
+
+    # ------------------------------------------------------------
+    # LRU
+    # ------------------------------------------------------------
+    def _remember(self, key, data):
+        if not self.cache_limit or len(data) > self.cache_limit:
+            return
+        with self._lock:
+            old = self._cache.pop(key, None)
+            if old is not None:
+                self._cache_bytes -= len(old)
+            self._cache[key] = data
+            self._cache_bytes += len(data)
+            while self._cache_bytes > self.cache_limit and self._cache:
+                _, dropped = self._cache.popitem(last=False)
+                self._cache_bytes -= len(dropped)
+
+    def _evict(self, person_id):
+        key = _safe_id(person_id)
+        with self._lock:
+            old = self._cache.pop(key, None)
+            if old is not None:
+                self._cache_bytes -= len(old)
+
+
+_thumb_store = None
+_thumb_store_lock = threading.Lock()
+
+
+def get_thumb_store():
+    global _thumb_store
+    with _thumb_store_lock:
+        if _thumb_store is None:
+            _thumb_store = ThumbStore()
+        return _thumb_store
+
+
+def save_enrollment_crop(person_id, crop_bgr):
+    """Best-effort: enrollment must not fail because the thumbnail write did."""
+    if not person_id or crop_bgr is None:
+        return False
+    try:
+        return get_thumb_store().save_crop(person_id, crop_bgr)
+    except Exception as exc:
+        print(f"[ThumbStore] enrollment crop not saved: {exc}")
+        return False
@@ -0,0 +1,263 @@
+from collections import OrderedDict
+
+from PySide6 import QtCore, QtGui
+
+try:
+    from config import PEOPLE_SEARCH_DEBOUNCE_MS, PEOPLE_FETCH_CHUNK, PEOPLE_THUMB_CACHE_ITEMS, PEOPLE_THUMB_PX
+except Exception:
+    PEOPLE_SEARCH_DEBOUNCE_MS = 150
+    PEOPLE_FETCH_CHUNK = 256
+    PEOPLE_THUMB_CACHE_ITEMS = 512
+    PEOPLE_THUMB_PX = 40
+
+
+def _id_sort_key(pid):
+    pid = str(pid)
+    return (0, int(pid), pid) if pid.isdigit() else (1, 0, pid)
+
+
+class NameIndex:
+    """Trigram index over lower-cased names for substring search.
+
+    Queries of 3+ characters intersect trigram posting sets and then verify
+    the substring on the few candidates; shorter queries fall back to a scan
+    of the pre-lowered names.
+    """
+
+    def __init__(self, names=()):
+        self._names = []
+        self._grams = {}
+        self.rebuild(names)
+
+    @staticmethod
+    def _trigrams(text):
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def rebuild(self, names):
+        self._names = [str(n or "").lower() for n in names]
+        grams = {}
+        for pos, name in enumerate(self._names):
+            for gram in self._trigrams(name):
+                bucket = grams.get(gram)
+                if bucket is None:
+                    grams[gram] = {pos}
+                else:
+                    bucket.add(pos)
+        self._grams = grams
+
+    def search(self, query):
+        """Return the set of positions whose name contains ``query``, or None for all."""
+        query = str(query or "").strip().lower()
+        if not query:
+            return None
+        names = self._names
+        if len(query) < 3:
+            return {pos for pos, name in enumerate(names) if query in name}
+        buckets = []
+        for gram in self._trigrams(query):
+            bucket = self._grams.get(gram)
+            if not bucket:
+                return set()
+            buckets.append(bucket)
+        buckets.sort(key=len)
+        candidates = set(buckets[0])
+        for bucket in buckets[1:]:
+            candidates &= bucket
+            if not candidates:
+                return candidates
+        return {pos for pos in candidates if query in names[pos]}
+
+
+class ThumbPixmapCache:
+    """Bounded LRU of decoded thumbnails (``None`` remembered for people without one)."""
+
+    def __init__(self, max_items=PEOPLE_THUMB_CACHE_ITEMS, px=PEOPLE_THUMB_PX):
+        self.max_items = max(1, int(max_items))
+        self.px = max(16, int(px))
+        self._items = OrderedDict()
+        self._store = None
+
+    def _thumb_store(self):
+        if self._store is None:
+            try:
+                from face.thumb_store import get_thumb_store
+
+                self._store = get_thumb_store()
+            except Exception:
+                self._store = False
+        return self._store or None
+
+    def clear(self):
+        self._items.clear()
+
+    def get(self, person_id):
+        if person_id in self._items:
+            self._items.move_to_end(person_id)
+            return self._items[person_id]
+        pixmap = None
+        store = self._thumb_store()
+        if store is not None:
+            try:
+                data = store.thumb_bytes(person_id)
+            except Exception:
+                data = None
+            if data:
+                pixmap = QtGui.QPixmap()
+                if pixmap.loadFromData(data):
+                    pixmap = pixmap.scaled(
+                        self.px,
+                        self.px,
+                        QtCore.Qt.KeepAspectRatio,
+                        QtCore.Qt.SmoothTransformation,
+                    )
+                else:
+                    pixmap = None
+        self._items[person_id] = pixmap
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+        return pixmap
+
+
+class PeopleTableModel(QtCore.QAbstractTableModel):
+    """Read-only (id, name) table with indexed filtering and lazy row loading."""
+
+    HEADERS = ("ID", "Name")
+
+    def __init__(self, parent=None, chunk=None):
+        super().__init__(parent)
+        self._chunk = max(16, int(PEOPLE_FETCH_CHUNK if chunk is None else chunk))
+        self._ids = []
+        self._names = []
+        self._index = NameIndex()
+        self._order = []
+        self._rank_cache = None
+        self._visible = []
+        self._loaded = 0
+        self._query = ""
+        self._sort_column = 0
+        self._sort_order = QtCore.Qt.AscendingOrder
+        self.thumbs = ThumbPixmapCache()
+
+    # ------------------------------------------------------------
+    # Data
+    # ------------------------------------------------------------
+    def set_people(self, people):
+        self.beginResetModel()
+        self.thumbs.clear()
+        self._ids = [str(p.get("id", "")) for p in people]
+        self._names = [str(p.get("name", "")) for p in people]
+        self._index.rebuild(self._names)
+        self._order = self._sorted_positions()
+        self._visible = self._filter_positions()
+        self._loaded = min(len(self._visible), self._chunk)
+        self.endResetModel()
+
+    def set_filter(self, text):
+        text = str(text or "").strip()
+        if text == self._query:
+            return
+        self.beginResetModel()
+        self._query = text
+        self._visible = self._filter_positions()
+        self._loaded = min(len(self._visible), self._chunk)
+        self.endResetModel()
+
+    def _sorted_positions(self):
+        self._rank_cache = None
+        positions = range(len(self._ids))
+        if self._sort_column == 1:
+            key = lambda pos: (self._names[pos].lower(), _id_sort_key(self._ids[pos]))
+        else:
+            key = lambda pos: _id_sort_key(self._ids[pos])
+        return sorted(positions, key=key, reverse=self._sort_order == QtCore.Qt.DescendingOrder)
+
+    def _filter_positions(self):
+        matches = self._index.search(self._query)
+        if matches is None:
+            return list(self._order)
+        if len(matches) * 8 < len(self._order):
+            # Small result: sort the hits by rank instead of walking everything.
+            rank = self._rank()
+            return sorted(matches, key=rank.__getitem__)
+        return [pos for pos in self._order if pos in matches]
+
+    def _rank(self):
+        if self._rank_cache is None:
+            rank = [0] * len(self._order)
+            for r, pos in enumerate(self._order):
+                rank[pos] = r
+            self._rank_cache = rank
+        return self._rank_cache
+
+    def total_count(self):
+        return len(self._ids)
+
+    def match_count(self):
+        return len(self._visible)
+
+    def person_at(self, row):
+        if row < 0 or row >= self._loaded:
+            return None, None
+        pos = self._visible[row]
+        return self._ids[pos], self._names[pos]
+
+    # ------------------------------------------------------------
+    # Qt model API
+    # ------------------------------------------------------------
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._loaded
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def canFetchMore(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return False
+        return self._loaded < len(self._visible)
+
+    def fetchMore(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return
+        remaining = len(self._visible) - self._loaded
+        count = min(self._chunk, remaining)
+        if count <= 0:
+            return
+        self.beginInsertRows(QtCore.QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if row >= self._loaded:
+            return None
+        pos = self._visible[row]
+        if role == QtCore.Qt.DisplayRole:
+            return self._ids[pos] if index.column() == 0 else self._names[pos]
+        if role == QtCore.Qt.DecorationRole and index.column() == 1:
+            # Only rows the view actually paints get decoded.
+            return self.thumbs.get(self._ids[pos])
+        return None
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role != QtCore.Qt.DisplayRole or orientation != QtCore.Qt.Horizontal:
+            return None
+        if 0 <= section < len(self.HEADERS):
+            return self.HEADERS[section]
+        return None
+
+    def sort(self, column, order=QtCore.Qt.AscendingOrder):
+        if column == self._sort_column and order == self._sort_order and self._order:
+            return
+        self.beginResetModel()
+        self._sort_column = column
+        self._sort_order = order
+        self._order = self._sorted_positions()
+        self._visible = self._filter_positions()
+        self._loaded = min(len(self._visible), max(self._loaded, self._chunk))
+        self.endResetModel()
@@ -1,6 +1,13 @@
+import math
+from collections import OrderedDict
+
 import cv2
+import numpy as np
 from PySide6 import QtCore, QtGui
 
+# Qt >= 5.14 can read BGR memory directly, which saves a cvtColor per frame.
+_FORMAT_BGR888 = getattr(QtGui.QImage, "Format_BGR888", None)
+
 
 def bgr_to_qimage(frame_bgr):
     if frame_bgr is None:
@@ -22,6 +29,163 @@ def frame_to_pixmap(frame_bgr, target_size):
         QtCore.Qt.SmoothTransformation,
     )
 
+
+class PreviewRenderer:
+    """Downscale-first preview path for the live label.
+
+    The frame is resized once (INTER_AREA) into a reused buffer at label
+    resolution, overlays are drawn on that small buffer, and the QImage wraps
+    the buffer memory without a copy.
+    """
+
+    def __init__(self):
+        self._buffer = None
+        self._rgb = None
+        self._image = None
+
+    @staticmethod
+    def fit_size(frame_shape, target_size):
+        h, w = frame_shape[:2]
+        tw = max(1, int(target_size.width()))
+        th = max(1, int(target_size.height()))
+        scale = min(tw / float(w), th / float(h))
+        return max(1, int(w * scale)), max(1, int(h * scale)), scale
+
+    def render(self, frame_bgr, target_size, draw=None):
+        if frame_bgr is None:
+            return None
+        h, w = frame_bgr.shape[:2]
+        pw, ph, scale = self.fit_size(frame_bgr.shape, target_size)
+
+        buf = self._buffer
+        if buf is None or buf.shape[0] != ph or buf.shape[1] != pw:
+            buf = np.empty((ph, pw, 3), dtype=np.uint8)
+            self._buffer = buf
+        if pw == w and ph == h:
+            np.copyto(buf, frame_bgr)
+        else:
+            interp = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR
+            cv2.resize(frame_bgr, (pw, ph), dst=buf, interpolation=interp)
+
+        if draw is not None:
+            draw(buf, scale)
+
+        # Keep the wrapped buffer referenced by self._image until the next
+        # frame; QPixmap.fromImage() makes the only remaining copy.
+        self._image = self._wrap(buf)
+        return QtGui.QPixmap.fromImage(self._image)
+
+    def _wrap(self, buf):
+        h, w = buf.shape[:2]
+        if _FORMAT_BGR888 is not None:
+            return QtGui.QImage(buf.data, w, h, buf.strides[0], _FORMAT_BGR888)
+        rgb = self._rgb
+        if rgb is None or rgb.shape != buf.shape:
+            rgb = np.empty_like(buf)
+            self._rgb = rgb
+        cv2.cvtColor(buf, cv2.COLOR_BGR2RGB, dst=rgb)
+        return QtGui.QImage(rgb.data, w, h, rgb.strides[0], QtGui.QImage.Format_RGB888)
+
+
+class _RoiSprite:
+    __slots__ = ("x0", "y0", "x1", "y1", "inv_alpha", "premult", "work")
+
+    def __init__(self, x0, y0, x1, y1, inv_alpha, premult):
+        self.x0 = x0
+        self.y0 = y0
+        self.x1 = x1
+        self.y1 = y1
+        self.inv_alpha = inv_alpha
+        self.premult = premult
+        self.work = np.empty(premult.shape, dtype=np.uint16)
+
+
+class RoiSpriteCache:
+    """Pre-rendered rotated-ellipse ROI overlays, keyed by geometry and style.
+
+    Each sprite is an RGBA layer stored premultiplied in fixed point
+    (``(1 - a) * 256`` and ``color * a * 256``) over the ellipse bounding
+    box only, so compositing is a multiply-add-shift on that region.
+    """
+
+    def __init__(self, max_entries=8):
+        self.max_entries = max(1, int(max_entries))
+        self._sprites = OrderedDict()
+
+    def __len__(self):
+        return len(self._sprites)
+
+    def clear(self):
+        self._sprites.clear()
+
+    def get(self, shape, bounds, angle_deg, color, fill_alpha, thickness=2):
+        key = (
+            tuple(shape[:2]),
+            tuple(bounds),
+            round(float(angle_deg), 2),
+            tuple(color),
+            round(float(fill_alpha), 3),
+            int(thickness),
+        )
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self._sprites.move_to_end(key)
+            return sprite
+        sprite = self._build(shape, bounds, angle_deg, color, fill_alpha, thickness)
+        self._sprites[key] = sprite
+        while len(self._sprites) > self.max_entries:
+            self._sprites.popitem(last=False)
+        return sprite
+
+    def _build(self, shape, bounds, angle_deg, color, fill_alpha, thickness):
+        h, w = shape[:2]
+        x0, y0, x1, y1 = bounds
+        if x1 <= x0 or y1 <= y0:
+            return None
+        cx = int((x0 + x1) / 2)
+        cy = int((y0 + y1) / 2)
+        ax = max(2, int((x1 - x0) / 2))
+        ay = max(2, int((y1 - y0) / 2))
+        rad = math.radians(float(angle_deg))
+        pad = int(thickness) + 1
+        ex = int(math.ceil(math.hypot(ax * math.cos(rad), ay * math.sin(rad)))) + pad
+        ey = int(math.ceil(math.hypot(ax * math.sin(rad), ay * math.cos(rad)))) + pad
+        bx0, by0 = max(0, cx - ex), max(0, cy - ey)
+        bx1, by1 = min(w, cx + ex + 1), min(h, cy + ey + 1)
+        if bx1 <= bx0 or by1 <= by0:
+            return None
+
+        center = (cx - bx0, cy - by0)
+        size = (by1 - by0, bx1 - bx0)
+        alpha = np.zeros(size, dtype=np.uint8)
+        if fill_alpha and fill_alpha > 0:
+            level = int(round(max(0.0, min(1.0, float(fill_alpha))) * 255))
+            cv2.ellipse(alpha, center, (ax, ay), float(angle_deg), 0, 360, level, -1)
+        if thickness and thickness > 0:
+            outline = np.zeros(size, dtype=np.uint8)
+            cv2.ellipse(outline, center, (ax, ay), float(angle_deg), 0, 360, 255, int(thickness), cv2.LINE_AA)
+            np.maximum(alpha, outline, out=alpha)
+
+        a = alpha.astype(np.uint16)[..., None]
+        inv_alpha = (256 - a - (a >> 7)).astype(np.uint16)
+        color_arr = np.asarray(color, dtype=np.uint16).reshape(1, 1, 3)
+        premult = ((256 - inv_alpha) * color_arr).astype(np.uint16)
+        return _RoiSprite(bx0, by0, bx1, by1, inv_alpha, premult)
+
+    def composite(self, img, bounds, angle_deg, color, fill_alpha, thickness=2):
+        if img is None:
+            return
+        sprite = self.get(img.shape, bounds, angle_deg, color, fill_alpha, thickness)
+        if sprite is None:
+            return
+        sub = img[sprite.y0:sprite.y1, sprite.x0:sprite.x1]
+        work = sprite.work
+        np.multiply(sub, sprite.inv_alpha, out=work)
+        np.add(work, sprite.premult, out=work)
+        np.right_shift(work, 8, out=work)
+        np.copyto(sub, work, casting="unsafe")
+
+
 def build_stylesheet():
     return """
     QMainWindow {
@@ -1,11 +1,24 @@
 from PySide6 import QtCore, QtWidgets
 
+from metrics import PIPELINE_STAGES, get_metrics
+from tracing import dump_trace, get_tracer, set_enabled as set_trace_enabled
+
 try:
     import config as _config
 except Exception:
     _config = None
 
 
+def _fmt_ms(value):
+    return "-" if value is None else f"{value:.1f}"
+
+
+def _fmt(value, fmt="{:.1f}", suffix=""):
+    if value is None:
+        return "n/a"
+    return fmt.format(value) + suffix
+
+
 class AboutTab(QtWidgets.QWidget):
     def __init__(self, live_tab, parent=None):
         super().__init__(parent)
@@ -59,6 +72,8 @@ class AboutTab(QtWidgets.QWidget):
         info_row.addWidget(diagnostics_card, 3)
         info_row.addWidget(policy_card, 2)
 
+        performance_card = self._build_performance_card()
+
         layout = QtWidgets.QVBoxLayout(self)
         layout.addLayout(top)
         layout.addSpacing(6)
@@ -66,11 +81,17 @@ class AboutTab(QtWidgets.QWidget):
         layout.addWidget(self.message_box)
         layout.addSpacing(6)
         layout.addLayout(info_row)
+        layout.addWidget(performance_card)
         layout.addWidget(self.status_label)
         layout.addStretch()
 
         self.refresh()
 
+        self._perf_timer = QtCore.QTimer(self)
+        self._perf_timer.setInterval(1000)
+        self._perf_timer.timeout.connect(self._refresh_performance)
+        self._perf_timer.start()
+
     def _live_label(self, name, fallback):
         if name in self._label_cache:
             return self._label_cache[name]
@@ -121,6 +142,124 @@ class AboutTab(QtWidgets.QWidget):
 
         return card
 
+    def _build_performance_card(self):
+        card = QtWidgets.QFrame()
+        card.setProperty("card", True)
+        card_layout = QtWidgets.QHBoxLayout(card)
+        card_layout.setContentsMargins(12, 12, 12, 12)
+        card_layout.setSpacing(12)
+
+        left = QtWidgets.QVBoxLayout()
+        title = QtWidgets.QLabel("Performance (rolling)")
+        title.setProperty("role", "section")
+        left.addWidget(title)
+
+        self._perf_stages = tuple(PIPELINE_STAGES) + ("infer",)
+        self.stage_table = QtWidgets.QTableWidget(len(self._perf_stages), 5)
+        self.stage_table.setHorizontalHeaderLabels(["Stage", "p50 ms", "p95 ms", "p99 ms", "n"])
+        self.stage_table.verticalHeader().setVisible(False)
+        self.stage_table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.stage_table.setSelectionMode(QtWidgets.QAbstractItemView.NoSelection)
+        self.stage_table.horizontalHeader().setStretchLastSection(True)
+        for row, stage in enumerate(self._perf_stages):
+            self.stage_table.setItem(row, 0, QtWidgets.QTableWidgetItem(stage))
+            for col in range(1, 5):
+                self.stage_table.setItem(row, col, QtWidgets.QTableWidgetItem("-"))
+        self.stage_table.setMinimumHeight(260)
+        left.addWidget(self.stage_table)
+
+        trace_row = QtWidgets.QHBoxLayout()
+        self.toggle_trace = QtWidgets.QCheckBox("Per-frame tracing")
+        self.toggle_trace.setChecked(get_tracer().enabled)
+        self.toggle_trace.toggled.connect(set_trace_enabled)
+        self.btn_export_trace = QtWidgets.QPushButton("Export trace")
+        self.btn_export_trace.setProperty("kind", "secondary")
+        self.btn_export_trace.clicked.connect(self.export_trace)
+        trace_row.addWidget(self.toggle_trace)
+        trace_row.addStretch(1)
+        trace_row.addWidget(self.btn_export_trace)
+        left.addLayout(trace_row)
+
+        right = QtWidgets.QGridLayout()
+        right.setHorizontalSpacing(12)
+        right.setVerticalSpacing(6)
+        self._perf_values = {}
+        rows = (
+            ("camera_fps", "Camera fps"),
+            ("processed_fps", "Processed fps"),
+            ("preview_fps", "Preview fps"),
+            ("queue", "Inference queue"),
+            ("dropped", "Dropped / skipped"),
+            ("cpu", "CPU / load"),
+            ("temp", "Temp / throttle"),
+            ("rss", "RSS"),
+            ("scale", "Analysis scale"),
+        )
+        for row, (key, label) in enumerate(rows):
+            name = QtWidgets.QLabel(label)
+            name.setProperty("role", "muted")
+            value = QtWidgets.QLabel("n/a")
+            value.setProperty("chip", True)
+            right.addWidget(name, row, 0)
+            right.addWidget(value, row, 1)
+            self._perf_values[key] = value
+
+        card_layout.addLayout(left, 3)
+        card_layout.addLayout(right, 2)
+        return card
+
+    def _refresh_performance(self):
+        if not self.isVisible():
+            return
+        snap = get_metrics().snapshot()
+        stages = snap.get("stages", {})
+        for row, stage in enumerate(self._perf_stages):
+            summary = stages.get(stage) or {}
+            values = (
+                _fmt_ms(summary.get("p50")),
+                _fmt_ms(summary.get("p95")),
+                _fmt_ms(summary.get("p99")),
+                str(summary.get("count", 0)),
+            )
+            for col, text in enumerate(values, start=1):
+                item = self.stage_table.item(row, col)
+                if item is not None and item.text() != text:
+                    item.setText(text)
+
+        rates = snap.get("rates", {})
+        counters = snap.get("counters", {})
+        gauges = snap.get("gauges", {})
+        system = snap.get("system", {})
+        throttled = system.get("throttled")
+        runtime = getattr(self._live_tab, "runtime", None)
+        scheduler = getattr(runtime, "scheduler", None)
+        texts = {
+            "camera_fps": _fmt(rates.get("camera")),
+            "processed_fps": _fmt(rates.get("processed")),
+            "preview_fps": _fmt(rates.get("preview")),
+            "queue": str(gauges.get("infer_queue", 0)),
+            "dropped": f"{counters.get('frames_dropped', 0)} / {counters.get('frames_skipped', 0)}",
+            "cpu": f"{_fmt(system.get('cpu_percent'), suffix='%')} / {_fmt(system.get('load1'), '{:.2f}')}",
+            "temp": "{} / {}".format(
+                _fmt(system.get("cpu_temp_c"), suffix=" C"),
+                "n/a" if throttled is None else hex(throttled),
+            ),
+            "rss": _fmt(system.get("rss_mb"), suffix=" MB"),
+            "scale": _fmt(getattr(scheduler, "analysis_scale", None), "{:.2f}"),
+        }
+        for key, text in texts.items():
+            label = self._perf_values.get(key)
+            if label is not None and label.text() != text:
+                label.setText(text)
+
+    def export_trace(self):
+        try:
+            path = dump_trace()
+        except Exception as exc:
+            self.status_label.setText(f"Trace export failed: {exc}")
+            return
+        self.status_label.setText(f"Trace written to {path}")
+
     def _build_policy_card(self):
         card = QtWidgets.QFrame()
         card.setProperty("card", True)
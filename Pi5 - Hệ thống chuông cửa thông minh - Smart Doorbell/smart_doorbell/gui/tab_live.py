@@ -1,6 +1,5 @@
 import os
 import time
-import json
 
 import cv2
 import math
@@ -12,9 +11,14 @@ from PySide6 import QtCore, QtWidgets
 from gui.alert import KnownPersonAlert
 from gui.door_control import build_door_controller
 from gui.doorbell_button import DoorbellRingButton
-from gui.qt_utils import frame_to_pixmap
-from utils.lcd_i2c import get_lcd_display
+from face.result import RecognitionResult
+from gui.qt_utils import PreviewRenderer, RoiSpriteCache
+from gui.view_model import WidgetViewModel
+from metrics import get_metrics
+from tracing import get_tracer, span
+from utils.lcd_i2c import get_lcd_display, lcd_person_from_result
 from runtime import DoorbellRuntime
+from server.control import face_policy_command, get_door_executor, lock_command, unlock_command
 
 try:
     from config import N_DETECTION_FRAMES
@@ -49,6 +53,7 @@ try:
         GUI_AUTO_INFER,
         GUI_THREAD_INFER,
         GUI_INFER_TIMEOUT_SEC,
+        IDLE_POLL_MS,
     )
 except Exception:
     FACE_ROI_ENABLED = False
@@ -64,46 +69,49 @@ except Exception:
     GUI_AUTO_INFER = True
     GUI_THREAD_INFER = False
     GUI_INFER_TIMEOUT_SEC = 8.0
+    IDLE_POLL_MS = 200
 
 
 class InferenceWorker(QtCore.QObject):
-    finished = QtCore.Signal(dict)
+    finished = QtCore.Signal(object)
 
     def __init__(self, runtime, frame, token):
         super().__init__()
         self.runtime = runtime
         self.frame = frame
         self.token = token
+        # Created on the GUI thread right after read_frame(); carry its seq over.
+        self.frame_seq = get_tracer().current_frame()
 
     @QtCore.Slot()
     def run(self):
         start = time.perf_counter()
+        get_tracer().set_frame(self.frame_seq)
         try:
             result = self.runtime.infer_frame(self.frame)
         except Exception as exc:
-            result = {
-                "has_face": False,
-                "bbox": None,
-                "embedding": None,
-                "is_real": None,
-                "id": None,
-                "name": None,
-                "score": None,
-                "error": f"infer failed: {exc}",
-            }
-        result["_token"] = self.token
-        result["latency_ms"] = int((time.perf_counter() - start) * 1000)
+            result = RecognitionResult.failed(f"infer failed: {exc}")
+        result = result.replace(
+            token=self.token,
+            latency_ms=int((time.perf_counter() - start) * 1000),
+        )
         self.finished.emit(result)
 
 
 class LiveTab(QtWidgets.QWidget):
     request_add_from_frame = QtCore.Signal()
+    event_added = QtCore.Signal(object)
+    door_command_done = QtCore.Signal(object)
 
     def __init__(self, runtime: DoorbellRuntime, parent=None):
         super().__init__(parent)
         self.runtime = runtime
         self.latest_frame = None
         self.latest_result = None
+        self._vm = WidgetViewModel(self)
+        self._metrics = get_metrics()
+        self._preview = PreviewRenderer()
+        self._roi_sprites = RoiSpriteCache(max_entries=8)
         self._alert = KnownPersonAlert()
         self._door = build_door_controller()
         self._ring_button = DoorbellRingButton(on_press=self._on_ring_pressed)
@@ -120,13 +128,13 @@ class LiveTab(QtWidgets.QWidget):
         self._active_thread = None
         self._active_worker = None
         self._shown_live_status = False
+        self._shown_idle_status = False
         self._infer_token = 0
         self._infer_start_ts = 0.0
         self._timeout_count = 0
         self._event_interval = float(EVENT_CAPTURE_INTERVAL_SEC)
         self._last_event_ts = 0.0
-        self._last_event_sync_ts = 0.0
-        self._last_event_sync_id = None
+        self._lcd_person = (None, None)
         self._event_capture_enabled = bool(EVENT_CAPTURE_ENABLED)
         self._known_event_id = None
         self._known_event_active = False
@@ -268,6 +276,13 @@ class LiveTab(QtWidgets.QWidget):
         layout.addWidget(self.preview_label, 3)
         layout.addLayout(right_panel, 2)
 
+        self._event_store = None
+        self._event_listener = None
+        self.event_added.connect(self._on_event_added)
+        self.door_command_done.connect(self._on_door_command_done)
+        self._load_last_event_label()
+        self._attach_event_listener()
+
         self._update_capture_label()
         self._refresh_door_state()
 
@@ -395,35 +410,26 @@ class LiveTab(QtWidgets.QWidget):
             return
         if x1 <= x0 or y1 <= y0:
             return
-        cx = int((x0 + x1) / 2)
-        cy = int((y0 + y1) / 2)
-        ax = max(2, int((x1 - x0) / 2))
-        ay = max(2, int((y1 - y0) / 2))
-
-        if fill_alpha and fill_alpha > 0:
-            overlay = img.copy()
-            cv2.ellipse(overlay, (cx, cy), (ax, ay), float(angle_deg), 0, 360, color, -1)
-            cv2.addWeighted(
-                overlay,
-                float(fill_alpha),
-                img,
-                1.0 - float(fill_alpha),
-                0,
-                img,
-            )
-
-        cv2.ellipse(img, (cx, cy), (ax, ay), float(angle_deg), 0, 360, color, thickness)
+        # Fill + outline come from a cached sprite; only its bounding box is touched.
+        self._roi_sprites.composite(
+            img,
+            (x0, y0, x1, y1),
+            angle_deg,
+            color,
+            fill_alpha,
+            thickness=thickness,
+        )
 
-    def _draw_overlays(self, frame):
-        if frame is None:
+    def _draw_overlays(self, img, scale=1.0):
+        """Draw ROI + bbox in place on the preview-sized buffer."""
+        if img is None:
             return None
-        overlay = frame.copy()
 
-        roi = self._roi_bounds_px(overlay.shape)
+        roi = self._roi_bounds_px(img.shape)
         bbox = None
         if self.latest_result and self.latest_result.get("has_face"):
             if self.latest_result.get("bbox") is not None:
-                bbox = self.latest_result.get("bbox")
+                bbox = tuple(int(v * scale) for v in self.latest_result.get("bbox"))
 
         in_roi = False
         angle_deg = float(self.roi_rotate_deg) % 360.0
@@ -453,7 +459,7 @@ class LiveTab(QtWidgets.QWidget):
             roi_color = active_color if in_roi else normal_color
             fill_alpha = 0.18 if in_roi else 0.10
             self._draw_ellipse_roi(
-                overlay,
+                img,
                 x0,
                 y0,
                 x1,
@@ -466,21 +472,18 @@ class LiveTab(QtWidgets.QWidget):
 
         if bbox:
             x1, y1, x2, y2 = bbox
-            cv2.rectangle(overlay, (x1, y1), (x2, y2), (46, 204, 113), 2)
-        return overlay
+            cv2.rectangle(img, (x1, y1), (x2, y2), (46, 204, 113), 2)
+        return img
 
     def _update_capture_label(self):
         if self._event_capture_enabled:
-            self.capture_value.setText(f"On ({self._event_interval:.1f}s)")
+            self._vm.set_text(self.capture_value, f"On ({self._event_interval:.1f}s)")
         else:
-            self.capture_value.setText("Off")
+            self._vm.set_text(self.capture_value, "Off")
 
-    def _sync_last_event_label(self):
-        now = time.time()
-        if now - self._last_event_sync_ts < 1.0:
-            return
-        self._last_event_sync_ts = now
+    def _load_last_event_label(self):
         event = None
+        store = None
         try:
             from server.event_store import get_event_store
             store = get_event_store()
@@ -491,102 +494,98 @@ class LiveTab(QtWidgets.QWidget):
             event = None
 
         if event is None:
-            log_path = None
+            # Tail of the log; reaches into rotated segments if the active file is empty.
             try:
-                from config import EVENT_LOG_PATH
-                log_path = EVENT_LOG_PATH
+                if store is not None:
+                    event = store.last_logged_event()
+                else:
+                    from server.event_log import read_last_event
+                    event = read_last_event()
             except Exception:
-                log_path = None
-            if log_path and os.path.isfile(log_path):
-                try:
-                    with open(log_path, "rb") as f:
-                        f.seek(0, os.SEEK_END)
-                        size = f.tell()
-                        if size > 0:
-                            offset = min(size, 4096)
-                            f.seek(-offset, os.SEEK_END)
-                            data = f.read().decode("utf-8", errors="ignore")
-                            lines = [ln for ln in data.splitlines() if ln.strip()]
-                            if lines:
-                                event = json.loads(lines[-1])
-                except Exception:
-                    event = None
+                event = None
 
-        if not event:
+        if event:
+            self._on_event_added(event)
+
+    def _attach_event_listener(self):
+        try:
+            from server.event_store import get_event_store
+            store = get_event_store()
+        except Exception:
+            return
+        if store is None:
             return
-        event_id = event.get("eventId")
-        if event_id and event_id == self._last_event_sync_id:
+        # EventStore calls back on whichever thread added the event; the
+        # signal hops it onto the GUI thread.
+        self._event_listener = self.event_added.emit
+        # actions=True: UNLOCK/LOCK show up in "last event" too, as when this label tailed the log.
+        store.add_listener(self._event_listener, actions=True)
+        self._event_store = store
+        try:
+            from server.clip_recorder import attach_clip_recorder
+
+            attach_clip_recorder(self.runtime, store)
+        except Exception as exc:
+            print(f"[LiveTab] clip recorder disabled: {exc}")
+
+    def _on_event_added(self, event):
+        if not event:
             return
-        self._last_event_sync_id = event_id
-        self.last_event_value.setText(
-            f"{event.get('type')} {event.get('eventId')} @ {event.get('timestamp')}"
+        self._vm.set_text(
+            self.last_event_value,
+            f"{event.get('type')} {event.get('eventId')} @ {event.get('timestamp')}",
         )
 
     def _update_lcd_status(self, result):
+        self._lcd_person = lcd_person_from_result(result)
+        self._push_lcd()
+
+    def _push_lcd(self):
         lcd = getattr(self, "_lcd", None)
-        if lcd is None:
+        if lcd is None or not getattr(lcd, "available", False):
             return
         door = getattr(self, "_door", None)
         door_open = bool(door and getattr(door, "_is_open", False))
+        person_type, person_name = self._lcd_person
+        self._vm.call("lcd", (door_open, person_type, person_name), self._apply_lcd)
 
-        person_type = "NONE"
-        person_name = ""
-        if result and result.get("has_face"):
-            size_status = result.get("size_status")
-            if size_status == "too_small":
-                person_type = "MOVE_CLOSE"
-            elif size_status == "too_large":
-                person_type = "MOVE_FAR"
-            else:
-                is_real = result.get("is_real")
-                if is_real is False:
-                    person_type = "SPOOF"
-                else:
-                    rid = result.get("id")
-                    name = result.get("name")
-                    score = result.get("score")
-                    if rid and name and score is not None:
-                        person_type = "KNOWN"
-                        person_name = str(name)
-                    else:
-                        person_type = "UNKNOWN"
+    def _apply_lcd(self, state):
+        door_open, person_type, person_name = state
         try:
-            lcd.set_status(door_open=door_open, person_type=person_type, person_name=person_name)
+            return self._lcd.set_status(
+                door_open=door_open,
+                person_type=person_type,
+                person_name=person_name,
+            )
         except Exception:
-            return
+            return True
 
     def _refresh_door_state(self):
         door = getattr(self, "_door", None)
         available = bool(door and getattr(door, "available", False))
         is_open = bool(door and getattr(door, "_is_open", False))
-        self.door_state_value.setText("Open" if is_open else "Closed")
-        self.btn_open.setEnabled(available and not is_open)
-        self.btn_close.setEnabled(available and is_open)
-        self.btn_open.setVisible(True)
-        self.btn_close.setVisible(True)
-        self.toggle_hold_on_face.setEnabled(available)
-        self.toggle_require_known.setEnabled(available)
-        self.toggle_require_real.setEnabled(available)
-        if getattr(self, "_lcd", None) is not None:
-            try:
-                self._lcd.set_status(door_open=is_open)
-            except Exception:
-                pass
+        self._vm.set_text(self.door_state_value, "Open" if is_open else "Closed")
+        self._vm.set_enabled(self.btn_open, available and not is_open)
+        self._vm.set_enabled(self.btn_close, available and is_open)
+        self._vm.set_enabled(self.toggle_hold_on_face, available)
+        self._vm.set_enabled(self.toggle_require_known, available)
+        self._vm.set_enabled(self.toggle_require_real, available)
+        self._push_lcd()
 
     def _on_auto_infer_toggled(self, checked):
         self.auto_infer = bool(checked)
         if self.auto_infer:
-            self.status_label.setText("Status: auto recognition enabled")
+            self._vm.set_text(self.status_label, "Status: auto recognition enabled")
         else:
-            self.status_label.setText("Status: auto recognition disabled")
+            self._vm.set_text(self.status_label, "Status: auto recognition disabled")
 
     def _on_capture_toggled(self, checked):
         self._event_capture_enabled = bool(checked)
         self._update_capture_label()
         if self._event_capture_enabled:
-            self.status_label.setText("Status: auto capture enabled")
+            self._vm.set_text(self.status_label, "Status: auto capture enabled")
         else:
-            self.status_label.setText("Status: auto capture disabled")
+            self._vm.set_text(self.status_label, "Status: auto capture disabled")
 
     def _on_policy_toggled(self, checked):
         door = getattr(self, "_door", None)
@@ -595,25 +594,44 @@ class LiveTab(QtWidgets.QWidget):
         door.hold_on_face = bool(self.toggle_hold_on_face.isChecked())
         door.require_known = bool(self.toggle_require_known.isChecked())
         door.require_real = bool(self.toggle_require_real.isChecked())
-        self.status_label.setText("Status: door policies updated")
+        self._vm.set_text(self.status_label, "Status: door policies updated")
 
     def _on_timer(self):
         if self._closing:
             return
         frame = self.runtime.read_frame()
         if frame is None:
-            self.status_label.setText("Status: camera unavailable")
-            self.system_value.setText("Camera offline")
+            self._vm.set_text(self.status_label, "Status: camera unavailable")
+            self._vm.set_text(self.system_value, "Camera offline")
             self._refresh_door_state()
             self._update_lcd_status(None)
-            self._sync_last_event_label()
             return
 
         self.latest_frame = frame
-        render_frame = self._draw_overlays(frame)
-        pixmap = frame_to_pixmap(render_frame if render_frame is not None else frame, self.preview_label.size())
+        scheduler = getattr(self.runtime, "scheduler", None)
+        if self.runtime.is_idle():
+            if not self._shown_idle_status:
+                self.preview_label.clear()
+                self.preview_label.setText("Idle (low-power mode)")
+                self._vm.set_text(self.status_label, "Status: idle, waiting for motion / ring")
+                self._vm.set_text(self.system_value, "Idle")
+                self._shown_idle_status = True
+                self._shown_live_status = False
+            self._refresh_door_state()
+            self._apply_timer_interval(IDLE_POLL_MS)
+            return
+        self._shown_idle_status = False
+
+        render_start = time.perf_counter()
+        with span("frame_to_pixmap", cat="gui"):
+            pixmap = self._preview.render(frame, self.preview_label.size(), self._draw_overlays)
         if pixmap is not None:
             self.preview_label.setPixmap(pixmap)
+        render_ms = (time.perf_counter() - render_start) * 1000.0
+        if scheduler is not None:
+            scheduler.record("render", render_ms)
+        self._metrics.observe("render", render_ms)
+        self._metrics.tick("preview")
 
         if (
             not self._shown_live_status
@@ -621,20 +639,33 @@ class LiveTab(QtWidgets.QWidget):
             and self.latest_result is None
         ):
             if self.auto_infer:
-                self.status_label.setText("Status: live (auto infer on)")
-                self.system_value.setText("Live")
+                self._vm.set_text(self.status_label, "Status: live (auto infer on)")
+                self._vm.set_text(self.system_value, "Live")
             else:
-                self.status_label.setText(
-                    "Status: live (auto infer off - press Capture + Recognize)"
+                self._vm.set_text(
+                    self.status_label,
+                    "Status: live (auto infer off - press Capture + Recognize)",
                 )
-                self.system_value.setText("Live")
+                self._vm.set_text(self.system_value, "Live")
             self._shown_live_status = True
 
         if self.auto_infer:
-            if self._frame_counter % max(1, int(N_DETECTION_FRAMES)) == 0:
+            if scheduler is not None:
+                due = scheduler.should_infer()
+            else:
+                due = self._frame_counter % max(1, int(N_DETECTION_FRAMES)) == 0
+            if not due:
+                self._metrics.incr("frames_skipped")
+            elif self._inference_running:
+                # A frame was due while the previous inference is still running: that slot is lost.
+                self._metrics.incr("frames_dropped")
+            else:
                 self._start_inference(frame, reason="auto")
+        self._metrics.gauge("infer_queue", 1 if self._inference_running else 0)
 
         self._frame_counter += 1
+        if scheduler is not None:
+            self._apply_timer_interval(scheduler.preview_interval_ms())
 
         if self.thread_infer and self._inference_running:
             now = time.time()
@@ -643,13 +674,18 @@ class LiveTab(QtWidgets.QWidget):
 
         self._refresh_door_state()
 
+    def _apply_timer_interval(self, interval):
+        interval = max(1, int(interval))
+        if interval != self.timer.interval():
+            self.timer.setInterval(interval)
+
     def _start_inference(self, frame, reason="auto"):
         if self._closing or self._inference_running or frame is None:
             return
 
         self._inference_running = True
-        self.status_label.setText("Status: inferring...")
-        self.system_value.setText("Inferring")
+        self._vm.set_text(self.status_label, "Status: inferring...")
+        self._vm.set_text(self.system_value, "Inferring")
         self._shown_live_status = False
 
         if not self.thread_infer:
@@ -657,23 +693,14 @@ class LiveTab(QtWidgets.QWidget):
             try:
                 result = self.runtime.infer_frame(frame)
             except Exception as exc:
-                result = {
-                    "has_face": False,
-                    "bbox": None,
-                    "embedding": None,
-                    "is_real": None,
-                    "id": None,
-                    "name": None,
-                    "score": None,
-                    "error": f"infer failed: {exc}",
-                }
-            result["latency_ms"] = int((time.perf_counter() - start) * 1000)
+                result = RecognitionResult.failed(f"infer failed: {exc}")
+            result = result.replace(latency_ms=int((time.perf_counter() - start) * 1000))
             self._inference_running = False
             self._infer_start_ts = 0.0
             self._timeout_count = 0
             self.latest_result = result
             self._update_status_text(result)
-            self.btn_add.setEnabled(bool(result and result.get("has_face")))
+            self._vm.set_enabled(self.btn_add, bool(result and result.get("has_face")))
             return
 
         self._infer_token += 1
@@ -698,7 +725,7 @@ class LiveTab(QtWidgets.QWidget):
             return
         if not self.thread_infer:
             return
-        token = result.get("_token")
+        token = result.token
         if token != self._infer_token:
             return
         self._inference_running = False
@@ -706,7 +733,7 @@ class LiveTab(QtWidgets.QWidget):
         self._timeout_count = 0
         self.latest_result = result
         self._update_status_text(result)
-        self.btn_add.setEnabled(bool(result and result.get("has_face")))
+        self._vm.set_enabled(self.btn_add, bool(result and result.get("has_face")))
         self._active_worker = None
         if self._active_thread is not None and not self._active_thread.isRunning():
             self._active_thread = None
@@ -725,15 +752,16 @@ class LiveTab(QtWidgets.QWidget):
         self._active_worker = None
         self._infer_start_ts = 0.0
         self._timeout_count += 1
-        self.system_value.setText("Timeout")
+        self._vm.set_text(self.system_value, "Timeout")
         if self._timeout_count >= 3:
             self.auto_infer = False
             self.toggle_auto_infer.setChecked(False)
-            self.status_label.setText(
-                "Status: inference timeout (auto infer disabled)"
+            self._vm.set_text(
+                self.status_label,
+                "Status: inference timeout (auto infer disabled)",
             )
         else:
-            self.status_label.setText("Status: inference timeout")
+            self._vm.set_text(self.status_label, "Status: inference timeout")
 
         thread = self._active_thread
         if thread is not None and thread.isRunning():
@@ -743,35 +771,35 @@ class LiveTab(QtWidgets.QWidget):
 
     def _update_status_text(self, result):
         if not result:
-            self.status_label.setText("Status: no result")
-            self.system_value.setText("Idle")
+            self._vm.set_text(self.status_label, "Status: no result")
+            self._vm.set_text(self.system_value, "Idle")
             return
 
         error = result.get("error")
         if error:
-            self.status_label.setText(f"Status: {error}")
-            self.system_value.setText("Error")
+            self._vm.set_text(self.status_label, f"Status: {error}")
+            self._vm.set_text(self.system_value, "Error")
         else:
-            self.status_label.setText("Status: live")
-            self.system_value.setText("Live")
+            self._vm.set_text(self.status_label, "Status: live")
+            self._vm.set_text(self.system_value, "Live")
 
         has_face = bool(result.get("has_face"))
-        self.face_value.setText("Yes" if has_face else "No")
+        self._vm.set_text(self.face_value, "Yes" if has_face else "No")
 
         is_real = result.get("is_real")
         if is_real is None:
-            self.liveness_value.setText("n/a")
+            self._vm.set_text(self.liveness_value, "n/a")
         else:
-            self.liveness_value.setText("Real" if is_real else "Spoof")
+            self._vm.set_text(self.liveness_value, "Real" if is_real else "Spoof")
 
         size_status = result.get("size_status")
         if size_status == "too_small":
-            self.status_label.setText("Status: move closer")
-            self.system_value.setText("Move closer")
+            self._vm.set_text(self.status_label, "Status: move closer")
+            self._vm.set_text(self.system_value, "Move closer")
             self._maybe_prompt_distance(size_status)
         elif size_status == "too_large":
-            self.status_label.setText("Status: move farther")
-            self.system_value.setText("Move farther")
+            self._vm.set_text(self.status_label, "Status: move farther")
+            self._vm.set_text(self.system_value, "Move farther")
             self._maybe_prompt_distance(size_status)
 
         rid = result.get("id")
@@ -780,22 +808,22 @@ class LiveTab(QtWidgets.QWidget):
         stabilizing = bool(result.get("stabilizing"))
 
         if score is None:
-            self.recog_value.setText("n/a")
-            self.score_value.setText("n/a")
+            self._vm.set_text(self.recog_value, "n/a")
+            self._vm.set_text(self.score_value, "n/a")
         elif rid and name:
-            self.recog_value.setText(f"{name} ({rid})")
-            self.score_value.setText(f"{score:.2f}")
+            self._vm.set_text(self.recog_value, f"{name} ({rid})")
+            self._vm.set_text(self.score_value, f"{score:.2f}")
         else:
-            self.recog_value.setText("Unknown")
-            self.score_value.setText(f"{score:.2f}")
+            self._vm.set_text(self.recog_value, "Unknown")
+            self._vm.set_text(self.score_value, f"{score:.2f}")
 
-        self.stability_value.setText("Stabilizing" if stabilizing else "Stable")
+        self._vm.set_text(self.stability_value, "Stabilizing" if stabilizing else "Stable")
 
         latency_ms = result.get("latency_ms")
         if latency_ms is None:
-            self.latency_value.setText("n/a")
+            self._vm.set_text(self.latency_value, "n/a")
         else:
-            self.latency_value.setText(f"{latency_ms} ms")
+            self._vm.set_text(self.latency_value, f"{latency_ms} ms")
 
         size_status = result.get("size_status")
         if size_status not in ("too_small", "too_large"):
@@ -813,24 +841,30 @@ class LiveTab(QtWidgets.QWidget):
                         db_empty = len(getattr(face, "DB", {}) or {}) == 0
                     except Exception:
                         db_empty = True
-                original_require_known = getattr(door, "require_known", False)
-                if db_empty:
-                    door.require_known = True
-                door.handle_result(result)
-                if db_empty:
-                    door.require_known = original_require_known
+                # Servo / light / sound run on the door worker, not the GUI thread.
+                with span("door", cat="io"):
+                    get_door_executor().submit(
+                        "face", face_policy_command(door, result, force_require_known=db_empty),
+                        source="gui", notify=False,
+                    )
             self._maybe_capture_event(result, door_open_before=door_open_before)
         self._refresh_door_state()
-        self._update_lcd_status(result)
-        self._sync_last_event_label()
+        with span("lcd", cat="io"):
+            self._update_lcd_status(result)
 
 
     def _on_ring_pressed(self):
         frame = None
-        if self.latest_frame is not None:
-            frame = self.latest_frame.copy()
-        elif getattr(self.runtime, "last_frame", None) is not None:
-            frame = self.runtime.last_frame.copy()
+        if self.runtime.wake("ring"):
+            try:
+                frame = self.runtime.read_frame()
+            except Exception:
+                frame = None
+        if frame is None:
+            if self.latest_frame is not None:
+                frame = self.latest_frame.copy()
+            elif getattr(self.runtime, "last_frame", None) is not None:
+                frame = self.runtime.last_frame.copy()
         if frame is None:
             try:
                 frame = self.runtime.read_frame()
@@ -878,17 +912,15 @@ class LiveTab(QtWidgets.QWidget):
                 person_name=person_name,
                 source="button",
                 meta=meta,
+                embedding=result.get("embedding") if result else None,
             )
         except Exception:
             return
         if not event:
             return
         def _update():
-            self.last_event_value.setText(
-                f"{event.get('type')} {event.get('eventId')} @ {event.get('timestamp')}"
-            )
-            self.status_label.setText("Status: doorbell pressed")
-            self.system_value.setText("Ring")
+            self._vm.set_text(self.status_label, "Status: doorbell pressed")
+            self._vm.set_text(self.system_value, "Ring")
         QtCore.QTimer.singleShot(0, _update)
 
     def _maybe_capture_event(self, result, door_open_before=None):
@@ -953,11 +985,9 @@ class LiveTab(QtWidgets.QWidget):
                 person_name=person_name,
                 source="gui",
                 meta=meta,
+                embedding=result.get("embedding"),
             )
             if event:
-                self.last_event_value.setText(
-                    f"{event.get('type')} {event.get('eventId')} @ {event.get('timestamp')}"
-                )
                 self._last_event_ts = now
                 if event_type == "KNOWN":
                     self._known_event_active = True
@@ -966,51 +996,45 @@ class LiveTab(QtWidgets.QWidget):
             return
 
     def on_force_recognize(self):
+        self.runtime.wake("gui")
         frame = self.runtime.read_frame()
         if frame is None:
-            self.status_label.setText("Status: camera unavailable")
-            self.system_value.setText("Camera offline")
+            self._vm.set_text(self.status_label, "Status: camera unavailable")
+            self._vm.set_text(self.system_value, "Camera offline")
             return
         self._start_inference(frame, reason="manual")
 
     def on_open_door(self):
         door = getattr(self, "_door", None)
         if door is None or not getattr(door, "available", False):
-            self.status_label.setText("Status: door control unavailable")
+            self._vm.set_text(self.status_label, "Status: door control unavailable")
             return
-        ok, message = door.open_and_close()
-        light_ok = False
-        try:
-            light_ok = door.set_light_state(True)
-        except Exception:
-            light_ok = False
-        if ok:
-            status = "Status: door opened"
-            self.system_value.setText("Door action")
-        else:
-            status = f"Status: door error: {message}"
-            self.system_value.setText("Door error")
-        if not light_ok:
-            status += " (light unavailable)"
-        self.status_label.setText(status)
-        self._refresh_door_state()
+        # Result comes back through door_command_done (emitted on the door worker thread).
+        get_door_executor().submit("unlock", unlock_command(door), source="gui", on_done=self.door_command_done.emit)
+        self._vm.set_text(self.status_label, "Status: opening door...")
 
     def on_close_door(self):
         door = getattr(self, "_door", None)
         if door is None or not getattr(door, "available", False):
-            self.status_label.setText("Status: door control unavailable")
+            self._vm.set_text(self.status_label, "Status: door control unavailable")
             return
-        door.close()
-        light_ok = False
-        try:
-            light_ok = door.set_light_state(False)
-        except Exception:
-            light_ok = False
-        status = "Status: door closed"
-        self.system_value.setText("Door action")
+        get_door_executor().submit("lock", lock_command(door), source="gui", on_done=self.door_command_done.emit)
+        self._vm.set_text(self.status_label, "Status: closing door...")
+
+    def _on_door_command_done(self, command):
+        light_ok = command.extra.get("lightOk", False)
+        if command.action == "lock":
+            status = "Status: door closed"
+            self._vm.set_text(self.system_value, "Door action")
+        elif command.ok:
+            status = "Status: door opened"
+            self._vm.set_text(self.system_value, "Door action")
+        else:
+            status = f"Status: door error: {command.message}"
+            self._vm.set_text(self.system_value, "Door error")
         if not light_ok:
             status += " (light unavailable)"
-        self.status_label.setText(status)
+        self._vm.set_text(self.status_label, status)
         self._refresh_door_state()
 
     def _on_add_clicked(self):
@@ -1020,8 +1044,13 @@ class LiveTab(QtWidgets.QWidget):
         self._closing = True
         if self.timer is not None:
             self.timer.stop()
+        if self._event_store is not None:
+            self._event_store.remove_listener(self._event_listener)
+            self._event_store = None
         if self._alert is not None:
             self._alert.close()
+        # Finish queued door commands before the controller releases the servo.
+        get_door_executor().close()
         if getattr(self, "_door", None) is not None:
             self._door.shutdown()
         if getattr(self, "_ring_button", None) is not None:
@@ -2,7 +2,9 @@ import cv2
 from PySide6 import QtCore, QtWidgets
 
 from face.face_db import FaceDB
+from face.thumb_store import get_thumb_store, save_enrollment_crop
 from gui.dialogs import PersonDialog, EditPersonDialog
+from gui.people_model import PeopleTableModel, PEOPLE_SEARCH_DEBOUNCE_MS
 
 
 class AddPersonWorker(QtCore.QObject):
@@ -24,6 +26,7 @@ class AddPersonWorker(QtCore.QObject):
 
         def _work():
             embedding = self.embedding
+            face_crop = self.face_crop
             if embedding is None:
                 result = self.runtime.extract_embedding(
                     frame=self.frame,
@@ -32,8 +35,9 @@ class AddPersonWorker(QtCore.QObject):
                 if not result.get("ok"):
                     return False, result.get("error", "Embedding failed"), "", ""
                 embedding = result.get("embedding")
+                face_crop = result.get("face_crop")
 
-            result = self.runtime.add_person(self.name, embedding)
+            result = self.runtime.add_person(self.name, embedding, face_crop=face_crop)
             if not result.get("ok"):
                 return False, result.get("error", "Add failed"), "", ""
             self.runtime.reload_db()
@@ -78,6 +82,7 @@ class UpdatePersonWorker(QtCore.QObject):
             self.finished.emit(False, "Name is required")
             return
         embedding = self.embedding
+        face_crop = self.face_crop
 
         if self.update_embedding:
             if self.runtime is None or not getattr(self.runtime, "enable_face", True):
@@ -92,6 +97,7 @@ class UpdatePersonWorker(QtCore.QObject):
                     self.finished.emit(False, result.get("error", "Embedding failed"))
                     return
                 embedding = result.get("embedding")
+                face_crop = result.get("face_crop")
 
         lock = getattr(self.runtime, "infer_lock", None) if self.runtime is not None else None
         try:
@@ -107,6 +113,8 @@ class UpdatePersonWorker(QtCore.QObject):
         if not ok:
             self.finished.emit(False, "Person not found")
             return
+        if self.update_embedding and face_crop is not None:
+            save_enrollment_crop(self.person_id, face_crop)
         if self.runtime is not None:
             self.runtime.reload_db()
         self.finished.emit(True, f"Updated id={self.person_id}")
@@ -119,6 +127,7 @@ class PeopleTab(QtWidgets.QWidget):
         self.live_tab = live_tab
         self.db = FaceDB()
         self.people = []
+        self._db_version = None
         self._closing = False
         self._add_thread = None
         self._add_worker = None
@@ -139,17 +148,26 @@ class PeopleTab(QtWidgets.QWidget):
 
         self.search_input = QtWidgets.QLineEdit()
         self.search_input.setPlaceholderText("Search by name")
-        self.search_input.textChanged.connect(self.refresh_table)
-
-        self.table = QtWidgets.QTableWidget(0, 2)
-        self.table.setHorizontalHeaderLabels(["ID", "Name"])
+        self._search_timer = QtCore.QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(max(0, int(PEOPLE_SEARCH_DEBOUNCE_MS)))
+        self._search_timer.timeout.connect(self._apply_search)
+        self.search_input.textChanged.connect(self._search_timer.start)
+
+        self.model = PeopleTableModel(self)
+        self.table = QtWidgets.QTableView()
+        self.table.setModel(self.model)
         self.table.horizontalHeader().setStretchLastSection(True)
-        self.table.setSelectionBehavior(QtWidgets.QTableWidget.SelectRows)
-        self.table.setSelectionMode(QtWidgets.QTableWidget.SingleSelection)
-        self.table.setEditTriggers(QtWidgets.QTableWidget.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(0, QtWidgets.QHeaderView.ResizeToContents)
+        self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
         self.table.setAlternatingRowColors(True)
         self.table.verticalHeader().setVisible(False)
+        self.table.verticalHeader().setDefaultSectionSize(self.model.thumbs.px + 6)
+        self.table.setIconSize(QtCore.QSize(self.model.thumbs.px, self.model.thumbs.px))
         self.table.setSortingEnabled(True)
+        self.table.sortByColumn(0, QtCore.Qt.AscendingOrder)
 
         self.btn_add = QtWidgets.QPushButton("Add")
         self.btn_edit = QtWidgets.QPushButton("Edit")
@@ -165,7 +183,8 @@ class PeopleTab(QtWidgets.QWidget):
         self.btn_delete.clicked.connect(self.delete_selected)
         self.btn_refresh.clicked.connect(lambda: self.refresh_table(force_reload=True))
         self.btn_edit.setEnabled(False)
-        self.table.itemSelectionChanged.connect(self._update_action_buttons)
+        self.table.selectionModel().selectionChanged.connect(self._update_action_buttons)
+        self.model.modelReset.connect(self._update_action_buttons)
 
         self.status_label = QtWidgets.QLabel("Ready.")
         self.status_label.setProperty("role", "muted")
@@ -215,10 +234,22 @@ class PeopleTab(QtWidgets.QWidget):
             self.btn_edit.setEnabled(False)
             self.btn_delete.setEnabled(False)
             return
-        has_row = self.table.currentRow() >= 0
+        has_row = self._selected_row() >= 0
         self.btn_edit.setEnabled(has_row)
         self.btn_delete.setEnabled(has_row)
 
+    def _selected_row(self):
+        selection = self.table.selectionModel()
+        if selection is None:
+            return -1
+        rows = selection.selectedRows()
+        if not rows:
+            return -1
+        return rows[0].row()
+
+    def _selected_person(self):
+        return self.model.person_at(self._selected_row())
+
     def add_from_live(self):
         self.add_from_dialog(default_source="live")
 
@@ -251,11 +282,11 @@ class PeopleTab(QtWidgets.QWidget):
             self._start_add_worker(name=name, frame=frame)
         else:
             embedding = self._get_latest_embedding()
+            face_crop = self._get_latest_face_crop()
             if embedding is not None:
-                self._start_add_worker(name=name, embedding=embedding)
+                self._start_add_worker(name=name, embedding=embedding, face_crop=face_crop)
                 return
 
-            face_crop = self._get_latest_face_crop()
             if face_crop is not None:
                 self._start_add_worker(name=name, face_crop=face_crop)
                 return
@@ -273,10 +304,13 @@ class PeopleTab(QtWidgets.QWidget):
     def _get_latest_face_crop(self):
         if self.live_tab:
             latest_result = getattr(self.live_tab, "latest_result", None)
-            if latest_result and latest_result.get("face_crop") is not None:
-                return latest_result.get("face_crop").copy()
-        if self.runtime and getattr(self.runtime, "last_face_crop", None) is not None:
-            return self.runtime.last_face_crop.copy()
+            if latest_result is not None:
+                crop = latest_result.get("face_crop")
+                if crop is not None:
+                    return crop
+        if self.runtime is not None:
+            # last_face_crop materializes a fresh copy from the crop pool.
+            return getattr(self.runtime, "last_face_crop", None)
         return None
 
     def _get_latest_frame(self):
@@ -387,14 +421,11 @@ class PeopleTab(QtWidgets.QWidget):
         self.refresh_table(force_reload=True)
 
     def delete_selected(self):
-        row = self.table.currentRow()
-        if row < 0:
+        pid, _ = self._selected_person()
+        if pid is None:
             QtWidgets.QMessageBox.warning(self, "Delete", "Select a person first.")
             return
-        pid_item = self.table.item(row, 0)
-        if pid_item is None:
-            return
-        pid = pid_item.text().strip()
+        pid = pid.strip()
         if not pid:
             return
         confirm = QtWidgets.QMessageBox.question(
@@ -406,6 +437,10 @@ class PeopleTab(QtWidgets.QWidget):
         if confirm != QtWidgets.QMessageBox.Yes:
             return
         if self.db.delete_person(pid):
+            try:
+                get_thumb_store().delete(pid)
+            except Exception:
+                pass
             if self.runtime:
                 self.runtime.reload_db()
             self.refresh_table(force_reload=True)
@@ -415,16 +450,12 @@ class PeopleTab(QtWidgets.QWidget):
 
 
     def edit_selected(self):
-        row = self.table.currentRow()
-        if row < 0:
+        pid, current_name = self._selected_person()
+        if pid is None:
             QtWidgets.QMessageBox.warning(self, "Edit", "Select a person first.")
             return
-        pid_item = self.table.item(row, 0)
-        name_item = self.table.item(row, 1)
-        if pid_item is None:
-            return
-        pid = pid_item.text().strip()
-        current_name = name_item.text().strip() if name_item is not None else ""
+        pid = pid.strip()
+        current_name = (current_name or "").strip()
         if not pid:
             return
 
@@ -460,8 +491,7 @@ class PeopleTab(QtWidgets.QWidget):
                     return
             else:
                 embedding = self._get_latest_embedding()
-                if embedding is None:
-                    face_crop = self._get_latest_face_crop()
+                face_crop = self._get_latest_face_crop()
                 if embedding is None and face_crop is None:
                     frame = self._get_latest_frame()
                 if embedding is None and face_crop is None and frame is None:
@@ -483,36 +513,30 @@ class PeopleTab(QtWidgets.QWidget):
 
     def refresh_table(self, force_reload=False):
         if force_reload:
-            self.db.load()
+            # Only re-parse face_db.json when the file changed on disk.
+            self.db.load_if_changed()
+        if self.db.version != self._db_version:
+            self._db_version = self.db.version
             self.people = self.db.list_people()
-            if self.runtime is not None:
+            self.model.set_people(self.people)
+            if force_reload and self.runtime is not None:
                 self.runtime.reload_db()
-
-        filter_text = self.search_input.text().strip().lower()
-        rows = []
-        for person in self.people:
-            name = str(person.get("name", ""))
-            if filter_text and filter_text not in name.lower():
-                continue
-            rows.append(person)
-
-        self.table.setRowCount(len(rows))
-        for idx, person in enumerate(rows):
-            pid = str(person.get("id", ""))
-            name = str(person.get("name", ""))
-            self.table.setItem(idx, 0, QtWidgets.QTableWidgetItem(pid))
-            self.table.setItem(idx, 1, QtWidgets.QTableWidgetItem(name))
-
-        self.table.resizeColumnsToContents()
-        self.total_value.setText(str(len(self.people)))
-        self._set_status(f"Showing {len(rows)} of {len(self.people)}")
+        self._apply_search()
+
+    def _apply_search(self):
+        self._search_timer.stop()
+        self.model.set_filter(self.search_input.text())
+        total = self.model.total_count()
+        self.total_value.setText(str(total))
+        self._set_status(f"Showing {self.model.match_count()} of {total}")
         self._update_action_buttons()
 
     def _set_busy(self, busy, message=""):
         self._busy = bool(busy)
         self.btn_add.setEnabled(not busy)
-        self.btn_edit.setEnabled(not busy and self.table.currentRow() >= 0)
-        self.btn_delete.setEnabled(not busy and self.table.currentRow() >= 0)
+        has_row = self._selected_row() >= 0
+        self.btn_edit.setEnabled(not busy and has_row)
+        self.btn_delete.setEnabled(not busy and has_row)
         self.btn_refresh.setEnabled(not busy)
         if message:
             self._set_status(message)
@@ -0,0 +1,92 @@
+from PySide6 import QtCore
+
+try:
+    from config import GUI_UI_REFRESH_MS
+except Exception:
+    GUI_UI_REFRESH_MS = 100
+
+
+_MISSING = object()
+
+
+class WidgetViewModel(QtCore.QObject):
+    """Diff widget properties and apply only what changed, coalesced on a timer.
+
+    Callers describe the desired state (``set_text``, ``set_enabled``, ...);
+    repeated writes of the same value are dropped and the rest are flushed at
+    most once per ``interval_ms``. Must be used from the GUI thread.
+    """
+
+    MAX_CALL_RETRIES = 10
+
+    def __init__(self, parent=None, interval_ms=None):
+        super().__init__(parent)
+        interval_ms = GUI_UI_REFRESH_MS if interval_ms is None else interval_ms
+        self._applied = {}
+        self._pending = {}
+        self._retries = {}
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(max(0, int(interval_ms)))
+        self._timer.timeout.connect(self.flush)
+
+    def set_interval(self, interval_ms):
+        self._timer.setInterval(max(0, int(interval_ms)))
+
+    def _queue(self, key, apply, value):
+        pending = self._pending.get(key)
+        if pending is None and self._applied.get(key, _MISSING) == value:
+            return
+        if pending is not None and self._applied.get(key, _MISSING) == value:
+            # Changed and changed back before the flush: nothing to do.
+            del self._pending[key]
+            return
+        self._pending[key] = (apply, value)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def set_text(self, widget, text):
+        self._queue((id(widget), "text"), widget.setText, str(text))
+
+    def set_enabled(self, widget, enabled):
+        self._queue((id(widget), "enabled"), widget.setEnabled, bool(enabled))
+
+    def set_visible(self, widget, visible):
+        self._queue((id(widget), "visible"), widget.setVisible, bool(visible))
+
+    def call(self, key, value, fn):
+        """Call ``fn(value)`` when ``value`` changes.
+
+        ``fn`` may return False to have the same value retried on the next
+        flush (e.g. a rate-limited LCD).
+        """
+        self._queue(("call", key), fn, value)
+
+    def flush(self):
+        pending = self._pending
+        self._pending = {}
+        retry = False
+        for key, (apply, value) in pending.items():
+            try:
+                ok = apply(value)
+            except Exception:
+                ok = True
+            if key[0] == "call" and ok is False:
+                count = self._retries.get(key, 0) + 1
+                if count <= self.MAX_CALL_RETRIES:
+                    self._retries[key] = count
+                    self._pending.setdefault(key, (apply, value))
+                    retry = True
+                    continue
+            self._retries.pop(key, None)
+            self._applied[key] = value
+        if retry and not self._timer.isActive():
+            self._timer.start()
+
+    def invalidate(self, widget=None):
+        if widget is None:
+            self._applied.clear()
+            return
+        wid = id(widget)
+        for key in [k for k in self._applied if k[0] == wid]:
+            del self._applied[key]
@@ -0,0 +1,258 @@
+import os
+import threading
+import time
+from collections import deque
+
+try:
+    import config as _config
+except Exception:
+    _config = None
+
+
+def _get_cfg(name, default):
+    if _config is None:
+        return default
+    return getattr(_config, name, default)
+
+
+# Stage names shown in the diagnostics panel, in pipeline order.
+PIPELINE_STAGES = (
+    "capture",
+    "colour",
+    "detect",
+    "roi_filter",
+    "embed",
+    "liveness",
+    "match",
+    "render",
+)
+
+
+class RollingStat:
+    """Last N samples of a latency; percentiles are computed only on read."""
+
+    __slots__ = ("_samples", "count")
+
+    def __init__(self, window):
+        self._samples = deque(maxlen=window)
+        self.count = 0
+
+    def add(self, value):
+        # deque.append is atomic under the GIL; no lock on the hot path.
+        self._samples.append(value)
+        self.count += 1
+
+    def summary(self):
+        samples = sorted(self._samples)
+        if not samples:
+            return None
+        n = len(samples)
+
+        def pct(p):
+            return samples[min(n - 1, int(round(p / 100.0 * (n - 1))))]
+
+        return {
+            "p50": pct(50),
+            "p95": pct(95),
+            "p99": pct(99),
+            "max": samples[-1],
+            "count": self.count,
+        }
+
+
+class RateMeter:
+    __slots__ = ("_stamps", "window_sec")
+
+    def __init__(self, window_sec=5.0, maxlen=1024):
+        self._stamps = deque(maxlen=maxlen)
+        self.window_sec = window_sec
+
+    def tick(self, now=None):
+        self._stamps.append(time.monotonic() if now is None else now)
+
+    def rate(self, now=None):
+        now = time.monotonic() if now is None else now
+        stamps = list(self._stamps)
+        cutoff = now - self.window_sec
+        recent = [t for t in stamps if t >= cutoff]
+        if len(recent) < 2:
+            return 0.0
+        span = max(now - recent[0], 1e-6)
+        return len(recent) / span
+
+
+class _Timer:
+    __slots__ = ("_registry", "_stage", "_start")
+
+    def __init__(self, registry, stage):
+        self._registry = registry
+        self._stage = stage
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._registry.observe(self._stage, (time.perf_counter() - self._start) * 1000.0)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class MetricsRegistry:
+    """In-process metrics: rolling latencies, rates, counters and gauges.
+
+    Recording is an append/increment; all aggregation happens in snapshot(),
+    which the diagnostics panel calls about once a second.
+    """
+
+    def __init__(self, enabled=True, window=None, rate_window_sec=None):
+        self.enabled = bool(enabled)
+        self.window = max(16, int(window or _get_cfg("METRICS_WINDOW", 300)))
+        self.rate_window_sec = float(rate_window_sec or _get_cfg("METRICS_RATE_WINDOW_SEC", 5.0))
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._rates = {}
+        self._counters = {}
+        self._gauges = {}
+        self._cpu_prev = None
+        self._started = time.time()
+
+    # ------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------
+    def observe(self, stage, ms):
+        if not self.enabled or ms is None:
+            return
+        stat = self._stats.get(stage)
+        if stat is None:
+            with self._lock:
+                stat = self._stats.setdefault(stage, RollingStat(self.window))
+        stat.add(float(ms))
+
+    def timer(self, stage):
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, stage)
+
+    def tick(self, name):
+        if not self.enabled:
+            return
+        meter = self._rates.get(name)
+        if meter is None:
+            with self._lock:
+                meter = self._rates.setdefault(name, RateMeter(self.rate_window_sec))
+        meter.tick()
+
+    def incr(self, name, n=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def gauge(self, name, value):
+        if not self.enabled:
+            return
+        self._gauges[name] = value
+
+    # ------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------
+    def _read_rss_mb(self):
+        try:
+            with open("/proc/self/status", "r") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1]) / 1024.0
+        except Exception:
+            return None
+        return None
+
+    def _read_cpu_percent(self):
+        try:
+            ticks = os.sysconf("SC_CLK_TCK")
+            with open("/proc/self/stat", "r") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            # utime / stime are fields 14 and 15 (1-based) of /proc/<pid>/stat
+            cpu_sec = (int(fields[11]) + int(fields[12])) / float(ticks)
+        except Exception:
+            return None
+        now = time.monotonic()
+        prev = self._cpu_prev
+        self._cpu_prev = (now, cpu_sec)
+        if prev is None or now <= prev[0]:
+            return None
+        return 100.0 * (cpu_sec - prev[1]) / (now - prev[0])
+
+    def system(self):
+        temp_c = None
+        throttled = None
+        try:
+            from scheduler import read_cpu_temp_c, read_throttled
+
+            temp_c = read_cpu_temp_c()
+            throttled = read_throttled()
+        except Exception:
+            pass
+        try:
+            load = os.getloadavg()[0]
+        except Exception:
+            load = None
+        return {
+            "cpu_percent": self._read_cpu_percent(),
+            "load1": load,
+            "cpu_temp_c": temp_c,
+            "throttled": throttled,
+            "rss_mb": self._read_rss_mb(),
+            "uptime_sec": time.time() - self._started,
+        }
+
+    def snapshot(self):
+        with self._lock:
+            stats = dict(self._stats)
+            rates = dict(self._rates)
+            counters = dict(self._counters)
+        stages = {}
+        for name, stat in stats.items():
+            summary = stat.summary()
+            if summary is not None:
+                stages[name] = summary
+        return {
+            "enabled": self.enabled,
+            "stages": stages,
+            "rates": {name: meter.rate() for name, meter in rates.items()},
+            "counters": counters,
+            "gauges": dict(self._gauges),
+            "system": self.system(),
+        }
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._rates.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics():
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = MetricsRegistry(enabled=_get_cfg("METRICS_ENABLED", True))
+        return _metrics
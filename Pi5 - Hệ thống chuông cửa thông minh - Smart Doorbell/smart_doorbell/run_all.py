@@ -4,6 +4,7 @@ import os
 import re
 import shlex
 import shutil
+import signal
 import subprocess
 import sys
 import threading
@@ -49,11 +50,7 @@ def _force_venv_packages():
 
 _force_venv_packages()
 
-from PySide6 import QtWidgets
-
-from gui.qt_utils import apply_theme
-
-from config import API_HOST, API_PORT
+from config import API_HOST, API_PORT, HEADLESS
 
 
 def _announce_tunnel_url(url):
@@ -158,8 +155,7 @@ def _start_tunnel():
     return proc, url_holder
 
 
-from gui.app_window import AppWindow
-from server.control import set_door_controller
+from server.control import set_door_controller, set_runtime
 
 
 def _start_api():
@@ -186,6 +182,63 @@ def _start_api():
     return server, thread
 
 
+def _run_gui(shutdown_services):
+    from PySide6 import QtWidgets
+
+    from gui.app_window import AppWindow
+    from gui.qt_utils import apply_theme
+
+    qt_app = QtWidgets.QApplication(sys.argv)
+    apply_theme(qt_app)
+    win = AppWindow()
+    set_door_controller(win.live_tab._door)
+    set_runtime(win.runtime)
+
+    def _shutdown():
+        win.shutdown()
+        shutdown_services()
+
+    qt_app.aboutToQuit.connect(_shutdown)
+    win.show()
+    return qt_app.exec()
+
+
+def _run_headless(shutdown_services):
+    from service import DoorbellService
+
+    service = DoorbellService()
+    set_door_controller(service.door)
+    set_runtime(service.runtime)
+
+    def _on_signal(signum, frame):
+        print(f"Headless: signal {signum}, stopping")
+        service.stop()
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            signal.signal(sig, _on_signal)
+        except Exception:
+            pass
+
+    service.start()
+    print("Headless: doorbell service running (Ctrl+C to stop)")
+    try:
+        while not service.wait(1.0):
+            pass
+    finally:
+        service.shutdown()
+        shutdown_services()
+    return 0
+
+
+def _headless_requested(argv):
+    if "--headless" in argv:
+        return True
+    if "--gui" in argv:
+        return False
+    return bool(HEADLESS)
+
+
 def main():
     tunnel_proc, tunnel_info = _start_tunnel()
     if tunnel_info is not None:
@@ -194,27 +247,56 @@ def main():
             _announce_tunnel_url(tunnel_url)
             tunnel_info["printed"] = True
     server, thread = _start_api()
+    try:
+        from server.retention import start_retention
 
-    qt_app = QtWidgets.QApplication(sys.argv)
-    apply_theme(qt_app)
-    win = AppWindow()
-    set_door_controller(win.live_tab._door)
+        start_retention()
+    except Exception as exc:
+        print(f"[Retention] not started: {exc}")
+    try:
+        from tracing import install_signal_handler
 
-    def _shutdown():
-        win.shutdown()
+        # kill -USR1 <pid> writes the span ring to TRACE_DUMP_DIR.
+        install_signal_handler()
+    except Exception as exc:
+        print(f"[trace] signal handler not installed: {exc}")
+
+    def _shutdown_services():
         if server is not None:
             server.should_exit = True
         if thread is not None and thread.is_alive():
             thread.join(timeout=2)
+        try:
+            from server.retention import stop_retention
+
+            stop_retention()
+        except Exception:
+            pass
+        try:
+            from server.clip_recorder import get_clip_recorder
+
+            recorder = get_clip_recorder()
+            if recorder is not None:
+                # Write clips still waiting for post-roll with what is buffered.
+                recorder.close()
+        except Exception:
+            pass
+        try:
+            from server.event_store import get_event_store
+
+            # Drain queued snapshots and log lines before the process exits.
+            get_event_store().close()
+        except Exception:
+            pass
         if tunnel_proc is not None:
             try:
                 tunnel_proc.terminate()
             except Exception:
                 pass
 
-    qt_app.aboutToQuit.connect(_shutdown)
-    win.show()
-    return qt_app.exec()
+    if _headless_requested(sys.argv[1:]):
+        return _run_headless(_shutdown_services)
+    return _run_gui(_shutdown_services)
 
 
 if __name__ == "__main__":
@@ -1,6 +1,7 @@
 import os
 import threading
 import time
+from collections import deque
 
 import cv2
 import numpy as np
@@ -8,6 +9,7 @@ import numpy as np
 from config import (
     FRAME_WIDTH,
     FRAME_HEIGHT,
+    CAMERA_SOURCE,
     LIVENESS_MODEL_PATH,
     RECOGNITION_SMOOTH_WINDOW,
     RECOGNITION_STABLE_COUNT,
@@ -15,7 +17,21 @@ from config import (
     RECOGNITION_STABLE_MIN_SCORE,
     FACE_SIZE_MIN_RELATIVE_AREA,
     FACE_SIZE_MAX_RELATIVE_AREA,
+    MOTION_PIN,
+    IDLE_ENABLED,
+    IDLE_AFTER_SEC,
+    IDLE_FRAME_WIDTH,
+    IDLE_FRAME_HEIGHT,
+    IDLE_FPS,
+    IDLE_MOTION_THRESHOLD,
+    IDLE_UNLOAD_MODELS,
+    IDLE_PIR_ENABLED,
 )
+from face.result import CropPool, RecognitionResult
+from face.thumb_store import save_enrollment_crop
+from metrics import get_metrics
+from tracing import get_tracer, span, traced
+from scheduler import AdaptiveScheduler
 from utils.utils import normalize_face_crop
 
 
@@ -31,10 +47,25 @@ def _get_mode():
 class OpenCVCamera:
     def __init__(self, index=0, width=None, height=None):
         self.cap = cv2.VideoCapture(index)
+        self.width = width
+        self.height = height
         if width:
             self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
         if height:
             self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 0.0
+
+    def set_low_power(self, enabled, width=None, height=None, fps=None):
+        if enabled:
+            w, h, rate = width, height, fps
+        else:
+            w, h, rate = self.width, self.height, self.fps
+        if w:
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, w)
+        if h:
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, h)
+        if rate:
+            self.cap.set(cv2.CAP_PROP_FPS, rate)
 
     def get_frame(self):
         if not self.cap.isOpened():
@@ -49,10 +80,97 @@ class OpenCVCamera:
             self.cap.release()
 
 
+class IdleStateMachine:
+    ACTIVE = "active"
+    IDLE = "idle"
+
+    def __init__(self, enabled=True, after_sec=30.0):
+        self.enabled = bool(enabled) and after_sec > 0
+        self.after_sec = float(after_sec)
+        self.state = self.ACTIVE
+        # Leaf lock for the fields below; note_activity() is a single store and stays lock-free.
+        self._lock = threading.Lock()
+        self._last_activity = time.monotonic()
+        self._idle_since = 0.0
+        self._wake_request_ts = None
+        self._wake_source = None
+        self.wake_count = 0
+        self.last_wake_source = None
+        self.last_wake_latency_ms = None
+        self.wake_latencies_ms = deque(maxlen=50)
+
+    @property
+    def is_idle(self):
+        return self.state == self.IDLE
+
+    def note_activity(self):
+        self._last_activity = time.monotonic()
+
+    def should_sleep(self):
+        if not self.enabled or self.state != self.ACTIVE:
+            return False
+        return time.monotonic() - self._last_activity >= self.after_sec
+
+    def enter_idle(self):
+        with self._lock:
+            self.state = self.IDLE
+            self._idle_since = time.monotonic()
+
+    def begin_wake(self, source):
+        with self._lock:
+            self.state = self.ACTIVE
+            self._wake_request_ts = time.monotonic()
+            self._wake_source = source
+        self.note_activity()
+
+    def complete_wake(self):
+        with self._lock:
+            if self._wake_request_ts is None:
+                return None
+            latency_ms = (time.monotonic() - self._wake_request_ts) * 1000.0
+            self._wake_request_ts = None
+            self.wake_count += 1
+            self.last_wake_source = self._wake_source
+            self.last_wake_latency_ms = latency_ms
+            self.wake_latencies_ms.append(latency_ms)
+            return latency_ms
+
+    def stats(self):
+        with self._lock:
+            samples = sorted(self.wake_latencies_ms)
+            state = self.state
+            idle_since = self._idle_since
+            wake_count = self.wake_count
+            last_source = self.last_wake_source
+            last_latency = self.last_wake_latency_ms
+
+        def _pct(p):
+            if not samples:
+                return None
+            idx = min(len(samples) - 1, int(round(p / 100.0 * (len(samples) - 1))))
+            return samples[idx]
+
+        return {
+            "enabled": self.enabled,
+            "state": state,
+            "idleAfterSec": self.after_sec,
+            "idleForSec": (time.monotonic() - idle_since) if state == self.IDLE else 0.0,
+            "wakeCount": wake_count,
+            "lastWakeSource": last_source,
+            "lastWakeLatencyMs": last_latency,
+            "wakeLatencyP50Ms": _pct(50),
+            "wakeLatencyP95Ms": _pct(95),
+        }
+
+
 class DoorbellRuntime:
-    def __init__(self, camera_index=0, enable_liveness=False, enable_face=True):
+    def __init__(self, camera_index=0, enable_liveness=False, enable_face=True, camera=None):
         self.lock = threading.Lock()
         self.infer_lock = threading.Lock()
+        self.camera_lock = threading.Lock()
+        # Serialises idle <-> active transitions (capture thread, PIR callback, API/GUI wake).
+        # Taken before camera_lock / infer_lock, never while holding them.
+        self.idle_transition_lock = threading.Lock()
         self.mode = _get_mode()
         self.enable_face = enable_face
         self.enable_liveness = bool(enable_liveness and enable_face)
@@ -61,7 +179,7 @@ class DoorbellRuntime:
         self._face_import_error = "not initialized"
         self._liveness_import_error = "not initialized"
 
-        self.camera = self._init_camera(camera_index)
+        self.camera = camera if camera is not None else self._init_camera(camera_index)
         self.face = self._init_face()
         self.liveness = self._init_liveness(self.enable_liveness)
 
@@ -76,15 +194,36 @@ class DoorbellRuntime:
         self._stable_name = None
         self._stable_score = None
         self._stable_ts = 0.0
+        self.scheduler = AdaptiveScheduler()
+        self.metrics = get_metrics()
+
+        self.idle = IdleStateMachine(enabled=IDLE_ENABLED, after_sec=IDLE_AFTER_SEC)
+        self._idle_motion_threshold = max(0.0, float(IDLE_MOTION_THRESHOLD))
+        self._idle_unload_models = bool(IDLE_UNLOAD_MODELS)
+        self._motion_prev = None
+        self._pir = self._init_pir() if self.idle.enabled else None
 
         self.last_frame = None
-        self.last_face_crop = None
+        self.last_frame_seq = None
+        # Called as listener(frame, ts) from read_frame(); must not block or mutate the frame.
+        self._frame_listeners = ()
+        self._crop_pool = CropPool(slots=4)
         self.last_embedding = None
         self.last_bbox = None
         self.last_result = None
         self.last_infer_ts = 0.0
 
     def _init_camera(self, camera_index):
+        if CAMERA_SOURCE:
+            try:
+                from camera.replay import build_replay_camera
+
+                cam = build_replay_camera(CAMERA_SOURCE, FRAME_WIDTH, FRAME_HEIGHT)
+                self._camera_is_rgb = False
+                return cam
+            except Exception as exc:
+                self._camera_import_error = exc
+                print(f"[camera] replay source {CAMERA_SOURCE!r} unavailable: {exc}")
         if self.mode == "mock":
             self._camera_is_rgb = False
             return OpenCVCamera(camera_index, FRAME_WIDTH, FRAME_HEIGHT)
@@ -105,6 +244,19 @@ class DoorbellRuntime:
         self._camera_is_rgb = False
         return OpenCVCamera(camera_index, FRAME_WIDTH, FRAME_HEIGHT)
 
+    def _init_pir(self):
+        if not IDLE_PIR_ENABLED or self.mode == "mock" or int(MOTION_PIN) <= 0:
+            return None
+        try:
+            from gpiozero import MotionSensor
+
+            pir = MotionSensor(int(MOTION_PIN))
+            pir.when_motion = lambda: self.wake("pir")
+            return pir
+        except Exception as exc:
+            print(f"[idle] PIR unavailable: {exc}")
+            return None
+
     def _init_face(self):
         if not self.enable_face:
             self._face_import_error = "disabled"
@@ -180,46 +332,189 @@ class DoorbellRuntime:
         return None, None, score, True
 
 
+    @traced("read_frame")
     def read_frame(self):
-        frame = self.camera.get_frame() if self.camera else None
+        metrics = self.metrics
+        tracer = get_tracer()
+        if tracer.enabled:
+            self.last_frame_seq = tracer.next_frame()
+        with self.camera_lock:
+            with metrics.timer("capture"):
+                frame = self.camera.get_frame() if self.camera else None
         if frame is None:
+            metrics.incr("capture_failed")
             return None
+        metrics.tick("camera")
         if self._camera_is_rgb:
-            frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+            with metrics.timer("colour"):
+                frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
         with self.lock:
             self.last_frame = frame
+        listeners = self._frame_listeners
+        if listeners:
+            now = time.time()
+            for listener in listeners:
+                try:
+                    listener(frame, now)
+                except Exception:
+                    continue
+
+        if self.idle.is_idle:
+            if self._frame_has_motion(frame):
+                self.wake("motion")
+        else:
+            latency_ms = self.idle.complete_wake()
+            if latency_ms is not None:
+                print(f"[idle] awake via {self.idle.last_wake_source} in {latency_ms:.0f} ms")
+            # Someone moving at the door without a detectable face still keeps the unit awake.
+            if self.idle.enabled and self._frame_has_motion(frame):
+                self.idle.note_activity()
+            if self.idle.should_sleep():
+                self._enter_idle()
         return frame
 
+    def add_frame_listener(self, callback):
+        with self.lock:
+            if callback not in self._frame_listeners:
+                # Copy-on-write tuple: read_frame iterates without taking the lock.
+                self._frame_listeners = tuple(self._frame_listeners) + (callback,)
+
+    def remove_frame_listener(self, callback):
+        with self.lock:
+            self._frame_listeners = tuple(cb for cb in self._frame_listeners if cb != callback)
+
+    def is_idle(self):
+        return self.idle.is_idle
+
+    def note_activity(self):
+        self.idle.note_activity()
+
+    def _frame_has_motion(self, frame):
+        small = cv2.resize(frame, (64, 48), interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        prev = self._motion_prev
+        self._motion_prev = gray
+        if prev is None or prev.shape != gray.shape:
+            return False
+        return float(cv2.absdiff(gray, prev).mean()) >= self._idle_motion_threshold
+
+    def _set_camera_low_power(self, enabled):
+        setter = getattr(self.camera, "set_low_power", None)
+        if setter is None:
+            return False
+        try:
+            with self.camera_lock:
+                setter(enabled, IDLE_FRAME_WIDTH, IDLE_FRAME_HEIGHT, IDLE_FPS)
+            return True
+        except Exception as exc:
+            print(f"[idle] camera mode switch failed: {exc}")
+            return False
+
+    def _park_models(self):
+        if self.liveness is not None:
+            try:
+                self.liveness.reset()
+            except Exception:
+                pass
+        self._recent_ids = []
+        if not self._idle_unload_models:
+            return
+        with self.infer_lock:
+            self.face = None
+            self.liveness = None
+            self._face_import_error = "parked (idle)"
+
+    def _unpark_models(self):
+        if not self._idle_unload_models or not self.enable_face:
+            return
+        with self.infer_lock:
+            if self.face is None:
+                self.face = self._init_face()
+            if self.liveness is None and self.enable_liveness:
+                self.liveness = self._init_liveness(self.enable_liveness)
+
+    def _enter_idle(self):
+        with self.idle_transition_lock:
+            # A wake may have landed since should_sleep() was checked.
+            if self.idle.is_idle or not self.idle.should_sleep():
+                return False
+            self.idle.enter_idle()
+            self._motion_prev = None
+            self._set_camera_low_power(True)
+            self._park_models()
+        print(f"[idle] no activity for {self.idle.after_sec:.0f}s, entering low-power idle")
+        return True
+
+    def wake(self, source="api"):
+        with self.idle_transition_lock:
+            if not self.idle.is_idle:
+                self.idle.note_activity()
+                return False
+            self.idle.begin_wake(source)
+            self._set_camera_low_power(False)
+            self._unpark_models()
+        return True
+
     def infer_frame(self, frame):
-        result = {
-            "has_face": False,
-            "bbox": None,
-            "face_crop": None,
-            "embedding": None,
-            "is_real": None,
-            "id": None,
-            "name": None,
-            "score": None,
-            "error": None,
-        }
+        start = time.perf_counter()
+        with span("infer_frame"):
+            result = self._infer_frame(frame)
+        total_ms = (time.perf_counter() - start) * 1000.0
+        self.scheduler.note_result(result, total_ms)
+        metrics = self.metrics
+        for stage, ms in (result.timings or {}).items():
+            metrics.observe(stage, ms)
+        metrics.observe("infer", total_ms)
+        metrics.tick("processed")
+        return result
+
+    def _detect(self, frame, timings=None):
+        scale = float(self.scheduler.analysis_scale) if self.scheduler.enabled else 1.0
+        if scale >= 0.999:
+            with span("detect_faces"):
+                return self.face.detect_faces(frame, timings=timings)
+        h, w = frame.shape[:2]
+        t0 = time.perf_counter()
+        small = cv2.resize(
+            frame,
+            (max(1, int(w * scale)), max(1, int(h * scale))),
+            interpolation=cv2.INTER_AREA,
+        )
+        if timings is not None:
+            timings["downscale"] = (time.perf_counter() - t0) * 1000.0
+        # Detections are relative, so boxes map straight back onto the full frame.
+        with span("detect_faces", scale=round(scale, 3)):
+            return self.face.detect_faces(small, timings=timings)
+
+    @property
+    def last_face_crop(self):
+        result = self.last_result
+        if result is None:
+            return None
+        return result.face_crop()
+
+    def _infer_frame(self, frame):
+        timings = {}
+        fields = {"timings": timings}
 
         if not self.enable_face:
-            result["error"] = "Face module disabled"
-            return result
+            return RecognitionResult(error="Face module disabled", timings=timings)
 
         if self.face is None:
-            result["error"] = f"Face module unavailable: {self._face_import_error}"
-            return result
+            return RecognitionResult(
+                error=f"Face module unavailable: {self._face_import_error}",
+                timings=timings,
+            )
 
         with self.infer_lock:
             try:
-                detections = self.face.detect_faces(frame)
+                # Fills colour / detect / roi_filter (and downscale) in timings.
+                detections = self._detect(frame, timings=timings)
             except Exception as exc:
-                result["error"] = f"detect_faces failed: {exc}"
-                return result
+                return RecognitionResult(error=f"detect_faces failed: {exc}", timings=timings)
 
             if not detections or not detections.detections:
-                return result
+                return RecognitionResult(timings=timings)
 
             try:
                 best = max(
@@ -228,8 +523,9 @@ class DoorbellRuntime:
                     * d.location_data.relative_bounding_box.height,
                 )
             except Exception as exc:
-                result["error"] = f"select best detection failed: {exc}"
-                return result
+                return RecognitionResult(
+                    error=f"select best detection failed: {exc}", timings=timings
+                )
 
             bbox_rel = best.location_data.relative_bounding_box
             rel_area = float(bbox_rel.width) * float(bbox_rel.height)
@@ -240,58 +536,69 @@ class DoorbellRuntime:
             y2 = min(h, y1 + int(bbox_rel.height * h))
             bbox = (x1, y1, x2, y2)
 
-            result["has_face"] = True
-            result["bbox"] = bbox
-            result["size_area"] = rel_area
+            fields["has_face"] = True
+            fields["bbox"] = bbox
+            fields["size_area"] = rel_area
+            self.idle.note_activity()
 
+            size_status = None
             if self._face_min_area and rel_area < self._face_min_area:
-                result["size_status"] = "too_small"
-                with self.lock:
-                    self.last_bbox = bbox
-                    self.last_result = result
-                    self.last_infer_ts = time.time()
-                return result
-
-            if self._face_max_area and rel_area > self._face_max_area:
-                result["size_status"] = "too_large"
+                size_status = "too_small"
+            elif self._face_max_area and rel_area > self._face_max_area:
+                size_status = "too_large"
+            if size_status is not None:
+                result = RecognitionResult(size_status=size_status, **fields)
                 with self.lock:
                     self.last_bbox = bbox
                     self.last_result = result
                     self.last_infer_ts = time.time()
                 return result
 
+            t0 = time.perf_counter()
             try:
-                face_crop, embedding, bbox = self.face.update_last_face(frame, best)
+                with span("update_last_face"):
+                    face_crop, embedding, bbox = self.face.update_last_face(
+                        frame, best, copy_crop=False
+                    )
             except Exception as exc:
-                result["error"] = f"update_last_face failed: {exc}"
-                return result
+                return RecognitionResult(error=f"update_last_face failed: {exc}", **fields)
+            timings["embed"] = (time.perf_counter() - t0) * 1000.0
 
-            result["has_face"] = True
-            result["face_crop"] = face_crop
-            result["embedding"] = embedding
-            result["bbox"] = bbox
+            fields["bbox"] = bbox
+            fields["embedding"] = embedding
 
             if self.liveness is not None:
+                t0 = time.perf_counter()
                 try:
                     normalized = normalize_face_crop(face_crop)
-                    result["is_real"] = self.liveness.is_real(normalized, bbox)
+                    with span("is_real"):
+                        fields["is_real"] = self.liveness.is_real(normalized, bbox)
                 except Exception as exc:
-                    result["error"] = f"liveness failed: {exc}"
+                    fields["error"] = f"liveness failed: {exc}"
+                timings["liveness"] = (time.perf_counter() - t0) * 1000.0
 
+            t0 = time.perf_counter()
             try:
-                rid, name, score = self.face.recognize_embedding(embedding)
-                rid, name, score, stabilizing = self._smooth_recognition(
-                    rid, name, score
-                )
-                result["id"] = rid
-                result["name"] = name
-                result["score"] = score
-                result["stabilizing"] = stabilizing
+                with span("recognize_embedding"):
+                    rid, name, score = self.face.recognize_embedding(embedding)
+                with span("_smooth_recognition"):
+                    rid, name, score, stabilizing = self._smooth_recognition(
+                        rid, name, score
+                    )
+                fields["id"] = rid
+                fields["name"] = name
+                fields["score"] = score
+                fields["stabilizing"] = stabilizing
             except Exception as exc:
-                result["error"] = f"recognize failed: {exc}"
+                fields["error"] = f"recognize failed: {exc}"
+            timings["match"] = (time.perf_counter() - t0) * 1000.0
+
+            # face_crop is a view into the frame; keep one pooled copy that is
+            # only materialized when enrollment or event capture asks for it.
+            fields["crop_ref"] = self._crop_pool.store(face_crop)
+            result = RecognitionResult(**fields)
 
         with self.lock:
-            self.last_face_crop = face_crop
             self.last_embedding = embedding
             self.last_bbox = bbox
             self.last_result = result
@@ -302,6 +609,93 @@ class DoorbellRuntime:
     def force_recognize(self, frame):
         return self.infer_frame(frame)
 
+    def recognize_batch(self, frames):
+        """Detect -> embed -> match for images that did not come from the camera (POST /recognize).
+
+        The whole batch runs under one infer_lock hold and matching is one
+        matrix product against the DB. Live state (last_result, smoothing,
+        scheduler, idle) is left alone, the door ROI is not applied and there
+        is no liveness check. Returns one dict per frame (``None`` frames give
+        an error entry).
+        """
+        if self.face is None and self._idle_unload_models:
+            with self.idle_transition_lock:
+                self._unpark_models()
+        out = []
+        pending = []
+        with self.infer_lock:
+            face = self.face
+            for frame in frames:
+                timings = {}
+                if face is None:
+                    out.append({"ok": False, "error": f"Face module unavailable: {self._face_import_error}",
+                                "timings": timings})
+                    continue
+                if frame is None:
+                    out.append({"ok": False, "error": "could not decode image", "timings": timings})
+                    continue
+                try:
+                    with span("detect_faces", source="recognize"):
+                        detections = face.detect_faces(frame, timings=timings, apply_roi=False)
+                except Exception as exc:
+                    out.append({"ok": False, "error": f"detect_faces failed: {exc}", "timings": timings})
+                    continue
+                if not detections or not detections.detections:
+                    out.append({"ok": True, "has_face": False, "timings": timings})
+                    continue
+                best = max(
+                    detections.detections,
+                    key=lambda d: d.location_data.relative_bounding_box.width
+                    * d.location_data.relative_bounding_box.height,
+                )
+                rel = best.location_data.relative_bounding_box
+                h, w = frame.shape[:2]
+                x1 = max(0, int(rel.xmin * w))
+                y1 = max(0, int(rel.ymin * h))
+                x2 = min(w, x1 + int(rel.width * w))
+                y2 = min(h, y1 + int(rel.height * h))
+                if x2 - x1 < 2 or y2 - y1 < 2:
+                    out.append({"ok": True, "has_face": False, "timings": timings})
+                    continue
+                t0 = time.perf_counter()
+                try:
+                    embedding = face.get_embedding(frame[y1:y2, x1:x2])
+                except Exception as exc:
+                    out.append({"ok": False, "error": f"embedding failed: {exc}", "timings": timings})
+                    continue
+                timings["embed"] = (time.perf_counter() - t0) * 1000.0
+                out.append({"ok": True, "has_face": True, "bbox": [x1, y1, x2, y2], "timings": timings})
+                pending.append((len(out) - 1, embedding))
+            if pending:
+                t0 = time.perf_counter()
+                matches = self._match_batch(face, [emb for _, emb in pending])
+                match_ms = (time.perf_counter() - t0) * 1000.0
+                for (i, _), (rid, name, score) in zip(pending, matches):
+                    out[i].update(id=rid, name=name, score=score)
+                    out[i]["timings"]["match"] = match_ms / len(pending)
+        return out
+
+    @staticmethod
+    def _match_batch(face, embeddings):
+        db = face.DB or {}
+        if not db:
+            return [(None, None, -1.0)] * len(embeddings)
+        ids = list(db.keys())
+        gallery = np.asarray([db[pid][1] for pid in ids], dtype=np.float32)
+        gallery /= np.maximum(np.linalg.norm(gallery, axis=1, keepdims=True), 1e-12)
+        query = np.asarray(embeddings, dtype=np.float32).reshape(len(embeddings), -1)
+        query /= np.maximum(np.linalg.norm(query, axis=1, keepdims=True), 1e-12)
+        scores = query @ gallery.T
+        out = []
+        for row in scores:
+            j = int(np.argmax(row))
+            score = float(row[j])
+            if score >= face.threshold:
+                out.append((ids[j], db[ids[j]][0], score))
+            else:
+                out.append((None, None, score))
+        return out
+
     def extract_embedding(self, frame=None, face_crop=None):
         if not self.enable_face:
             return {"ok": False, "error": "Face module disabled"}
@@ -313,7 +707,7 @@ class DoorbellRuntime:
 
         if face_crop is not None:
             emb = self.face.extract_embedding(face_crop)
-            return {"ok": True, "embedding": emb, "bbox": None}
+            return {"ok": True, "embedding": emb, "bbox": None, "face_crop": face_crop}
 
         if frame is None:
             return {"ok": False, "error": "No input image available"}
@@ -326,10 +720,10 @@ class DoorbellRuntime:
             key=lambda d: d.location_data.relative_bounding_box.width
             * d.location_data.relative_bounding_box.height,
         )
-        _, emb, bbox = self.face.update_last_face(frame, best)
-        return {"ok": True, "embedding": emb, "bbox": bbox}
+        crop, emb, bbox = self.face.update_last_face(frame, best)
+        return {"ok": True, "embedding": emb, "bbox": bbox, "face_crop": crop}
 
-    def add_person(self, name, embedding):
+    def add_person(self, name, embedding, face_crop=None):
         if not name:
             return {"ok": False, "error": "Name is required"}
         if self.face is None:
@@ -345,6 +739,8 @@ class DoorbellRuntime:
             else np.array(embedding, dtype=np.float32)
         )
         pid, pname, state = self.face.add_new_person(name, emb)
+        if face_crop is not None:
+            save_enrollment_crop(pid, face_crop)
         return {"ok": True, "id": pid, "name": pname, "state": state}
 
     def reload_db(self):
@@ -352,6 +748,11 @@ class DoorbellRuntime:
             self.face.reload_db()
 
     def close(self):
+        if self._pir is not None:
+            try:
+                self._pir.close()
+            except Exception:
+                pass
         if hasattr(self.camera, "close"):
             try:
                 self.camera.close()
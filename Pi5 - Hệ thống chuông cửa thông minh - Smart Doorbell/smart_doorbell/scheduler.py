@@ -0,0 +1,202 @@
+import glob
+import threading
+import time
+
+try:
+    import config as _config
+except Exception:
+    _config = None
+
+
+def _get_cfg(name, default):
+    if _config is None:
+        return default
+    return getattr(_config, name, default)
+
+
+THERMAL_ZONE_GLOB = "/sys/class/thermal/thermal_zone*/temp"
+THROTTLED_PATHS = (
+    "/sys/devices/platform/soc/soc:firmware/get_throttled",
+    "/sys/devices/platform/soc/soc:firmware/raspberrypi-hwmon/get_throttled",
+)
+# get_throttled bits 0..3: under-voltage, freq capped, throttled, soft temp limit
+THROTTLED_ACTIVE_MASK = 0xF
+
+
+def read_cpu_temp_c():
+    best = None
+    for path in sorted(glob.glob(THERMAL_ZONE_GLOB)):
+        try:
+            with open(path, "r") as f:
+                raw = f.read().strip()
+            value = float(raw) / 1000.0
+        except Exception:
+            continue
+        if best is None or value > best:
+            best = value
+    return best
+
+
+def read_throttled():
+    for path in THROTTLED_PATHS:
+        try:
+            with open(path, "r") as f:
+                raw = f.read().strip()
+            return int(raw, 16) if raw.lower().startswith("0x") else int(raw, 0)
+        except Exception:
+            continue
+    return None
+
+
+class AdaptiveScheduler:
+    """Decide detection cadence, analysis scale and preview rate from measurements."""
+
+    def __init__(self):
+        self.enabled = bool(_get_cfg("CADENCE_ADAPTIVE_ENABLED", True))
+        self.n_detection_frames = max(1, int(_get_cfg("N_DETECTION_FRAMES", 3)))
+        self.target_latency_ms = max(1.0, float(_get_cfg("CADENCE_TARGET_LATENCY_MS", 120.0)))
+        self.max_latency_ms = max(self.target_latency_ms, float(_get_cfg("CADENCE_MAX_LATENCY_MS", 250.0)))
+        self.active_interval_sec = max(0.0, float(_get_cfg("CADENCE_ACTIVE_INTERVAL_SEC", 0.0)))
+        self.idle_interval_sec = max(self.active_interval_sec, float(_get_cfg("CADENCE_IDLE_INTERVAL_SEC", 0.5)))
+        self.active_hold_sec = max(0.0, float(_get_cfg("CADENCE_ACTIVE_HOLD_SEC", 2.0)))
+        self.min_scale = max(0.1, min(1.0, float(_get_cfg("CADENCE_MIN_ANALYSIS_SCALE", 0.5))))
+        self.active_preview_ms = max(1, int(_get_cfg("CADENCE_ACTIVE_PREVIEW_MS", 33)))
+        self.idle_preview_ms = max(self.active_preview_ms, int(_get_cfg("CADENCE_IDLE_PREVIEW_MS", 66)))
+        self.max_preview_ms = max(self.idle_preview_ms, int(_get_cfg("CADENCE_MAX_PREVIEW_MS", 200)))
+        self.thermal_soft_c = float(_get_cfg("CADENCE_THERMAL_SOFT_C", 70.0))
+        self.thermal_hard_c = max(self.thermal_soft_c, float(_get_cfg("CADENCE_THERMAL_HARD_C", 80.0)))
+        self.thermal_poll_sec = max(0.5, float(_get_cfg("CADENCE_THERMAL_POLL_SEC", 5.0)))
+
+        self._lock = threading.Lock()
+        self._ema = {}
+        self._ema_alpha = 0.2
+        self._frame_counter = 0
+        self._last_infer_ts = 0.0
+        self._last_face_ts = 0.0
+        self.analysis_scale = 1.0
+        self.cpu_temp_c = None
+        self.throttled = None
+        self._thermal_ts = 0.0
+
+    # ------------------------------------------------------------
+    # Measurements
+    # ------------------------------------------------------------
+    def record(self, stage, ms):
+        if ms is None:
+            return
+        with self._lock:
+            prev = self._ema.get(stage)
+            value = float(ms)
+            self._ema[stage] = value if prev is None else prev + self._ema_alpha * (value - prev)
+
+    def latency_ms(self, stage):
+        with self._lock:
+            return self._ema.get(stage)
+
+    def note_result(self, result, total_ms=None):
+        now = time.monotonic()
+        if result and result.get("has_face"):
+            self._last_face_ts = now
+        timings = (result.get("timings") if result else None) or {}
+        for stage, ms in timings.items():
+            self.record(stage, ms)
+        if total_ms is not None:
+            self.record("infer", total_ms)
+        if self.enabled:
+            self._adjust_scale()
+
+    def _adjust_scale(self):
+        infer_ms = self.latency_ms("infer")
+        if infer_ms is None:
+            return
+        scale = self.analysis_scale
+        if infer_ms > self.target_latency_ms:
+            scale = max(self.min_scale, scale - 0.1)
+        elif infer_ms < self.target_latency_ms * 0.6:
+            scale = min(1.0, scale + 0.05)
+        level = self.thermal_level()
+        if level >= 2:
+            scale = self.min_scale
+        self.analysis_scale = round(scale, 2)
+
+    def _poll_thermal(self):
+        now = time.monotonic()
+        if self._thermal_ts and now - self._thermal_ts < self.thermal_poll_sec:
+            return
+        self._thermal_ts = now
+        self.cpu_temp_c = read_cpu_temp_c()
+        self.throttled = read_throttled()
+
+    def thermal_level(self):
+        self._poll_thermal()
+        if self.throttled is not None and self.throttled & THROTTLED_ACTIVE_MASK:
+            return 2
+        temp = self.cpu_temp_c
+        if temp is None:
+            return 0
+        if temp >= self.thermal_hard_c:
+            return 2
+        if temp >= self.thermal_soft_c:
+            return 1
+        return 0
+
+    # ------------------------------------------------------------
+    # Decisions
+    # ------------------------------------------------------------
+    def is_active(self, now=None):
+        now = time.monotonic() if now is None else now
+        return bool(self._last_face_ts) and now - self._last_face_ts <= self.active_hold_sec
+
+    def detect_interval_sec(self):
+        if self.is_active():
+            interval = self.active_interval_sec
+            infer_ms = self.latency_ms("infer")
+            if infer_ms is not None and infer_ms > self.max_latency_ms:
+                interval = max(interval, infer_ms / 1000.0)
+        else:
+            interval = self.idle_interval_sec
+        level = self.thermal_level()
+        if level == 1:
+            interval = max(interval * 2.0, 0.1)
+        elif level >= 2:
+            interval = max(interval * 4.0, 0.25)
+        return interval
+
+    def should_infer(self):
+        if not self.enabled:
+            due = self._frame_counter % self.n_detection_frames == 0
+            self._frame_counter += 1
+            return due
+        now = time.monotonic()
+        if now - self._last_infer_ts < self.detect_interval_sec():
+            return False
+        self._last_infer_ts = now
+        return True
+
+    def preview_interval_ms(self):
+        if not self.enabled:
+            return self.active_preview_ms
+        interval = self.active_preview_ms if self.is_active() else self.idle_preview_ms
+        render_ms = self.latency_ms("render")
+        if render_ms is not None and render_ms * 2 > interval:
+            interval = int(render_ms * 2)
+        level = self.thermal_level()
+        if level == 1:
+            interval *= 2
+        elif level >= 2:
+            interval *= 4
+        return int(min(self.max_preview_ms, max(self.active_preview_ms, interval)))
+
+    def snapshot(self):
+        with self._lock:
+            ema = dict(self._ema)
+        return {
+            "enabled": self.enabled,
+            "active": self.is_active(),
+            "detect_interval_sec": self.detect_interval_sec(),
+            "analysis_scale": self.analysis_scale,
+            "preview_interval_ms": self.preview_interval_ms(),
+            "cpu_temp_c": self.cpu_temp_c,
+            "throttled": self.throttled,
+            "latency_ms": ema,
+        }
@@ -6,12 +6,13 @@ MODE="pi"
 
 show_help() {
   cat <<'USAGE'
-Usage: ./scripts/run.sh [--mock] [--gui] [--legacy]
+Usage: ./scripts/run.sh [--mock] [--gui] [--legacy] [--headless]
 
 Options:
   --mock     Run in mock mode (no GPIO/servo, webcam OpenCV)
   --gui      Run GUI only (run_gui.py)
   --legacy   Run legacy flow (main.py)
+  --headless Run API + recognition service without Qt (run_all.py --headless)
   -h, --help Show this help
 USAGE
 }
@@ -21,6 +22,7 @@ for arg in "$@"; do
     --mock) MODE="mock" ;; 
     --gui) ENTRY="run_gui.py" ;;
     --legacy) ENTRY="main.py" ;;
+    --headless) export DOORBELL_HEADLESS="1" ;;
     -h|--help) show_help; exit 0 ;;
   esac
 done
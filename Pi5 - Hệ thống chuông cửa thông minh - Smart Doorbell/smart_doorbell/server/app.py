@@ -26,17 +26,43 @@ def _force_typing_extensions():
 
 _force_typing_extensions()
 
-from fastapi import FastAPI
+import asyncio
+
+from fastapi import FastAPI, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
 from config import EVENT_MEDIA_DIR
-from server.control import get_door_controller
-from server.event_store import get_event_store
+
+try:
+    from config import DOOR_COMMAND_WAIT_SEC
+except Exception:
+    DOOR_COMMAND_WAIT_SEC = 5.0
+
+try:
+    from config import RECOGNIZE_MAX_BYTES
+except Exception:
+    RECOGNIZE_MAX_BYTES = 8 * 1024 * 1024
+from face.thumb_store import get_thumb_store
+from server.control import get_door_controller, get_door_executor, get_runtime, lock_command, unlock_command
+from server.event_store import EventIndexUnavailable, get_event_store
+from server.media_variants import VARIANTS, get_media_cache, source_path
+from server.live_stream import get_live_streamer, multipart_chunk
+from server.push import PUSH_HEARTBEAT_SEC, get_push_hub, sse_format
+from server.recognize import RecognizerBusy, get_recognition_batcher
+from tracing import get_tracer, set_enabled as set_trace_enabled
 
 app = FastAPI(title="SmartDoorbell Server")
 
-app.mount("/media", StaticFiles(directory=EVENT_MEDIA_DIR), name="media")
+
+def _attach_push_hub():
+    store = get_event_store()
+    if store is not None:
+        store.add_listener(get_push_hub().publish_event)
+
+
+_attach_push_hub()
 
 
 class DoorEvent(BaseModel):
@@ -44,6 +70,10 @@ class DoorEvent(BaseModel):
     timestamp: str
     type: str  # "KNOWN" | "UNKNOWN" | "RING"
     imageUrl: str
+    thumbUrl: Optional[str] = None
+    clipUrl: Optional[str] = None
+    count: Optional[int] = None
+    lastSeen: Optional[str] = None
     personName: Optional[str] = None
 
 
@@ -52,75 +82,338 @@ class UnlockRequest(BaseModel):
     source: Optional[str] = None
 
 
+class TraceRequest(BaseModel):
+    enabled: bool
+    clear: bool = False
+
+
 @app.get("/health")
 def health():
     return {"ok": True}
 
 
+@app.get("/idle")
+def idle_status():
+    runtime = get_runtime()
+    if runtime is None or getattr(runtime, "idle", None) is None:
+        return {"enabled": False, "state": "unavailable"}
+    return runtime.idle.stats()
+
+
+@app.get("/people/{person_id}/thumb")
+def person_thumb(person_id: str):
+    # Same on-disk thumbs + byte LRU as the People tab.
+    data = get_thumb_store().thumb_bytes(person_id)
+    if not data:
+        raise HTTPException(status_code=404, detail="thumbnail not found")
+    return Response(
+        content=data,
+        media_type="image/jpeg",
+        headers={"Cache-Control": "private, max-age=300"},
+    )
+
+
+@app.get("/media/{event_id}/{variant}")
+def event_media(event_id: str, variant: str, request: Request):
+    # Registered before the /media static mount so it wins for two-segment paths;
+    # dated snapshots (/media/YYYY/MM/DD/x.jpg) still fall through to StaticFiles.
+    if variant not in VARIANTS and variant != "clip":
+        raise HTTPException(status_code=404, detail="unknown variant")
+    store = get_event_store()
+    event = store.get_event(event_id) if store is not None else None
+    if event is None:
+        raise HTTPException(status_code=404, detail="event not found")
+    if variant == "clip":
+        path = source_path(event, field="clipUrl")
+        if path is None:
+            # Not recorded for this event, pruned, or post-roll still being written.
+            raise HTTPException(status_code=404, detail="clip not available")
+        media_type = "video/x-msvideo" if path.lower().endswith(".avi") else "video/mp4"
+        return FileResponse(path, media_type=media_type, headers={"Cache-Control": "private, max-age=86400"})
+    path, etag = get_media_cache().get(event, variant)
+    if path is None:
+        raise HTTPException(status_code=404, detail="media not available")
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=86400"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, media_type="image/jpeg", headers=headers)
+
+
+@app.get("/trace")
+def trace_dump():
+    # Chrome Trace Event JSON; open in chrome://tracing or ui.perfetto.dev.
+    return get_tracer().to_chrome_trace()
+
+
+@app.post("/trace")
+def trace_toggle(req: TraceRequest):
+    tracer = get_tracer()
+    if req.clear:
+        tracer.clear()
+    return {"enabled": set_trace_enabled(req.enabled)}
+
+
 @app.get("/events", response_model=List[DoorEvent])
-def events():
+def events(
+    response: Response,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    type: Optional[str] = None,
+    person: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(1, ge=1, le=500),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    include_actions: bool = False,
+):
+    # Without parameters this is still "the latest event" (limit=1) for old app builds.
+    # Pages: pass the X-Next-Cursor header back as ?cursor=...
     store = get_event_store()
-    items = store.list_events() if store is not None else []
-    return items[:1]
+    if store is None:
+        return []
+    try:
+        items, next_cursor = store.query_events(
+            since=since,
+            until=until,
+            types=type.split(",") if type else None,
+            person=person,
+            cursor=cursor,
+            limit=limit,
+            include_actions=include_actions,
+            order=order,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except EventIndexUnavailable as exc:
+        raise HTTPException(status_code=501, detail=str(exc))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
 
 
-@app.post("/unlock")
-def unlock(req: UnlockRequest):
-    door = get_door_controller()
-    ok = False
-    message = "door unavailable"
-    light_ok = False
-    if door is not None:
-        ok, message = door.open_and_close()
+@app.get("/events/stream")
+async def events_stream(request: Request, last_event_id: Optional[str] = None):
+    # Server-Sent Events: "event" (new door event), "door" (open/closed), "action" (UNLOCK/LOCK result),
+    # plus "hello" / "lagged" / "resync". Browsers resend Last-Event-ID on reconnect.
+    hub = get_push_hub()
+    client, backlog = hub.subscribe(request.headers.get("last-event-id") or last_event_id)
+
+    async def stream():
         try:
-            light_ok = door.set_light_state(True)
-        except Exception:
-            light_ok = False
+            yield "retry: 3000\n\n"
+            for message in backlog:
+                yield sse_format(message)
+            while not client.closed:
+                message = await client.next(PUSH_HEARTBEAT_SEC)
+                if await request.is_disconnected():
+                    break
+                # Comment line keeps proxies / the tunnel from closing an idle connection.
+                yield ": ping\n\n" if message is None else sse_format(message)
+        finally:
+            hub.unsubscribe(client)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.websocket("/ws")
+async def events_ws(websocket: WebSocket, last_event_id: Optional[str] = None):
+    # Same messages as /events/stream, as JSON {"id", "type", "data"}; heartbeat is {"type": "ping"}.
+    await websocket.accept()
+    hub = get_push_hub()
+    client, backlog = hub.subscribe(last_event_id)
+
+    async def drain_incoming():
+        # Clients need not send anything; reading is how a close is noticed.
+        try:
+            while True:
+                await websocket.receive_text()
+        except (WebSocketDisconnect, RuntimeError):
+            return
+
+    reader = asyncio.ensure_future(drain_incoming())
+    try:
+        for message in backlog:
+            await websocket.send_json(message)
+        while not reader.done():
+            message = await client.next(PUSH_HEARTBEAT_SEC)
+            await websocket.send_json(message or {"id": None, "type": "ping", "data": None})
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        reader.cancel()
+        hub.unsubscribe(client)
+
+
+@app.get("/stream.mjpg")
+async def live_stream(request: Request):
+    # multipart/x-mixed-replace: works directly in <img src> and most mobile players.
+    streamer = get_live_streamer()
+    viewer = streamer.join()
+    if viewer is None:
+        raise HTTPException(status_code=503, detail="too many viewers")
+
+    async def frames():
+        try:
+            while True:
+                jpeg = await streamer.next_frame(viewer)
+                if await request.is_disconnected():
+                    break
+                if jpeg is not None:
+                    yield multipart_chunk(jpeg)
+        finally:
+            streamer.leave(viewer)
+
+    return StreamingResponse(
+        frames(),
+        media_type="multipart/x-mixed-replace; boundary=frame",
+        headers={"Cache-Control": "no-cache, no-store", "X-Accel-Buffering": "no"},
+    )
+
+
+def _log_door_command(command):
+    # Runs on the door worker once per executed command; coalesced requests are listed, not re-logged.
+    name = command.action.upper()
     store = get_event_store()
+    action = None
     if store is not None:
-        store.log_action(
-            "UNLOCK",
-            ok,
-            message=message,
-            source=req.source or "api",
-            request_event_id=req.eventId,
+        extra_meta = None
+        if len(command.requesters) > 1:
+            extra_meta = {
+                "commandId": command.id,
+                "requestEventIds": [r.get("eventId") for r in command.requesters],
+            }
+        action = store.log_action(
+            name,
+            command.ok,
+            message=command.message,
+            source=command.source or "api",
+            request_event_id=command.request_event_id,
+            extra_meta=extra_meta,
         )
+    get_push_hub().publish(
+        "action", action or {"type": name, "meta": {"ok": command.ok, "message": command.message}}
+    )
+
+
+def _door_response(req, command, wait):
+    if command is None:
+        return {
+            "ok": False,
+            "eventId": req.eventId,
+            "message": "door executor stopped",
+            "lightOk": False,
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+    if wait:
+        get_door_executor().wait(command, DOOR_COMMAND_WAIT_SEC)
+    finished = command.done.is_set()
     return {
-        "ok": ok,
+        # Without ?wait=true, "ok" means accepted; the result arrives via GET /commands/{id}
+        # or as a "command" message on /events/stream.
+        "ok": bool(command.ok) if finished else True,
         "eventId": req.eventId,
-        "message": message,
-        "lightOk": light_ok,
+        "message": command.message if finished else "queued",
+        "lightOk": command.extra.get("lightOk") if finished else None,
         "timestamp": datetime.utcnow().isoformat(),
+        "commandId": command.id,
+        "status": command.status,
     }
 
 
-@app.post("/lock")
-def lock(req: UnlockRequest):
-    door = get_door_controller()
-    ok = False
-    message = "door unavailable"
-    light_ok = False
-    if door is not None:
-        door.close()
-        ok = True
-        message = "door closed"
+@app.post("/unlock")
+def unlock(req: UnlockRequest, wait: bool = False):
+    runtime = get_runtime()
+    if runtime is not None:
         try:
-            light_ok = door.set_light_state(False)
+            runtime.wake("api")
         except Exception:
-            light_ok = False
-    store = get_event_store()
-    if store is not None:
-        store.log_action(
-            "LOCK",
-            ok,
-            message=message,
-            source=req.source or "api",
-            request_event_id=req.eventId,
-        )
-    return {
-        "ok": ok,
-        "eventId": req.eventId,
-        "message": message,
-        "lightOk": light_ok,
-        "timestamp": datetime.utcnow().isoformat(),
-    }
+            pass
+    command = get_door_executor().submit(
+        "unlock",
+        unlock_command(get_door_controller()),
+        source=req.source or "api",
+        request_event_id=req.eventId,
+        on_done=_log_door_command,
+    )
+    return _door_response(req, command, wait)
+
+
+@app.post("/lock")
+def lock(req: UnlockRequest, wait: bool = False):
+    command = get_door_executor().submit(
+        "lock",
+        lock_command(get_door_controller()),
+        source=req.source or "api",
+        request_event_id=req.eventId,
+        on_done=_log_door_command,
+    )
+    return _door_response(req, command, wait)
+
+
+_FORM_OVERHEAD_BYTES = 64 * 1024
+_READ_CHUNK_BYTES = 64 * 1024
+
+
+async def _upload_chunks(upload):
+    while True:
+        chunk = await upload.read(_READ_CHUNK_BYTES)
+        if not chunk:
+            return
+        yield chunk
+
+
+async def _read_limited(chunks):
+    # Stop as soon as the body passes RECOGNIZE_MAX_BYTES (chunked uploads carry no Content-Length).
+    buf = bytearray()
+    async for chunk in chunks:
+        buf += chunk
+        if len(buf) > RECOGNIZE_MAX_BYTES:
+            raise HTTPException(status_code=413, detail="image too large")
+    return bytes(buf)
+
+
+@app.post("/recognize")
+async def recognize(request: Request):
+    # Body: raw JPEG/PNG (Content-Type image/*), or multipart/form-data with an "image" (or "file") field.
+    content_type = request.headers.get("content-type", "")
+    is_form = content_type.startswith("multipart/form-data")
+    try:
+        declared = int(request.headers.get("content-length", ""))
+    except ValueError:
+        declared = None
+    # Refuse before reading anything; multipart gets some room for boundaries and part headers.
+    if declared is not None and declared > RECOGNIZE_MAX_BYTES + (_FORM_OVERHEAD_BYTES if is_form else 0):
+        raise HTTPException(status_code=413, detail="image too large")
+    if is_form:
+        # Starlette spools file parts to a temp file past 1 MB, so the form itself stays small in memory.
+        form = await request.form(max_files=1, max_fields=8)
+        upload = form.get("image") or form.get("file")
+        if upload is None or not hasattr(upload, "read"):
+            raise HTTPException(status_code=400, detail="multipart field 'image' missing")
+        data = await _read_limited(_upload_chunks(upload))
+    else:
+        data = await _read_limited(request.stream())
+    if not data:
+        raise HTTPException(status_code=400, detail="empty body")
+    try:
+        result = await get_recognition_batcher().submit(data)
+    except RecognizerBusy as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+    if not result.get("ok") and result.get("error") == "could not decode image":
+        raise HTTPException(status_code=400, detail=result["error"])
+    return result
+
+
+@app.get("/commands/{command_id}")
+def command_status(command_id: str):
+    command = get_door_executor().get(command_id)
+    if command is None:
+        raise HTTPException(status_code=404, detail="command not found")
+    return command.to_dict()
+
+
+# Mounted last: routes above (e.g. /media/{event_id}/{variant}) take precedence.
+app.mount("/media", StaticFiles(directory=EVENT_MEDIA_DIR), name="media")
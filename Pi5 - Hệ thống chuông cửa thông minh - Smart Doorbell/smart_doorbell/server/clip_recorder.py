@@ -0,0 +1,254 @@
+import os
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+try:
+    from config import (
+        CLIP_ENABLED,
+        CLIP_PRE_SEC,
+        CLIP_POST_SEC,
+        CLIP_FPS,
+        CLIP_MAX_WIDTH,
+        CLIP_JPEG_QUALITY,
+        CLIP_RING_MB,
+        CLIP_FOURCC,
+        CLIP_EXT,
+    )
+except Exception:
+    CLIP_ENABLED = True
+    CLIP_PRE_SEC = 5.0
+    CLIP_POST_SEC = 5.0
+    CLIP_FPS = 8.0
+    CLIP_MAX_WIDTH = 640
+    CLIP_JPEG_QUALITY = 70
+    CLIP_RING_MB = 16.0
+    CLIP_FOURCC = "mp4v"
+    CLIP_EXT = ".mp4"
+
+
+class ClipRecorder:
+    """Pre/post-roll clips around events.
+
+    ``push(frame, ts)`` is called for every captured frame (runtime frame
+    listener). It only rate-limits to ``fps`` and hands the frame to the
+    ring thread, which downscales and JPEG-encodes it into a ring bounded by
+    both age and bytes. ``request(path, ts)`` asks for a clip covering
+    ``[ts - pre_sec, ts + post_sec]``; once the post-roll is in the ring the
+    frames are passed to a writer thread that produces the video file.
+    """
+
+    def __init__(self, pre_sec=CLIP_PRE_SEC, post_sec=CLIP_POST_SEC, fps=CLIP_FPS,
+                 max_width=CLIP_MAX_WIDTH, quality=CLIP_JPEG_QUALITY, ring_mb=CLIP_RING_MB,
+                 fourcc=CLIP_FOURCC):
+        self.pre_sec = max(0.0, float(pre_sec))
+        self.post_sec = max(0.0, float(post_sec))
+        self.fps = max(1.0, float(fps))
+        self.max_width = max(160, int(max_width))
+        self.quality = max(30, min(95, int(quality)))
+        self.ring_bytes = max(1, int(float(ring_mb) * 1024 * 1024))
+        self.fourcc = str(fourcc or "mp4v")[:4]
+        self._min_gap = 1.0 / self.fps
+        self._last_push = 0.0
+        self._inbox = deque(maxlen=2)
+        self._ring = deque()
+        self._ring_size = 0
+        self._jobs = []
+        self._writes = deque()
+        self._cond = threading.Condition()
+        self._write_cond = threading.Condition()
+        self._stop = False
+        self._writer_stop = False
+        self.frames_dropped = 0
+        self.clips_written = 0
+        self._ring_thread = threading.Thread(target=self._ring_loop, name="clip-ring", daemon=True)
+        self._writer_thread = threading.Thread(target=self._writer_loop, name="clip-writer", daemon=True)
+        self._ring_thread.start()
+        self._writer_thread.start()
+
+    # ------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------
+    def push(self, frame, ts=None):
+        ts = time.time() if ts is None else ts
+        if ts - self._last_push < self._min_gap:
+            return
+        self._last_push = ts
+        with self._cond:
+            if len(self._inbox) == self._inbox.maxlen:
+                self.frames_dropped += 1
+            # Frames from read_frame() are fresh arrays; keep a reference, no copy.
+            self._inbox.append((ts, frame))
+            self._cond.notify()
+
+    def request(self, path, ts=None):
+        ts = time.time() if ts is None else ts
+        with self._cond:
+            self._jobs.append((ts - self.pre_sec, ts + self.post_sec, path))
+            self._cond.notify()
+
+    # ------------------------------------------------------------
+    # Ring thread: downscale + encode, hand finished jobs to the writer
+    # ------------------------------------------------------------
+    def _encode(self, frame):
+        h, w = frame.shape[:2]
+        if w > self.max_width:
+            scale = self.max_width / float(w)
+            frame = cv2.resize(frame, (self.max_width, max(2, int(h * scale)) & ~1), interpolation=cv2.INTER_AREA)
+        ok, buf = cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), self.quality])
+        return buf.tobytes() if ok else None
+
+    def _ring_loop(self):
+        while True:
+            with self._cond:
+                if not self._stop and not self._inbox:
+                    # Wake at least twice a second so pending clips time out even without frames.
+                    self._cond.wait(timeout=0.5)
+                if self._stop:
+                    return
+                item = self._inbox.popleft() if self._inbox else None
+            if item is not None:
+                ts, frame = item
+                data = self._encode(frame)
+                if data:
+                    self._ring.append((ts, data))
+                    self._ring_size += len(data)
+                self._trim()
+            self._dispatch(time.time())
+
+    def _trim(self):
+        horizon = time.time() - (self.pre_sec + self.post_sec + 5.0)
+        while self._ring and (self._ring_size > self.ring_bytes or self._ring[0][0] < horizon):
+            _, data = self._ring.popleft()
+            self._ring_size -= len(data)
+
+    def _dispatch(self, now):
+        with self._cond:
+            jobs = list(self._jobs)
+        ready = []
+        for job in jobs:
+            start, end, path = job
+            newest = self._ring[-1][0] if self._ring else 0.0
+            # Done when the post-roll is buffered, or give up waiting after a grace period
+            # (camera stalled / idle) and write what there is.
+            if newest >= end or now >= end + 3.0:
+                ready.append(job)
+        if not ready:
+            return
+        with self._cond:
+            for job in ready:
+                if job in self._jobs:
+                    self._jobs.remove(job)
+        for start, end, path in ready:
+            frames = [data for ts, data in self._ring if start <= ts <= end]
+            with self._write_cond:
+                self._writes.append((path, frames))
+                self._write_cond.notify()
+
+    # ------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------
+    def _writer_loop(self):
+        while True:
+            with self._write_cond:
+                while not self._writes and not self._writer_stop:
+                    self._write_cond.wait(timeout=1.0)
+                if not self._writes:
+                    return
+                path, frames = self._writes.popleft()
+            try:
+                if self._write_clip(path, frames):
+                    self.clips_written += 1
+            except Exception as exc:
+                print(f"[ClipRecorder] write failed {path}: {exc}")
+
+    def _write_clip(self, path, frames):
+        if not frames:
+            print(f"[ClipRecorder] no frames buffered for {os.path.basename(path)}")
+            return False
+        first = cv2.imdecode(np.frombuffer(frames[0], dtype=np.uint8), cv2.IMREAD_COLOR)
+        if first is None:
+            return False
+        h, w = first.shape[:2]
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        root, ext = os.path.splitext(path)
+        tmp = f"{root}.tmp{ext}"
+        writer = cv2.VideoWriter(tmp, cv2.VideoWriter_fourcc(*self.fourcc), self.fps, (w, h))
+        if not writer.isOpened():
+            print(f"[ClipRecorder] VideoWriter({self.fourcc}) unavailable")
+            return False
+        try:
+            for data in frames:
+                img = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+                if img is None:
+                    continue
+                if img.shape[:2] != (h, w):
+                    img = cv2.resize(img, (w, h))
+                writer.write(img)
+        finally:
+            writer.release()
+        os.replace(tmp, path)
+        return True
+
+    def stats(self):
+        return {
+            "ringFrames": len(self._ring),
+            "ringBytes": self._ring_size,
+            "pendingClips": len(self._jobs) + len(self._writes),
+            "clipsWritten": self.clips_written,
+            "framesDropped": self.frames_dropped,
+        }
+
+    def close(self, timeout=5.0):
+        # Stop the ring first so it is safe to read, write pending clips with what is
+        # buffered, then let the writer drain and exit.
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+        self._ring_thread.join(timeout)
+        self._dispatch(float("inf"))
+        with self._write_cond:
+            self._writer_stop = True
+            self._write_cond.notify_all()
+        self._writer_thread.join(timeout)
+
+
+_recorder = None
+_recorder_lock = threading.Lock()
+
+
+def get_clip_recorder():
+    return _recorder
+
+
+def attach_clip_recorder(runtime, store=None):
+    """Create the shared recorder, feed it from ``runtime`` and let ``store`` request clips."""
+    global _recorder
+    if not CLIP_ENABLED or runtime is None:
+        return None
+    with _recorder_lock:
+        if _recorder is None:
+            _recorder = ClipRecorder()
+        recorder = _recorder
+    try:
+        runtime.add_frame_listener(recorder.push)
+    except Exception as exc:
+        print(f"[ClipRecorder] runtime has no frame listeners: {exc}")
+        return None
+    if store is None:
+        try:
+            from server.event_store import get_event_store
+
+            store = get_event_store()
+        except Exception:
+            store = None
+    if store is not None:
+        store.clip_recorder = recorder
+    return recorder
+
+
+def clip_extension():
+    return CLIP_EXT if str(CLIP_EXT).startswith(".") else "." + str(CLIP_EXT)
@@ -1,3 +1,15 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+
+from metrics import get_metrics
+
+try:
+    from config import DOOR_COMMAND_HISTORY
+except Exception:
+    DOOR_COMMAND_HISTORY = 256
+
 _door_controller = None
 
 
@@ -8,3 +20,230 @@ def set_door_controller(controller):
 
 def get_door_controller():
     return _door_controller
+
+
+_runtime = None
+
+
+def set_runtime(runtime):
+    global _runtime
+    _runtime = runtime
+
+
+def get_runtime():
+    return _runtime
+
+
+class DoorCommand:
+    __slots__ = (
+        "id", "action", "key", "source", "request_event_id", "status", "ok", "message",
+        "extra", "coalesced", "requesters", "created", "started", "finished", "fn", "callbacks", "notify", "done",
+    )
+
+    def __init__(self, action, fn, key=None, source=None, request_event_id=None, notify=True):
+        self.id = f"cmd_{uuid.uuid4().hex[:10]}"
+        self.action = action
+        self.key = key or action
+        self.source = source
+        self.request_event_id = request_event_id
+        self.status = "queued"
+        self.ok = None
+        self.message = ""
+        self.extra = {}
+        self.coalesced = 0
+        # Every caller folded into this command, first one included: {"source", "eventId"}.
+        self.requesters = [{"source": source, "eventId": request_event_id}]
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.fn = fn
+        self.callbacks = []
+        self.notify = notify
+        self.done = threading.Event()
+
+    def to_dict(self):
+        out = {
+            "commandId": self.id,
+            "action": self.action,
+            "status": self.status,
+            "ok": self.ok,
+            "message": self.message,
+            "source": self.source,
+            "eventId": self.request_event_id,
+            "coalesced": self.coalesced,
+            "requesters": list(self.requesters),
+            "createdAt": self.created,
+            "startedAt": self.started,
+            "finishedAt": self.finished,
+        }
+        out.update(self.extra)
+        return out
+
+
+class DoorCommandExecutor:
+    """Single worker thread that runs every door action in order.
+
+    API handlers, GUI buttons and the face policy submit commands instead of
+    touching the controller themselves, so the servo / light / LCD / sound
+    sequence never interleaves and callers never block on the controller
+    lock. A command identical to the one still waiting at the tail of the
+    queue (same ``key``) is coalesced into it: the newer ``fn`` replaces the
+    queued one, both callers get the same command id and the newer caller is
+    added to ``requesters``. ``on_done`` callbacks are kept once each (pass
+    the same function, not a per-request closure, to log/push once per
+    executed command). ``notify=False``
+    marks internal commands (the per-frame face policy): they are neither
+    pushed to clients nor kept for ``GET /commands/{id}``.
+    """
+
+    def __init__(self, history=DOOR_COMMAND_HISTORY):
+        self._cond = threading.Condition()
+        self._queue = deque()
+        self._history = OrderedDict()
+        self._history_size = max(16, int(history))
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="door-commands", daemon=True)
+        self._thread.start()
+
+    def submit(self, action, fn, key=None, source=None, request_event_id=None, on_done=None, notify=True):
+        with self._cond:
+            if self._closed:
+                return None
+            tail = self._queue[-1] if self._queue else None
+            if tail is not None and tail.key == (key or action):
+                tail.fn = fn
+                tail.coalesced += 1
+                tail.requesters.append({"source": source, "eventId": request_event_id})
+                command = tail
+            else:
+                command = DoorCommand(action, fn, key=key, source=source,
+                                      request_event_id=request_event_id, notify=notify)
+                self._queue.append(command)
+                if notify:
+                    self._remember(command)
+                self._cond.notify()
+            if on_done is not None and on_done not in command.callbacks:
+                command.callbacks.append(on_done)
+            return command
+
+    def _remember(self, command):
+        self._history[command.id] = command
+        while len(self._history) > self._history_size:
+            self._history.popitem(last=False)
+
+    def get(self, command_id):
+        with self._cond:
+            return self._history.get(command_id)
+
+    def wait(self, command, timeout=None):
+        if command is not None:
+            command.done.wait(timeout)
+        return command
+
+    def pending(self):
+        with self._cond:
+            return len(self._queue)
+
+    def _run(self):
+        metrics = get_metrics()
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                command = self._queue.popleft()
+                command.status = "running"
+                command.started = time.time()
+            metrics.observe("door_queue_wait", (command.started - command.created) * 1000.0)
+            try:
+                with metrics.timer("door_command"):
+                    # fn returns (ok, message, extra dict merged into the command's JSON).
+                    ok, message, extra = command.fn()
+                command.ok = bool(ok)
+                command.message = message or ""
+                command.extra = dict(extra or {})
+                command.status = "done"
+            except Exception as exc:
+                command.ok = False
+                command.message = str(exc)
+                command.status = "failed"
+            command.finished = time.time()
+            command.fn = None
+            command.done.set()
+            for callback in command.callbacks:
+                try:
+                    callback(command)
+                except Exception as exc:
+                    print(f"[DoorCommand] callback failed: {exc}")
+            if command.notify:
+                try:
+                    from server.push import get_push_hub
+
+                    get_push_hub().publish("command", command.to_dict())
+                except Exception:
+                    pass
+
+    def close(self, timeout=2.0):
+        """Run what is queued, then stop the worker."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+
+def unlock_command(door):
+    def run():
+        if door is None:
+            return False, "door unavailable", {"lightOk": False}
+        ok, message = door.open_and_close()
+        try:
+            light_ok = door.set_light_state(True)
+        except Exception:
+            light_ok = False
+        return ok, message, {"lightOk": light_ok}
+
+    return run
+
+
+def lock_command(door):
+    def run():
+        if door is None:
+            return False, "door unavailable", {"lightOk": False}
+        door.close()
+        try:
+            light_ok = door.set_light_state(False)
+        except Exception:
+            light_ok = False
+        return True, "door closed", {"lightOk": light_ok}
+
+    return run
+
+
+def face_policy_command(door, result, force_require_known=False):
+    """door.handle_result(result); with an empty face DB only known faces may open."""
+    def run():
+        original = getattr(door, "require_known", False)
+        if force_require_known:
+            door.require_known = True
+        try:
+            opened = door.handle_result(result)
+        finally:
+            if force_require_known:
+                door.require_known = original
+        return True, "", {"present": bool(opened)}
+
+    return run
+
+
+_door_executor = None
+_door_executor_lock = threading.Lock()
+
+
+def get_door_executor():
+    global _door_executor
+    with _door_executor_lock:
+        if _door_executor is None:
+            _door_executor = DoorCommandExecutor()
+        return _door_executor
@@ -0,0 +1,125 @@
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+try:
+    from config import (
+        EVENT_DEDUP_WINDOW_SEC,
+        EVENT_DEDUP_HASH_DISTANCE,
+        EVENT_DEDUP_MIN_SIMILARITY,
+    )
+except Exception:
+    EVENT_DEDUP_WINDOW_SEC = 60.0
+    EVENT_DEDUP_HASH_DISTANCE = 10
+    EVENT_DEDUP_MIN_SIMILARITY = 0.8
+
+FACE_MARGIN = 0.15
+
+
+def _crop(image_bgr, bbox):
+    if bbox is None:
+        return image_bgr
+    try:
+        x1, y1, x2, y2 = (int(v) for v in bbox)
+    except Exception:
+        return image_bgr
+    h, w = image_bgr.shape[:2]
+    mx = int((x2 - x1) * FACE_MARGIN)
+    my = int((y2 - y1) * FACE_MARGIN)
+    x1, y1 = max(0, x1 - mx), max(0, y1 - my)
+    x2, y2 = min(w, x2 + mx), min(h, y2 + my)
+    if x2 - x1 < 8 or y2 - y1 < 8:
+        return image_bgr
+    return image_bgr[y1:y2, x1:x2]
+
+
+def dhash(image_bgr, bbox=None, size=8):
+    """64-bit difference hash of the face crop (whole frame without a bbox)."""
+    img = _crop(image_bgr, bbox)
+    # Shrink first: converting a 9x8 image is cheaper than a full frame.
+    small = cv2.resize(img, (size + 1, size), interpolation=cv2.INTER_AREA)
+    if small.ndim == 3:
+        small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    value = 0
+    for bit in bits:
+        value = (value << 1) | int(bit)
+    return value
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+def _unit(embedding):
+    if embedding is None:
+        return None
+    try:
+        vec = np.asarray(embedding, dtype=np.float32).reshape(-1)
+    except Exception:
+        return None
+    norm = float(np.linalg.norm(vec))
+    if not vec.size or norm <= 1e-6:
+        return None
+    return vec / norm
+
+
+class EventDeduper:
+    """Find a recent event that a new snapshot merely repeats.
+
+    An event matches when it has the same type and person, was last seen
+    within ``window_sec``, its dHash differs by at most ``max_distance``
+    bits, and (when both sides have a face embedding) the cosine similarity
+    is at least ``min_similarity``. The window slides: every coalesced
+    repeat extends it, so a visitor who lingers stays one event.
+    """
+
+    def __init__(self, window_sec=EVENT_DEDUP_WINDOW_SEC, max_distance=EVENT_DEDUP_HASH_DISTANCE,
+                 min_similarity=EVENT_DEDUP_MIN_SIMILARITY):
+        self.window_sec = max(0.0, float(window_sec))
+        self.max_distance = max(0, int(max_distance))
+        self.min_similarity = float(min_similarity)
+        self._lock = threading.Lock()
+        # [last_seen, event_id, type, person, hash, unit embedding]
+        self._recent = deque(maxlen=64)
+        self.coalesced = 0
+
+    def fingerprint(self, image_bgr, bbox=None, embedding=None):
+        return dhash(image_bgr, bbox), _unit(embedding)
+
+    def _expire(self, now):
+        while self._recent and now - self._recent[0][0] > self.window_sec:
+            self._recent.popleft()
+
+    def match(self, event_type, person_name, fingerprint, now=None):
+        """Return the eventId to coalesce into (and refresh its window), or None."""
+        now = time.time() if now is None else now
+        phash, emb = fingerprint
+        with self._lock:
+            self._expire(now)
+            for pos in range(len(self._recent) - 1, -1, -1):
+                entry = self._recent[pos]
+                _, event_id, etype, person, other_hash, other_emb = entry
+                if etype != event_type or person != person_name:
+                    continue
+                if hamming(phash, other_hash) > self.max_distance:
+                    continue
+                if emb is not None and other_emb is not None and emb.shape == other_emb.shape:
+                    if float(np.dot(emb, other_emb)) < self.min_similarity:
+                        continue
+                entry[0] = now
+                # Keep the deque ordered by last_seen so _expire can stop at the first fresh entry.
+                del self._recent[pos]
+                self._recent.append(entry)
+                self.coalesced += 1
+                return event_id
+        return None
+
+    def remember(self, event, fingerprint, now=None):
+        now = time.time() if now is None else now
+        phash, emb = fingerprint
+        with self._lock:
+            self._recent.append([now, event.get("eventId"), event.get("type"), event.get("personName"), phash, emb])
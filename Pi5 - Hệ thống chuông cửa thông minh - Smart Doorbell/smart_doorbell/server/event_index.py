@@ -0,0 +1,353 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+try:
+    from config import EVENT_INDEX_PATH, EVENT_LOG_PATH
+except Exception:
+    EVENT_INDEX_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs", "events.sqlite3")
+    EVENT_LOG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs", "events.jsonl")
+
+_TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id TEXT NOT NULL UNIQUE,
+    ts REAL NOT NULL,
+    type TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    person TEXT,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_ts ON events(ts);
+CREATE INDEX IF NOT EXISTS events_type_ts ON events(type, ts);
+CREATE INDEX IF NOT EXISTS events_person_ts ON events(person COLLATE NOCASE, ts);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def parse_time(value):
+    """Epoch seconds, or ISO-8601 / 'YYYY-mm-dd HH:MM:SS' (naive = local time)."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip()
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    if text.endswith("Z"):
+        text = text[:-1] + "+00:00"
+    try:
+        return datetime.fromisoformat(text).timestamp()
+    except ValueError:
+        raise ValueError(f"invalid time: {value!r}")
+
+
+def _event_ts(event):
+    try:
+        return time.mktime(time.strptime(event.get("timestamp", ""), _TS_FORMAT))
+    except Exception:
+        return time.time()
+
+
+def _event_kind(event):
+    return "action" if str(event.get("eventId", "")).startswith("act_") else "event"
+
+
+class EventIndex:
+    """SQLite index over the event log.
+
+    ``logs/events.jsonl`` stays the source of truth: at startup the index
+    ingests whatever the log gained since the last recorded byte offset (or
+    everything, if the log was truncated/rotated or the DB is new). Rows are
+    keyed by eventId, so re-ingesting a line is a no-op.
+    """
+
+    def __init__(self, path=EVENT_INDEX_PATH, log_path=EVENT_LOG_PATH):
+        self.path = path
+        self.log_path = log_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = self._open()
+
+    def _open(self):
+        try:
+            conn = self._connect()
+            conn.execute("SELECT 1 FROM events LIMIT 1")
+            return conn
+        except sqlite3.DatabaseError as exc:
+            # Corrupt index: it is derived data, rebuild it from the log.
+            print(f"[EventIndex] rebuilding {self.path}: {exc}")
+            for suffix in ("", "-wal", "-shm"):
+                try:
+                    os.remove(self.path + suffix)
+                except OSError:
+                    pass
+            return self._connect()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL: no fsync per insert; the JSONL log is the durable copy.
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        return conn
+
+    # ------------------------------------------------------------
+    # Meta
+    # ------------------------------------------------------------
+    def _get_meta(self, key, default=None):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, key, value):
+        self._conn.execute(
+            "INSERT INTO meta(key, value) VALUES(?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, str(value)),
+        )
+
+    # ------------------------------------------------------------
+    # Write
+    # ------------------------------------------------------------
+    @staticmethod
+    def _row(event):
+        return (
+            str(event.get("eventId")),
+            _event_ts(event),
+            str(event.get("type") or ""),
+            _event_kind(event),
+            event.get("personName"),
+            json.dumps(event, ensure_ascii=True),
+        )
+
+    def add(self, event):
+        if not event or not event.get("eventId"):
+            return
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO events(event_id, ts, type, kind, person, body) VALUES(?, ?, ?, ?, ?, ?)",
+                    self._row(event),
+                )
+        except Exception as exc:
+            print(f"[EventIndex] insert failed: {exc}")
+
+    def update(self, event):
+        """Replace the stored body of an existing event (keeps its position)."""
+        if not event or not event.get("eventId"):
+            return
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "UPDATE events SET body = ? WHERE event_id = ?",
+                    (json.dumps(event, ensure_ascii=True), str(event.get("eventId"))),
+                )
+        except Exception as exc:
+            print(f"[EventIndex] update failed: {exc}")
+
+    def get(self, event_id):
+        with self._lock:
+            row = self._conn.execute("SELECT body FROM events WHERE event_id = ?", (str(event_id),)).fetchone()
+        if row is None:
+            return None
+        try:
+            return json.loads(row[0])
+        except Exception:
+            return None
+
+    def media_refs(self, older_than=None):
+        """(eventId, imageUrl) of indexed events that still point at a file."""
+        sql = "SELECT event_id, body FROM events WHERE kind = 'event'"
+        args = []
+        if older_than is not None:
+            sql += " AND ts < ?"
+            args.append(float(older_than))
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        out = []
+        for event_id, body in rows:
+            try:
+                url = json.loads(body).get("imageUrl")
+            except Exception:
+                continue
+            if url:
+                out.append((event_id, url))
+        return out
+
+    def mark_media_pruned(self, event_ids, field="imageUrl"):
+        ids = [str(i) for i in event_ids or ()]
+        if not ids:
+            return 0
+        updated = 0
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for start in range(0, len(ids), 500):
+                    chunk = ids[start:start + 500]
+                    rows = self._conn.execute(
+                        "SELECT seq, body FROM events WHERE event_id IN (%s)" % ",".join("?" * len(chunk)),
+                        chunk,
+                    ).fetchall()
+                    for seq, body in rows:
+                        event = json.loads(body)
+                        if field == "clipUrl":
+                            event.pop("clipUrl", None)
+                            event["meta"] = dict(event.get("meta") or {}, clipPruned=True)
+                        else:
+                            event["imageUrl"] = ""
+                            event.pop("thumbUrl", None)
+                            event["meta"] = dict(event.get("meta") or {}, mediaPruned=True)
+                        self._conn.execute(
+                            "UPDATE events SET body = ? WHERE seq = ?",
+                            (json.dumps(event, ensure_ascii=True), seq),
+                        )
+                        updated += 1
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return updated
+
+    def _log_ident(self):
+        # Inode + first line: changes when the log is rotated, even if the new file is already larger.
+        st = os.stat(self.log_path)
+        with open(self.log_path, "rb") as f:
+            head = f.readline(4096)
+        return f"{st.st_dev}:{st.st_ino}:{hashlib.sha1(head).hexdigest()[:16]}"
+
+    def sync_from_log(self, event_log=None):
+        """Ingest log lines appended since the last sync; returns the number read.
+
+        ``event_log`` (an EventLogReader) lets a rotated log be caught up from
+        its segments instead of only re-reading the new active file.
+        """
+        if not self.log_path or not os.path.isfile(self.log_path):
+            return 0
+        size = os.path.getsize(self.log_path)
+        ident = self._log_ident()
+        with self._lock:
+            offset = int(self._get_meta("log_offset", "0") or 0)
+            last_ident = self._get_meta("log_ident")
+            last_ts = float(self._get_meta("log_last_ts", "0") or 0)
+            rows = []
+            if last_ident is not None and last_ident != ident:
+                offset = 0
+                if event_log is not None:
+                    # Rotated since the last sync: the tail of the old file now lives in a segment.
+                    # Re-reading a little before last_ts is harmless, rows are keyed by eventId.
+                    for event in event_log.iter_events(since=last_ts - 60.0, include_active=False):
+                        if event.get("eventId"):
+                            rows.append(self._row(event))
+            if offset > size:
+                # Log was truncated or rotated underneath us.
+                offset = 0
+            with open(self.log_path, "rb") as f:
+                f.seek(offset)
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        # Partial last line (writer mid-append); pick it up next time.
+                        break
+                    offset += len(raw)
+                    try:
+                        event = json.loads(raw.decode("utf-8"))
+                    except Exception:
+                        continue
+                    if isinstance(event, dict) and event.get("eventId"):
+                        rows.append(self._row(event))
+            self._conn.execute("BEGIN")
+            try:
+                # Coalesced repeats re-log the same eventId with a higher "count"; only those replace the row.
+                self._conn.executemany(
+                    "INSERT INTO events(event_id, ts, type, kind, person, body) VALUES(?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(event_id) DO UPDATE SET body = excluded.body "
+                    "WHERE COALESCE(json_extract(excluded.body, '$.count'), 1) "
+                    "> COALESCE(json_extract(events.body, '$.count'), 1)",
+                    rows,
+                )
+                self._set_meta("log_offset", offset)
+                self._set_meta("log_ident", ident)
+                if rows:
+                    self._set_meta("log_last_ts", max(last_ts, max(row[1] for row in rows)))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    # ------------------------------------------------------------
+    # Read
+    # ------------------------------------------------------------
+    def query(self, since=None, until=None, types=None, person=None, cursor=None,
+              limit=50, include_actions=False, order="desc"):
+        """Return ``(events, next_cursor)``.
+
+        ``cursor`` is the opaque value returned by the previous page. With
+        order="desc" pages walk back in time; with "asc" they walk forward,
+        which is what an incremental poller wants.
+        """
+        clauses, args = [], []
+        since_ts = parse_time(since)
+        until_ts = parse_time(until)
+        if since_ts is not None:
+            clauses.append("ts >= ?")
+            args.append(since_ts)
+        if until_ts is not None:
+            clauses.append("ts <= ?")
+            args.append(until_ts)
+        types = [t.strip().upper() for t in (types or ()) if t and t.strip()]
+        if types:
+            clauses.append("type IN (%s)" % ",".join("?" * len(types)))
+            args.extend(types)
+        elif not include_actions:
+            clauses.append("kind = 'event'")
+        if person:
+            clauses.append("person = ? COLLATE NOCASE")
+            args.append(person)
+        ascending = str(order).lower() == "asc"
+        if cursor not in (None, ""):
+            try:
+                seq = int(cursor)
+            except ValueError:
+                raise ValueError(f"invalid cursor: {cursor!r}")
+            clauses.append("seq > ?" if ascending else "seq < ?")
+            args.append(seq)
+        limit = max(1, int(limit))
+        sql = "SELECT seq, body FROM events"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY seq " + ("ASC" if ascending else "DESC") + " LIMIT ?"
+        args.append(limit + 1)
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        more = len(rows) > limit
+        rows = rows[:limit]
+        events = []
+        for _, body in rows:
+            try:
+                events.append(json.loads(body))
+            except Exception:
+                continue
+        if ascending:
+            # Forward polling always gets a resume point, even on the last page.
+            next_cursor = str(rows[-1][0]) if rows else (str(cursor) if cursor not in (None, "") else None)
+        else:
+            next_cursor = str(rows[-1][0]) if more and rows else None
+        return events, next_cursor
+
+    def latest(self, limit=50):
+        events, _ = self.query(limit=limit)
+        return events
+
+    def close(self):
+        with self._lock:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
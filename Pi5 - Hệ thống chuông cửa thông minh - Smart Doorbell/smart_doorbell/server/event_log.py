@@ -0,0 +1,467 @@
+import glob
+import gzip
+import json
+import os
+import threading
+import time
+from collections import deque
+
+try:
+    from config import (
+        EVENT_LOG_PATH,
+        EVENT_LOG_ROTATE_MB,
+        EVENT_LOG_ROTATE_HOURS,
+        EVENT_LOG_KEEP_SEGMENTS,
+    )
+except Exception:
+    EVENT_LOG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs", "events.jsonl")
+    EVENT_LOG_ROTATE_MB = 8.0
+    EVENT_LOG_ROTATE_HOURS = 24.0
+    EVENT_LOG_KEEP_SEGMENTS = 90
+
+_TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+# Lines per gzip member; a time-window read decompresses whole members only.
+MEMBER_LINES = 256
+_TAIL_BLOCK = 8192
+
+
+def event_ts(event, default=None):
+    try:
+        return time.mktime(time.strptime(event.get("timestamp", ""), _TS_FORMAT))
+    except Exception:
+        return default
+
+
+def _parse_line(raw):
+    try:
+        event = json.loads(raw.decode("utf-8") if isinstance(raw, bytes) else raw)
+    except Exception:
+        return None
+    return event if isinstance(event, dict) else None
+
+
+def _in_window(ts, since, until):
+    if ts is None:
+        return since is None and until is None
+    return (since is None or ts >= since) and (until is None or ts <= until)
+
+
+def compress_segment(src, member_lines=MEMBER_LINES):
+    """Turn a closed ``.jsonl`` segment into ``.jsonl.gz`` + ``.jsonl.idx`` and delete it.
+
+    The .gz is a concatenation of independent gzip members (``zcat`` still
+    reads it as one file). The sidecar lists, per member,
+    ``[first_ts, last_ts, offset, length, lines]`` so readers can seek straight
+    to the members that overlap a time window.
+    """
+    dst = src + ".gz"
+    tmp = dst + ".tmp"
+    members = []
+    count = 0
+    last_ts = None
+    with open(src, "rb") as fin, open(tmp, "wb") as fout:
+        batch, first, hi = [], None, None
+
+        def flush_batch():
+            blob = gzip.compress(b"".join(batch), compresslevel=6, mtime=0)
+            members.append([first, hi, fout.tell(), len(blob), len(batch)])
+            fout.write(blob)
+
+        for raw in fin:
+            if not raw.strip():
+                continue
+            if not raw.endswith(b"\n"):
+                raw += b"\n"
+            event = _parse_line(raw)
+            ts = event_ts(event, last_ts) if event is not None else last_ts
+            last_ts = ts
+            if not batch:
+                first = ts
+            if ts is not None:
+                hi = ts if hi is None else max(hi, ts)
+                if first is None:
+                    first = ts
+            batch.append(raw)
+            count += 1
+            if len(batch) >= member_lines:
+                flush_batch()
+                batch, first, hi = [], None, None
+        if batch:
+            flush_batch()
+        fout.flush()
+        os.fsync(fout.fileno())
+    os.replace(tmp, dst)
+    starts = [m[0] for m in members if m[0] is not None]
+    ends = [m[1] for m in members if m[1] is not None]
+    sidecar = {
+        "version": 1,
+        "segment": os.path.basename(dst),
+        "firstTs": min(starts) if starts else None,
+        "lastTs": max(ends) if ends else None,
+        "lines": count,
+        "members": members,
+    }
+    idx_path = src + ".idx"
+    with open(idx_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(sidecar, f)
+    os.replace(idx_path + ".tmp", idx_path)
+    os.remove(src)
+    return dst
+
+
+class EventLogReader:
+    """Read-only view over the active log and its rotated segments.
+
+    Segments are ``<stem>-YYYYmmdd-HHMMSS-NN.jsonl.gz`` (with a ``.jsonl.idx``
+    sidecar), or plain ``.jsonl`` while still waiting for compression.
+    Nothing here loads a whole file: windows are read member by member and
+    ``tail()`` reads the active file backwards in small blocks.
+    """
+
+    def __init__(self, path=EVENT_LOG_PATH):
+        self.path = path
+        self.dir = os.path.dirname(path) or "."
+        base = os.path.basename(path)
+        self.stem = base[:-len(".jsonl")] if base.endswith(".jsonl") else base
+
+    # ------------------------------------------------------------
+    # Segments
+    # ------------------------------------------------------------
+    def _pending_segments(self):
+        pattern = os.path.join(glob.escape(self.dir), glob.escape(self.stem) + "-*.jsonl")
+        return sorted(glob.glob(pattern))
+
+    def segments(self):
+        """Closed segments, oldest first, as ``(path, sidecar or None)``."""
+        pattern = os.path.join(glob.escape(self.dir), glob.escape(self.stem) + "-*.jsonl")
+        paths = set(glob.glob(pattern)) | set(glob.glob(pattern + ".gz"))
+        out = []
+        # Stamps are zero-padded, so name order is time order.
+        for path in sorted(paths, key=lambda p: p[:-3] if p.endswith(".gz") else p):
+            if path.endswith(".gz"):
+                if path[:-3] in paths:
+                    # Compression finished but the source is not deleted yet: read the source.
+                    continue
+                out.append((path, self._load_sidecar(path[:-3] + ".idx")))
+            else:
+                out.append((path, None))
+        return out
+
+    @staticmethod
+    def _load_sidecar(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return None
+
+    # ------------------------------------------------------------
+    # Time window
+    # ------------------------------------------------------------
+    def iter_events(self, since=None, until=None, include_active=True):
+        """Yield events with ``since <= ts <= until`` (epoch seconds), oldest segment first."""
+        for path, sidecar in self.segments():
+            if sidecar is not None:
+                first, last = sidecar.get("firstTs"), sidecar.get("lastTs")
+                if since is not None and last is not None and last < since:
+                    continue
+                if until is not None and first is not None and first > until:
+                    continue
+            for event in self._iter_segment(path, sidecar, since, until):
+                yield event
+        if include_active:
+            for event in self._iter_plain(self.path, since, until):
+                yield event
+
+    def _iter_segment(self, path, sidecar, since, until):
+        if not path.endswith(".gz"):
+            try:
+                f = open(path, "rb")
+            except FileNotFoundError:
+                # Compressed underneath us.
+                path, sidecar = path + ".gz", self._load_sidecar(path + ".idx")
+            else:
+                with f:
+                    for event in self._filter_lines(f, since, until):
+                        yield event
+                return
+        if sidecar is None:
+            try:
+                with gzip.open(path, "rb") as f:
+                    for event in self._filter_lines(f, since, until):
+                        yield event
+            except (OSError, EOFError):
+                return
+            return
+        try:
+            f = open(path, "rb")
+        except OSError:
+            return
+        with f:
+            for first, last, offset, length, _ in sidecar.get("members") or ():
+                if since is not None and last is not None and last < since:
+                    continue
+                if until is not None and first is not None and first > until:
+                    continue
+                f.seek(offset)
+                try:
+                    data = gzip.decompress(f.read(length))
+                except (OSError, EOFError):
+                    continue
+                for event in self._filter_lines(data.splitlines(), since, until):
+                    yield event
+
+    def _iter_plain(self, path, since, until):
+        try:
+            f = open(path, "rb")
+        except OSError:
+            return
+        with f:
+            for event in self._filter_lines(f, since, until):
+                yield event
+
+    @staticmethod
+    def _filter_lines(lines, since, until):
+        for raw in lines:
+            if not raw.strip():
+                continue
+            event = _parse_line(raw)
+            if event is None:
+                continue
+            if since is None and until is None:
+                yield event
+            elif _in_window(event_ts(event), since, until):
+                yield event
+
+    # ------------------------------------------------------------
+    # Tail
+    # ------------------------------------------------------------
+    def tail(self, n=1):
+        """Last ``n`` events in log order, reaching into segments only if the active file is short."""
+        n = max(1, int(n))
+        out = self._tail_plain(self.path, n)
+        if len(out) >= n:
+            return out[-n:]
+        for path, sidecar in reversed(self.segments()):
+            out = self._tail_segment(path, sidecar, n - len(out)) + out
+            if len(out) >= n:
+                break
+        return out[-n:]
+
+    @staticmethod
+    def _tail_plain(path, n):
+        try:
+            f = open(path, "rb")
+        except OSError:
+            return []
+        with f:
+            f.seek(0, os.SEEK_END)
+            pos = f.tell()
+            data = b""
+            while pos > 0 and data.count(b"\n") <= n:
+                step = min(_TAIL_BLOCK, pos)
+                pos -= step
+                f.seek(pos)
+                data = f.read(step) + data
+        lines = data.splitlines()
+        if pos > 0 and lines:
+            # First line is probably cut in half.
+            lines = lines[1:]
+        events = []
+        for raw in reversed(lines):
+            event = _parse_line(raw) if raw.strip() else None
+            if event is not None:
+                events.append(event)
+                if len(events) >= n:
+                    break
+        events.reverse()
+        return events
+
+    def _tail_segment(self, path, sidecar, n):
+        if not path.endswith(".gz"):
+            if os.path.isfile(path):
+                return self._tail_plain(path, n)
+            path, sidecar = path + ".gz", self._load_sidecar(path + ".idx")
+        if sidecar is None:
+            keep = deque(maxlen=n)
+            try:
+                with gzip.open(path, "rb") as f:
+                    for event in self._filter_lines(f, None, None):
+                        keep.append(event)
+            except (OSError, EOFError):
+                pass
+            return list(keep)
+        out = []
+        try:
+            with open(path, "rb") as f:
+                for _, _, offset, length, _ in reversed(sidecar.get("members") or ()):
+                    f.seek(offset)
+                    data = gzip.decompress(f.read(length))
+                    out = list(self._filter_lines(data.splitlines(), None, None)) + out
+                    if len(out) >= n:
+                        break
+        except (OSError, EOFError):
+            pass
+        return out[-n:]
+
+
+class EventLog(EventLogReader):
+    """Append side of the event log, with size / age based rotation.
+
+    File-like (``write`` / ``flush`` / ``fileno`` / ``close``) so EventWriter
+    can use it in place of a plain file. When the active file would pass
+    ``rotate_mb`` or its first line is older than ``rotate_hours`` it is
+    renamed to a dated segment and compressed on a low-priority thread; only
+    the newest ``keep_segments`` segments are kept (0 = all).
+    """
+
+    def __init__(self, path=EVENT_LOG_PATH, rotate_mb=EVENT_LOG_ROTATE_MB,
+                 rotate_hours=EVENT_LOG_ROTATE_HOURS, keep_segments=EVENT_LOG_KEEP_SEGMENTS):
+        super().__init__(path)
+        self.rotate_bytes = max(0, int(float(rotate_mb) * 1024 * 1024))
+        self.rotate_sec = max(0.0, float(rotate_hours) * 3600.0)
+        self.keep_segments = max(0, int(keep_segments))
+        self._lock = threading.RLock()
+        self._compress_lock = threading.Lock()
+        self._f = None
+        self._size = 0
+        self._first_ts = None
+        self._closed = False
+        self.rotations = 0
+        os.makedirs(self.dir, exist_ok=True)
+        self._open_active()
+        # Segments left uncompressed by a previous run.
+        if self._pending_segments():
+            self._start_compress()
+
+    def _open_active(self):
+        self._f = open(self.path, "a", encoding="utf-8")
+        self._size = os.fstat(self._f.fileno()).st_size
+        self._first_ts = None
+        if self._size:
+            first = None
+            try:
+                with open(self.path, "rb") as f:
+                    first = _parse_line(f.readline())
+            except OSError:
+                pass
+            self._first_ts = event_ts(first) if first else None
+            if self._first_ts is None:
+                self._first_ts = os.path.getmtime(self.path)
+
+    # ------------------------------------------------------------
+    # File-like API
+    # ------------------------------------------------------------
+    def write(self, line):
+        with self._lock:
+            if self._closed:
+                raise ValueError("write to closed EventLog")
+            if self._due(len(line)):
+                self._rotate()
+            self._f.write(line)
+            self._size += len(line)
+            if self._first_ts is None:
+                self._first_ts = time.time()
+
+    def flush(self):
+        with self._lock:
+            if not self._closed:
+                self._f.flush()
+
+    def fileno(self):
+        with self._lock:
+            return self._f.fileno()
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            try:
+                self._f.close()
+            except Exception:
+                pass
+
+    def tail(self, n=1):
+        self.flush()
+        return super().tail(n)
+
+    def iter_events(self, since=None, until=None, include_active=True):
+        if include_active:
+            self.flush()
+        return super().iter_events(since, until, include_active)
+
+    # ------------------------------------------------------------
+    # Rotation
+    # ------------------------------------------------------------
+    def _due(self, incoming):
+        if not self._size:
+            return False
+        if self.rotate_bytes and self._size + incoming > self.rotate_bytes:
+            return True
+        return bool(self.rotate_sec and self._first_ts is not None and time.time() - self._first_ts >= self.rotate_sec)
+
+    def rotate(self):
+        with self._lock:
+            if not self._closed and self._size:
+                self._rotate()
+
+    def _rotate(self):
+        self._f.close()
+        # Named after the rotation time; the counter keeps name order == time order within a second.
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        i = 0
+        while True:
+            target = os.path.join(self.dir, f"{self.stem}-{stamp}-{i:02d}.jsonl")
+            if not os.path.exists(target) and not os.path.exists(target + ".gz"):
+                break
+            i += 1
+        os.replace(self.path, target)
+        self._open_active()
+        self.rotations += 1
+        self._start_compress()
+
+    def _start_compress(self):
+        threading.Thread(target=self._compress_pending, name="event-log-compress", daemon=True).start()
+
+    def _compress_pending(self):
+        if not self._compress_lock.acquire(blocking=False):
+            # Another pass is running; it re-lists pending segments before exiting.
+            return
+        try:
+            try:
+                from server.retention import lower_thread_priority
+
+                lower_thread_priority()
+            except Exception:
+                pass
+            while True:
+                pending = self._pending_segments()
+                if not pending:
+                    break
+                for path in pending:
+                    try:
+                        compress_segment(path)
+                    except Exception as exc:
+                        print(f"[EventLog] compress failed {os.path.basename(path)}: {exc}")
+                        return
+            self._drop_old_segments()
+        finally:
+            self._compress_lock.release()
+
+    def _drop_old_segments(self):
+        if not self.keep_segments:
+            return
+        closed = [path for path, _ in self.segments()]
+        for path in closed[:-self.keep_segments]:
+            base = path[:-3] if path.endswith(".gz") else path
+            for victim in (path, base + ".idx"):
+                try:
+                    os.remove(victim)
+                except OSError:
+                    pass
+
+
+def read_last_event(path=EVENT_LOG_PATH):
+    events = EventLogReader(path).tail(1)
+    return events[-1] if events else None
@@ -14,17 +14,73 @@ from config import (
     EVENT_LOG_PATH,
 )
 
+try:
+    from config import EVENT_WRITER_ASYNC
+except Exception:
+    EVENT_WRITER_ASYNC = True
+
+try:
+    from config import EVENT_INDEX_ENABLED
+except Exception:
+    EVENT_INDEX_ENABLED = True
+
+try:
+    from config import EVENT_MEDIA_SHARDED
+except Exception:
+    EVENT_MEDIA_SHARDED = True
+
+try:
+    from config import EVENT_LOG_ROTATE_ENABLED
+except Exception:
+    EVENT_LOG_ROTATE_ENABLED = True
+
+try:
+    from config import EVENT_DEDUP_ENABLED
+except Exception:
+    EVENT_DEDUP_ENABLED = True
+
+try:
+    from config import CLIP_EVENT_TYPES
+except Exception:
+    CLIP_EVENT_TYPES = ("RING", "UNKNOWN")
+
+
+class EventIndexUnavailable(Exception):
+    """A filtered / paged query needs the SQLite index, which is disabled or failed to open."""
+
 
 class EventStore:
-    def __init__(self, media_dir, max_items=200, log_enabled=True, log_path=""):
+    def __init__(self, media_dir, max_items=200, log_enabled=True, log_path="", writer=None, index=None,
+                 event_log=None, deduper=None):
         self.media_dir = media_dir
+        # Optional EventWriter; without one, writes happen on the caller's thread.
+        self.writer = writer
+        # Optional EventLog (rotating, compressed segments) in place of a plain append to log_path.
+        self.event_log = event_log
+        if writer is not None and event_log is not None:
+            writer.attach_file(log_path, event_log)
+        # Optional EventDeduper; repeats are folded into the earlier event instead of being stored.
+        self.deduper = deduper
+        # Optional EventIndex (SQLite); persists events + actions across restarts.
+        self.index = index
         self.max_items = max_items
         self.log_enabled = bool(log_enabled)
         self.log_path = log_path
         self._lock = threading.Lock()
         self._events = []
         self._last_image_url = ""
+        self._listeners = []
+        self._action_listeners = []
+        # Optional ClipRecorder (server/clip_recorder.py), set by attach_clip_recorder().
+        self.clip_recorder = None
         self._ensure_media_dir()
+        if self.index is not None:
+            try:
+                self._events = self.index.latest(self.max_items or 200)
+                if self._events:
+                    self._last_image_url = self._events[0].get("imageUrl") or ""
+            except Exception as exc:
+                print(f"[EventStore] could not load recent events: {exc}")
 
     def _ensure_media_dir(self):
         os.makedirs(self.media_dir, exist_ok=True)
@@ -37,23 +93,57 @@ class EventStore:
     def _append_log(self, event):
         if not self.log_enabled or not self.log_path:
             return
+        line = json.dumps(event, ensure_ascii=True) + "\n"
+        if self.writer is not None and self.writer.append_line(self.log_path, line):
+            return
+        if self.event_log is not None:
+            try:
+                self.event_log.write(line)
+                self.event_log.flush()
+            except Exception:
+                pass
+            return
         self._ensure_log_dir()
         try:
             with open(self.log_path, "a", encoding="utf-8") as f:
-                f.write(json.dumps(event, ensure_ascii=True) + "\n")
+                f.write(line)
         except Exception:
             return
 
-    def add_event(self, event_type, image_bgr, person_name=None, source="gui", meta=None):
-        self._ensure_media_dir()
+    def add_event(self, event_type, image_bgr, person_name=None, source="gui", meta=None, embedding=None):
+        if image_bgr is None:
+            return None
+        fingerprint = None
+        if self.deduper is not None:
+            try:
+                fingerprint = self.deduper.fingerprint(image_bgr, (meta or {}).get("bbox"), embedding)
+                repeat_of = self.deduper.match(event_type, person_name, fingerprint)
+            except Exception as exc:
+                print(f"[EventStore] dedup failed: {exc}")
+                fingerprint, repeat_of = None, None
+            if repeat_of is not None:
+                merged = self._coalesce(repeat_of)
+                if merged is not None:
+                    return merged
         event_id = f"evt_{uuid.uuid4().hex[:8]}"
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        filename = f"{event_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jpg"
-        path = os.path.join(self.media_dir, filename)
-        try:
-            cv2.imwrite(path, image_bgr)
-        except Exception:
-            return None
+        stem = f"{event_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        if EVENT_MEDIA_SHARDED:
+            # media/YYYY/MM/DD/ keeps directories small and lets retention drop whole days.
+            stem = datetime.now().strftime("%Y/%m/%d/") + stem
+        filename = stem + ".jpg"
+        path = os.path.join(self.media_dir, *filename.split("/"))
+        if self.writer is not None:
+            # The URL is handed out now; the JPEG appears once the writer gets to it.
+            # Copy so later drawing on the caller's frame cannot leak into the snapshot.
+            if not self.writer.write_image(path, image_bgr.copy()):
+                return None
+        else:
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                cv2.imwrite(path, image_bgr)
+            except Exception:
+                return None
 
         image_url = f"{PUBLIC_BASE_URL}/media/{filename}"
         event = {
@@ -61,20 +151,94 @@ class EventStore:
             "timestamp": timestamp,
             "type": event_type,
             "imageUrl": image_url,
+            # Small rendition for list views, rendered on first request (server/media_variants.py).
+            "thumbUrl": f"{PUBLIC_BASE_URL}/media/{event_id}/thumb",
             "personName": person_name,
             "source": source,
             "meta": meta or {},
         }
+        clip_url = self._request_clip(event_type, source, stem)
+        if clip_url:
+            # The file appears once the post-roll has been recorded and encoded.
+            event["clipUrl"] = clip_url
         self._last_image_url = image_url
         self._append_log(event)
+        if self.index is not None:
+            self.index.add(event)
+        if fingerprint is not None:
+            self.deduper.remember(event, fingerprint)
 
         with self._lock:
             self._events.insert(0, event)
             if self.max_items and len(self._events) > self.max_items:
                 self._events = self._events[: self.max_items]
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(event)
+            except Exception:
+                continue
         return event
 
-    def log_action(self, action, ok, message="", source="api", request_event_id=None):
+    def _coalesce(self, event_id):
+        """Count a repeat against ``event_id``: no new snapshot, clip or listener call."""
+        last_seen = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        updated = None
+        with self._lock:
+            for i, event in enumerate(self._events):
+                if event.get("eventId") == event_id:
+                    # Replace rather than mutate: API handlers may be serializing the old dict.
+                    updated = dict(event, count=int(event.get("count") or 1) + 1, lastSeen=last_seen)
+                    self._events[i] = updated
+                    break
+        if updated is None and self.index is not None:
+            event = self.index.get(event_id)
+            if event is not None:
+                updated = dict(event, count=int(event.get("count") or 1) + 1, lastSeen=last_seen)
+        if updated is None:
+            return None
+        # Same eventId again in the log; the later line (higher count) wins when the index replays it.
+        self._append_log(updated)
+        if self.index is not None:
+            self.index.update(updated)
+        return updated
+
+    def _request_clip(self, event_type, source, stem):
+        recorder = self.clip_recorder
+        if recorder is None:
+            return None
+        if str(event_type or "").upper() not in CLIP_EVENT_TYPES and source != "button":
+            return None
+        try:
+            from server.clip_recorder import clip_extension
+
+            rel = stem + clip_extension()
+            recorder.request(os.path.join(self.media_dir, *rel.split("/")))
+        except Exception as exc:
+            print(f"[EventStore] clip request failed: {exc}")
+            return None
+        return f"{PUBLIC_BASE_URL}/media/{rel}"
+
+    def add_listener(self, callback, actions=False):
+        """Call ``callback(event)`` after each add_event (on the caller's thread).
+
+        With ``actions=True`` it is also called for UNLOCK/LOCK entries from log_action.
+        """
+        with self._lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+            if actions and callback not in self._action_listeners:
+                self._action_listeners.append(callback)
+
+    def remove_listener(self, callback):
+        with self._lock:
+            for listeners in (self._listeners, self._action_listeners):
+                try:
+                    listeners.remove(callback)
+                except ValueError:
+                    pass
+
+    def log_action(self, action, ok, message="", source="api", request_event_id=None, extra_meta=None):
         event_id = f"act_{uuid.uuid4().hex[:8]}"
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         image_url = self._last_image_url or ""
@@ -91,19 +255,161 @@ class EventStore:
                 "requestEventId": request_event_id,
             },
         }
+        if extra_meta:
+            event["meta"].update(extra_meta)
         self._append_log(event)
+        if self.index is not None:
+            self.index.add(event)
+        with self._lock:
+            listeners = list(self._action_listeners)
+        for listener in listeners:
+            try:
+                listener(event)
+            except Exception:
+                continue
         return event
 
     def list_events(self):
         with self._lock:
             return list(self._events)
 
+    def mark_media_pruned(self, event_ids, field="imageUrl"):
+        """Clear imageUrl (or clipUrl) of events whose file retention deleted."""
+        ids = set(event_ids or ())
+        if not ids:
+            return
+        with self._lock:
+            for i, event in enumerate(self._events):
+                if event.get("eventId") not in ids:
+                    continue
+                # Replace rather than mutate, as in _coalesce: the old dict may be mid-serialization.
+                updated = dict(event)
+                if field == "clipUrl":
+                    updated.pop("clipUrl", None)
+                    updated["meta"] = dict(event.get("meta") or {}, clipPruned=True)
+                else:
+                    if event.get("imageUrl") == self._last_image_url:
+                        self._last_image_url = ""
+                    updated["imageUrl"] = ""
+                    updated.pop("thumbUrl", None)
+                    updated["meta"] = dict(event.get("meta") or {}, mediaPruned=True)
+                self._events[i] = updated
+        if self.index is not None:
+            self.index.mark_media_pruned(ids, field=field)
+
+    def get_event(self, event_id):
+        with self._lock:
+            for event in self._events:
+                if event.get("eventId") == event_id:
+                    return dict(event)
+        if self.index is not None:
+            return self.index.get(event_id)
+        return None
+
+    def query_events(self, **filters):
+        """See EventIndex.query; without an index only the plain "latest N" query is served."""
+        if self.index is not None:
+            return self.index.query(**filters)
+        used = [name for name in ("since", "until", "types", "person", "cursor") if filters.get(name)]
+        if filters.get("include_actions"):
+            used.append("include_actions")
+        if str(filters.get("order") or "desc").lower() != "desc":
+            used.append("order")
+        if used:
+            # The in-memory list holds only recent events, no actions and no cursor; never return it unfiltered.
+            raise EventIndexUnavailable("event index disabled; unsupported parameters: " + ", ".join(used))
+        limit = max(1, int(filters.get("limit") or 1))
+        return self.list_events()[:limit], None
+
+    def iter_logged_events(self, since=None, until=None):
+        """Stream logged events (and actions) in [since, until] epoch seconds, across rotated segments."""
+        if self.event_log is not None:
+            return self.event_log.iter_events(since, until)
+        from server.event_log import EventLogReader
+
+        return EventLogReader(self.log_path).iter_events(since, until)
+
+    def last_logged_event(self):
+        if self.event_log is not None:
+            events = self.event_log.tail(1)
+            return events[-1] if events else None
+        if not self.log_enabled or not self.log_path:
+            return None
+        from server.event_log import read_last_event
+
+        return read_last_event(self.log_path)
+
+    def close(self):
+        """Drain pending snapshots / log lines (call on shutdown)."""
+        if self.writer is not None:
+            # Also closes the EventLog attached to it.
+            self.writer.close()
+        elif self.event_log is not None:
+            self.event_log.close()
+
+
+def _build_event_log():
+    if not EVENT_LOG_ENABLED or not EVENT_LOG_ROTATE_ENABLED:
+        return None
+    try:
+        from server.event_log import EventLog
+
+        return EventLog(EVENT_LOG_PATH)
+    except Exception as exc:
+        print(f"[EventStore] log rotation unavailable, appending to {EVENT_LOG_PATH}: {exc}")
+        return None
+
+
+def _build_index(event_log=None):
+    if not EVENT_INDEX_ENABLED or not EVENT_LOG_ENABLED:
+        return None
+    try:
+        from server.event_index import EventIndex
+
+        index = EventIndex(log_path=EVENT_LOG_PATH)
+        added = index.sync_from_log(event_log)
+        if added:
+            print(f"[EventIndex] indexed {added} log line(s)")
+        return index
+    except Exception as exc:
+        print(f"[EventStore] event index unavailable: {exc}")
+        return None
+
+
+def _build_deduper():
+    if not EVENT_DEDUP_ENABLED:
+        return None
+    try:
+        from server.dedup import EventDeduper
+
+        return EventDeduper()
+    except Exception as exc:
+        print(f"[EventStore] event dedup unavailable: {exc}")
+        return None
+
+
+def _build_writer():
+    if not EVENT_WRITER_ASYNC:
+        return None
+    try:
+        from server.event_writer import EventWriter
+
+        return EventWriter()
+    except Exception as exc:
+        print(f"[EventStore] async writer unavailable, writing inline: {exc}")
+        return None
+
 
+_event_log = _build_event_log()
 _event_store = EventStore(
     EVENT_MEDIA_DIR,
     EVENT_MAX_ITEMS,
     log_enabled=EVENT_LOG_ENABLED,
     log_path=EVENT_LOG_PATH,
+    writer=_build_writer(),
+    index=_build_index(_event_log),
+    event_log=_event_log,
+    deduper=_build_deduper(),
 )
 
 
@@ -0,0 +1,186 @@
+import atexit
+import os
+import threading
+import time
+from collections import deque
+
+import cv2
+
+try:
+    from config import (
+        EVENT_WRITER_QUEUE,
+        EVENT_WRITER_FLUSH_SEC,
+        EVENT_WRITER_FSYNC_SEC,
+    )
+except Exception:
+    EVENT_WRITER_QUEUE = 8
+    EVENT_WRITER_FLUSH_SEC = 1.0
+    EVENT_WRITER_FSYNC_SEC = 5.0
+
+
+def write_image_atomic(path, image_bgr):
+    # Write next to the target and rename, so /media never serves half a JPEG.
+    root, ext = os.path.splitext(path)
+    tmp = f"{root}.tmp{ext}"
+    if not cv2.imwrite(tmp, image_bgr):
+        return False
+    os.replace(tmp, path)
+    return True
+
+
+class EventWriter:
+    """Background JPEG encoder + batched JSONL appender.
+
+    ``write_image`` / ``append_line`` only enqueue and return at once. The
+    image queue is bounded (snapshots are ~4 MB raw each); when it is full the
+    new snapshot is dropped rather than stalling the caller. Log lines are
+    small and are never dropped; they are written in batches, flushed every
+    ``flush_sec`` and fsync'ed every ``fsync_sec``. ``close()`` drains both.
+    """
+
+    def __init__(self, max_images=EVENT_WRITER_QUEUE, flush_sec=EVENT_WRITER_FLUSH_SEC,
+                 fsync_sec=EVENT_WRITER_FSYNC_SEC):
+        self.max_images = max(1, int(max_images))
+        self.flush_sec = max(0.05, float(flush_sec))
+        self.fsync_sec = max(0.0, float(fsync_sec))
+        self._cond = threading.Condition()
+        self._images = deque()
+        self._lines = deque()
+        self._files = {}
+        self._dirty = set()
+        self._last_fsync = time.monotonic()
+        self._stopping = False
+        self._closed = False
+        self.images_written = 0
+        self.images_dropped = 0
+        self.lines_written = 0
+        self._thread = threading.Thread(target=self._run, name="event-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ------------------------------------------------------------
+    # Producer side (any thread)
+    # ------------------------------------------------------------
+    def write_image(self, path, image_bgr):
+        with self._cond:
+            if self._closed:
+                return False
+            if len(self._images) >= self.max_images:
+                self.images_dropped += 1
+                print(f"[EventWriter] queue full, dropped {os.path.basename(path)}")
+                return False
+            self._images.append((path, image_bgr))
+            self._cond.notify()
+        return True
+
+    def append_line(self, path, line):
+        with self._cond:
+            if self._closed:
+                return False
+            self._lines.append((path, line))
+            if not self._images:
+                self._cond.notify()
+        return True
+
+    def attach_file(self, path, fileobj):
+        """Route append_line(path, ...) to ``fileobj`` (e.g. an EventLog) instead of opening ``path``."""
+        with self._cond:
+            self._files[path] = fileobj
+
+    def pending(self):
+        with self._cond:
+            return len(self._images), len(self._lines)
+
+    # ------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._stopping and not self._images and not self._lines:
+                    self._cond.wait(timeout=self.flush_sec)
+                lines = list(self._lines)
+                self._lines.clear()
+                image = self._images.popleft() if self._images else None
+                stopping = self._stopping
+                idle = image is None and not lines and not self._images
+
+            if lines:
+                self._write_lines(lines)
+            if image is not None:
+                self._write_image(*image)
+            if idle or stopping:
+                self._flush(force_fsync=stopping)
+            elif self.fsync_sec and time.monotonic() - self._last_fsync >= self.fsync_sec:
+                self._flush()
+            if stopping and idle:
+                break
+        self._close_files()
+
+    def _write_image(self, path, image_bgr):
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            if write_image_atomic(path, image_bgr):
+                self.images_written += 1
+        except Exception as exc:
+            print(f"[EventWriter] image write failed {path}: {exc}")
+
+    def _write_lines(self, lines):
+        for path, line in lines:
+            f = self._files.get(path)
+            try:
+                if f is None:
+                    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                    f = open(path, "a", encoding="utf-8")
+                    self._files[path] = f
+                f.write(line)
+                self._dirty.add(path)
+                self.lines_written += 1
+            except Exception as exc:
+                print(f"[EventWriter] log append failed {path}: {exc}")
+
+    def _flush(self, force_fsync=False):
+        if not self._dirty:
+            return
+        do_fsync = force_fsync or (
+            self.fsync_sec and time.monotonic() - self._last_fsync >= self.fsync_sec
+        )
+        for path in list(self._dirty):
+            f = self._files.get(path)
+            if f is None:
+                continue
+            try:
+                f.flush()
+                if do_fsync:
+                    os.fsync(f.fileno())
+            except Exception:
+                pass
+        if do_fsync:
+            self._dirty.clear()
+            self._last_fsync = time.monotonic()
+
+    def _close_files(self):
+        for f in self._files.values():
+            try:
+                f.close()
+            except Exception:
+                pass
+        self._files.clear()
+
+    # ------------------------------------------------------------
+    # Shutdown
+    # ------------------------------------------------------------
+    def close(self, timeout=10.0):
+        """Stop accepting work and drain what is queued (idempotent)."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        with self._cond:
+            left = len(self._images) + len(self._lines)
+        if left:
+            print(f"[EventWriter] shutdown with {left} item(s) not written")
@@ -0,0 +1,161 @@
+import asyncio
+import threading
+import time
+
+import cv2
+
+from metrics import get_metrics
+
+try:
+    from config import STREAM_FPS, STREAM_MAX_WIDTH, STREAM_JPEG_QUALITY, STREAM_MAX_VIEWERS
+except Exception:
+    STREAM_FPS = 10.0
+    STREAM_MAX_WIDTH = 640
+    STREAM_JPEG_QUALITY = 70
+    STREAM_MAX_VIEWERS = 4
+
+# Keep encoding this long after the last viewer leaves (page reloads reconnect at once).
+_LINGER_SEC = 2.0
+
+
+class StreamViewer:
+    def __init__(self, loop):
+        self.loop = loop
+        self.wakeup = asyncio.Event()
+        self.last_seq = 0
+        self.frames_skipped = 0
+
+
+class LiveStreamer:
+    """One JPEG encoder shared by every /stream.mjpg viewer.
+
+    The encoder thread only reads ``runtime.last_frame`` (the frame the GUI /
+    service loop already captured), never calls ``read_frame()`` itself, and
+    re-encodes only when that frame object changed. Viewers always take the
+    newest JPEG; a viewer whose socket is slow simply skips frames. The
+    thread starts with the first viewer and stops shortly after the last.
+    """
+
+    def __init__(self, runtime_getter, fps=STREAM_FPS, max_width=STREAM_MAX_WIDTH,
+                 quality=STREAM_JPEG_QUALITY, max_viewers=STREAM_MAX_VIEWERS):
+        self.runtime_getter = runtime_getter
+        self.interval = 1.0 / max(0.5, float(fps))
+        self.max_width = max(160, int(max_width))
+        self.quality = max(30, min(95, int(quality)))
+        self.max_viewers = max(1, int(max_viewers))
+        self._lock = threading.Lock()
+        self._viewers = set()
+        self._thread = None
+        self._latest = None
+        self._seq = 0
+        self._last_viewer_ts = 0.0
+        self.frames_encoded = 0
+
+    # ------------------------------------------------------------
+    # Viewers (called on the server event loop)
+    # ------------------------------------------------------------
+    def join(self):
+        viewer = StreamViewer(asyncio.get_running_loop())
+        with self._lock:
+            if len(self._viewers) >= self.max_viewers:
+                return None
+            self._viewers.add(viewer)
+            if self._latest is not None:
+                # Show the last frame at once instead of waiting for the next encode.
+                viewer.wakeup.set()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="live-stream", daemon=True)
+                self._thread.start()
+        return viewer
+
+    def leave(self, viewer):
+        with self._lock:
+            self._viewers.discard(viewer)
+            self._last_viewer_ts = time.monotonic()
+
+    async def next_frame(self, viewer, timeout=5.0):
+        """Newest JPEG not yet sent to ``viewer``, or None if none arrived within ``timeout``."""
+        try:
+            await asyncio.wait_for(viewer.wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        viewer.wakeup.clear()
+        with self._lock:
+            seq, data = self._seq, self._latest
+        if data is None or seq == viewer.last_seq:
+            return None
+        if viewer.last_seq:
+            viewer.frames_skipped += seq - viewer.last_seq - 1
+        viewer.last_seq = seq
+        return data
+
+    def viewer_count(self):
+        with self._lock:
+            return len(self._viewers)
+
+    # ------------------------------------------------------------
+    # Encoder thread
+    # ------------------------------------------------------------
+    def _encode(self, frame):
+        h, w = frame.shape[:2]
+        if w > self.max_width:
+            scale = self.max_width / float(w)
+            frame = cv2.resize(frame, (self.max_width, max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+        ok, buf = cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), self.quality])
+        return buf.tobytes() if ok else None
+
+    def _run(self):
+        metrics = get_metrics()
+        last_frame = None
+        while True:
+            started = time.monotonic()
+            with self._lock:
+                if not self._viewers and started - self._last_viewer_ts > _LINGER_SEC:
+                    self._thread = None
+                    self._latest = None
+                    return
+            runtime = self.runtime_getter()
+            frame = getattr(runtime, "last_frame", None) if runtime is not None else None
+            # read_frame() stores a new array per capture; same object means nothing new to encode.
+            if frame is not None and frame is not last_frame:
+                last_frame = frame
+                try:
+                    with metrics.timer("stream_encode"):
+                        data = self._encode(frame)
+                except Exception as exc:
+                    print(f"[LiveStream] encode failed: {exc}")
+                    data = None
+                if data:
+                    self.frames_encoded += 1
+                    with self._lock:
+                        self._seq += 1
+                        self._latest = data
+                        viewers = list(self._viewers)
+                    for viewer in viewers:
+                        try:
+                            viewer.loop.call_soon_threadsafe(viewer.wakeup.set)
+                        except RuntimeError:
+                            pass
+            elapsed = time.monotonic() - started
+            time.sleep(max(0.005, self.interval - elapsed))
+
+
+def multipart_chunk(jpeg, boundary=b"frame"):
+    return (
+        b"--" + boundary + b"\r\nContent-Type: image/jpeg\r\nContent-Length: "
+        + str(len(jpeg)).encode("ascii") + b"\r\n\r\n" + jpeg + b"\r\n"
+    )
+
+
+_streamer = None
+_streamer_lock = threading.Lock()
+
+
+def get_live_streamer():
+    global _streamer
+    with _streamer_lock:
+        if _streamer is None:
+            from server.control import get_runtime
+
+            _streamer = LiveStreamer(get_runtime)
+        return _streamer
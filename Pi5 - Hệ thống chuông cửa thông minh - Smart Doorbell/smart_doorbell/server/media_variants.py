@@ -0,0 +1,159 @@
+import hashlib
+import os
+import shutil
+import threading
+
+import cv2
+
+try:
+    from config import EVENT_MEDIA_DIR, EVENT_MEDIA_CACHE_DIR
+except Exception:
+    EVENT_MEDIA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "media")
+    EVENT_MEDIA_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "cache", "media")
+
+# name -> (max side px, JPEG quality); "face" crops meta.bbox first.
+VARIANTS = {
+    "thumb": (320, 70),
+    "medium": (640, 80),
+    "face": (256, 85),
+    "full": (None, None),
+}
+FACE_MARGIN = 0.25
+
+
+def _safe_event_id(event_id):
+    text = str(event_id or "")
+    if not text or not all(ch.isalnum() or ch in "-_" for ch in text):
+        return None
+    return text
+
+
+def source_path(event, media_dir=EVENT_MEDIA_DIR, field="imageUrl"):
+    """Local path of an event's full snapshot (or clip, field="clipUrl") from its URL."""
+    url = (event or {}).get(field) or ""
+    if "/media/" not in url:
+        return None
+    rel = url.split("/media/", 1)[1]
+    parts = [p for p in rel.split("/") if p]
+    if not parts or any(p in (".", "..") for p in parts):
+        return None
+    path = os.path.join(media_dir, *parts)
+    return path if os.path.isfile(path) else None
+
+
+def _resize_max(img, max_side):
+    h, w = img.shape[:2]
+    scale = max_side / float(max(h, w))
+    if scale >= 1.0:
+        return img
+    return cv2.resize(img, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+
+
+def _face_region(img, bbox):
+    try:
+        x1, y1, x2, y2 = (int(v) for v in bbox)
+    except Exception:
+        return None
+    h, w = img.shape[:2]
+    mx = int((x2 - x1) * FACE_MARGIN)
+    my = int((y2 - y1) * FACE_MARGIN)
+    x1, y1 = max(0, x1 - mx), max(0, y1 - my)
+    x2, y2 = min(w, x2 + mx), min(h, y2 + my)
+    if x2 - x1 < 8 or y2 - y1 < 8:
+        return None
+    return img[y1:y2, x1:x2]
+
+
+class MediaVariantCache:
+    """Smaller renditions of event snapshots, generated on first request.
+
+    Files live in ``<cache_dir>/<eventId>/<variant>.jpg``, outside the media
+    dir so retention quotas only count originals. The ETag is derived from
+    the original's mtime/size plus the rendition settings.
+    """
+
+    def __init__(self, media_dir=EVENT_MEDIA_DIR, cache_dir=EVENT_MEDIA_CACHE_DIR):
+        self.media_dir = media_dir
+        self.cache_dir = cache_dir
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock_for(self, key):
+        with self._locks_guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def etag(self, event_id, variant, src):
+        st = os.stat(src)
+        raw = f"{event_id}:{variant}:{VARIANTS[variant]}:{st.st_mtime_ns}:{st.st_size}"
+        return '"' + hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20] + '"'
+
+    def cached_path(self, event_id, variant):
+        return os.path.join(self.cache_dir, event_id, f"{variant}.jpg")
+
+    def get(self, event, variant):
+        """Return ``(path, etag)`` for the rendition, or ``(None, None)`` if it cannot be made."""
+        event_id = _safe_event_id((event or {}).get("eventId"))
+        if event_id is None or variant not in VARIANTS:
+            return None, None
+        src = source_path(event, self.media_dir)
+        if src is None:
+            return None, None
+        etag = self.etag(event_id, variant, src)
+        if variant == "full":
+            return src, etag
+
+        path = self.cached_path(event_id, variant)
+        tag_path = path + ".etag"
+        with self._lock_for((event_id, variant)):
+            try:
+                with open(tag_path, "r") as f:
+                    if f.read() == etag and os.path.isfile(path):
+                        return path, etag
+            except OSError:
+                pass
+            if not self._render(event, variant, src, path):
+                return None, None
+            with open(tag_path, "w") as f:
+                f.write(etag)
+        return path, etag
+
+    def _render(self, event, variant, src, path):
+        img = cv2.imread(src)
+        if img is None:
+            return False
+        max_side, quality = VARIANTS[variant]
+        if variant == "face":
+            img = _face_region(img, ((event.get("meta") or {}).get("bbox")))
+            if img is None:
+                return False
+        img = _resize_max(img, max_side)
+        ok, buf = cv2.imencode(".jpg", img, [int(cv2.IMWRITE_JPEG_QUALITY), quality])
+        if not ok:
+            return False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(buf.tobytes())
+        os.replace(tmp, path)
+        return True
+
+    def drop(self, event_ids):
+        for event_id in event_ids or ():
+            event_id = _safe_event_id(event_id)
+            if event_id:
+                shutil.rmtree(os.path.join(self.cache_dir, event_id), ignore_errors=True)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_media_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = MediaVariantCache()
+        return _cache
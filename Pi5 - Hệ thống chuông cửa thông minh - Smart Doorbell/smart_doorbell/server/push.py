@@ -0,0 +1,198 @@
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+
+try:
+    from config import PUSH_QUEUE_SIZE, PUSH_REPLAY_SIZE, PUSH_HEARTBEAT_SEC, PUSH_DOOR_POLL_SEC
+except Exception:
+    PUSH_QUEUE_SIZE = 64
+    PUSH_REPLAY_SIZE = 256
+    PUSH_HEARTBEAT_SEC = 15.0
+    PUSH_DOOR_POLL_SEC = 0.25
+
+
+class PushClient:
+    """One connected SSE / WebSocket client: a bounded queue on the server's event loop."""
+
+    def __init__(self, loop, max_queue):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.dropped = 0
+        self.closed = False
+
+    def offer(self, message):
+        # Runs on self.loop. A slow client loses its oldest messages, never blocks the hub.
+        if self.queue.full():
+            try:
+                self.queue.get_nowait()
+                self.dropped += 1
+            except asyncio.QueueEmpty:
+                pass
+        self.queue.put_nowait(message)
+
+    async def next(self, timeout):
+        """Next message, ``None`` on heartbeat timeout, or a ``lagged`` notice after drops."""
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            return {"id": None, "type": "lagged", "data": {"dropped": dropped}}
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class PushHub:
+    """Fan-out of door events, door state and lock/unlock results.
+
+    ``publish`` may be called from any thread (GUI, service loop, API
+    worker threads). Every message gets an increasing ``id``; the last
+    ``replay_size`` are kept so a reconnecting client can resume from the
+    last id it saw (SSE ``Last-Event-ID``). If that id has already left the
+    buffer the client gets a ``resync`` message and should re-read
+    ``GET /events``.
+    """
+
+    def __init__(self, queue_size=PUSH_QUEUE_SIZE, replay_size=PUSH_REPLAY_SIZE,
+                 door_poll_sec=PUSH_DOOR_POLL_SEC):
+        self.queue_size = max(1, int(queue_size))
+        self.door_poll_sec = max(0.05, float(door_poll_sec))
+        self._lock = threading.Lock()
+        self._clients = set()
+        self._replay = deque(maxlen=max(1, int(replay_size)))
+        # Ids start at the boot time in ms, so ids from before a restart are always "too old".
+        self._seq = int(time.time() * 1000)
+        self._door_thread = None
+        self._door_state = None
+        self.published = 0
+
+    # ------------------------------------------------------------
+    # Producers
+    # ------------------------------------------------------------
+    def publish(self, kind, data):
+        with self._lock:
+            self._seq += 1
+            message = {"id": self._seq, "type": kind, "data": data}
+            self._replay.append(message)
+            clients = list(self._clients)
+            self.published += 1
+        for client in clients:
+            try:
+                client.loop.call_soon_threadsafe(client.offer, message)
+            except RuntimeError:
+                # Event loop already closed (server shutting down).
+                self.unsubscribe(client)
+        return message
+
+    def publish_event(self, event):
+        # EventStore listener signature.
+        self.publish("event", event)
+
+    # ------------------------------------------------------------
+    # Subscribers
+    # ------------------------------------------------------------
+    def subscribe(self, last_id=None):
+        """Register a client on the running loop; returns ``(client, backlog)``.
+
+        Registration and the backlog snapshot happen under one lock, so no
+        message is missed or delivered twice between the two.
+        """
+        client = PushClient(asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            backlog = self._backlog(last_id)
+            self._clients.add(client)
+            current_seq = self._seq
+        self._ensure_door_watcher()
+        if not backlog:
+            backlog = []
+        backlog.insert(0, {"id": None, "type": "hello", "data": {"lastId": current_seq, "doorOpen": self._door_state}})
+        return client, backlog
+
+    def _backlog(self, last_id):
+        if last_id in (None, ""):
+            return []
+        try:
+            last = int(last_id)
+        except (TypeError, ValueError):
+            return [{"id": None, "type": "resync", "data": {"reason": "bad last id"}}]
+        if last >= self._seq:
+            # Nothing new (or an id from the future: clock moved back across a restart).
+            return [] if last == self._seq else [{"id": None, "type": "resync", "data": {"reason": "unknown id"}}]
+        oldest = self._replay[0]["id"] if self._replay else self._seq + 1
+        if last + 1 < oldest:
+            return [{"id": None, "type": "resync", "data": {"reason": "too far behind"}}]
+        return [m for m in self._replay if m["id"] > last]
+
+    def unsubscribe(self, client):
+        client.closed = True
+        with self._lock:
+            self._clients.discard(client)
+
+    def client_count(self):
+        with self._lock:
+            return len(self._clients)
+
+    # ------------------------------------------------------------
+    # Door state (polled only while someone is listening)
+    # ------------------------------------------------------------
+    def _ensure_door_watcher(self):
+        with self._lock:
+            if self._door_thread is not None and self._door_thread.is_alive():
+                return
+            self._door_thread = threading.Thread(target=self._watch_door, name="push-door", daemon=True)
+            self._door_thread.start()
+
+    def _watch_door(self):
+        try:
+            from server.control import get_door_controller
+        except Exception:
+            return
+        while True:
+            with self._lock:
+                if not self._clients:
+                    # Cleared under the lock, so a subscriber arriving now starts a new watcher.
+                    self._door_thread = None
+                    return
+            door = get_door_controller()
+            if door is not None:
+                is_open = bool(getattr(door, "_is_open", False))
+                if is_open != self._door_state:
+                    first = self._door_state is None
+                    self._door_state = is_open
+                    if not first:
+                        self.publish("door", {"open": is_open, "ts": time.time()})
+            time.sleep(self.door_poll_sec)
+
+    def door_state(self):
+        return self._door_state
+
+    def stats(self):
+        with self._lock:
+            return {
+                "clients": len(self._clients),
+                "lastId": self._seq,
+                "replay": len(self._replay),
+                "published": self.published,
+            }
+
+
+def sse_format(message):
+    lines = []
+    if message.get("id") is not None:
+        lines.append(f"id: {message['id']}")
+    lines.append(f"event: {message['type']}")
+    lines.append("data: " + json.dumps(message.get("data"), ensure_ascii=True))
+    return "\n".join(lines) + "\n\n"
+
+
+_hub = None
+_hub_lock = threading.Lock()
+
+
+def get_push_hub():
+    global _hub
+    with _hub_lock:
+        if _hub is None:
+            _hub = PushHub()
+        return _hub
@@ -0,0 +1,140 @@
+import asyncio
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+from metrics import get_metrics
+
+try:
+    from config import RECOGNIZE_BATCH_WINDOW_MS, RECOGNIZE_MAX_BATCH, RECOGNIZE_MAX_PENDING
+except Exception:
+    RECOGNIZE_BATCH_WINDOW_MS = 20.0
+    RECOGNIZE_MAX_BATCH = 8
+    RECOGNIZE_MAX_PENDING = 32
+
+
+class RecognizerBusy(Exception):
+    pass
+
+
+class _Job:
+    __slots__ = ("data", "future", "loop", "queued")
+
+    def __init__(self, data, future, loop):
+        self.data = data
+        self.future = future
+        self.loop = loop
+        self.queued = time.perf_counter()
+
+
+def _deliver(future, value):
+    # Runs on the request's event loop; the client may have gone away meanwhile.
+    if not future.done():
+        future.set_result(value)
+
+
+class RecognitionBatcher:
+    """Gather concurrent POST /recognize calls into micro-batches.
+
+    Handlers only enqueue the raw bytes and await a future. A worker thread
+    waits up to ``window_ms`` after the first job for more (at most
+    ``max_batch``), decodes them, and runs ``runtime.recognize_batch`` once.
+    JPEG decoding and inference therefore stay off the event loop, and the
+    live pipeline sees one infer_lock hold per batch instead of one per call.
+    """
+
+    def __init__(self, runtime_getter, window_ms=RECOGNIZE_BATCH_WINDOW_MS, max_batch=RECOGNIZE_MAX_BATCH,
+                 max_pending=RECOGNIZE_MAX_PENDING):
+        self.runtime_getter = runtime_getter
+        self.window_sec = max(0.0, float(window_ms)) / 1000.0
+        self.max_batch = max(1, int(max_batch))
+        self.max_pending = max(1, int(max_pending))
+        self._cond = threading.Condition()
+        self._jobs = deque()
+        self._thread = threading.Thread(target=self._run, name="recognize-batcher", daemon=True)
+        self._thread.start()
+        self.batches = 0
+        self.images = 0
+
+    async def submit(self, data):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._cond:
+            if len(self._jobs) >= self.max_pending:
+                raise RecognizerBusy(f"{len(self._jobs)} requests already waiting")
+            self._jobs.append(_Job(data, future, loop))
+            self._cond.notify()
+        return await future
+
+    def _take_batch(self):
+        with self._cond:
+            while not self._jobs:
+                self._cond.wait()
+            deadline = time.monotonic() + self.window_sec
+            while len(self._jobs) < self.max_batch:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    break
+                self._cond.wait(left)
+            batch = []
+            while self._jobs and len(batch) < self.max_batch:
+                batch.append(self._jobs.popleft())
+            return batch
+
+    def _run(self):
+        metrics = get_metrics()
+        while True:
+            batch = self._take_batch()
+            started = time.perf_counter()
+            frames, decode_ms = [], []
+            for job in batch:
+                t0 = time.perf_counter()
+                try:
+                    frame = cv2.imdecode(np.frombuffer(job.data, dtype=np.uint8), cv2.IMREAD_COLOR)
+                except Exception:
+                    frame = None
+                frames.append(frame)
+                decode_ms.append((time.perf_counter() - t0) * 1000.0)
+            runtime = self.runtime_getter()
+            if runtime is None:
+                results = [{"ok": False, "error": "runtime unavailable", "timings": {}} for _ in batch]
+            else:
+                try:
+                    results = runtime.recognize_batch(frames)
+                except Exception as exc:
+                    results = [{"ok": False, "error": f"recognize failed: {exc}", "timings": {}} for _ in batch]
+            finished = time.perf_counter()
+            self.batches += 1
+            self.images += len(batch)
+            metrics.observe("recognize_batch", (finished - started) * 1000.0)
+            for job, result, dec_ms in zip(batch, results, decode_ms):
+                timings = result.setdefault("timings", {})
+                timings["queue"] = (started - job.queued) * 1000.0
+                timings["decode"] = dec_ms
+                timings["total"] = (finished - job.queued) * 1000.0
+                result["batchSize"] = len(batch)
+                try:
+                    job.loop.call_soon_threadsafe(_deliver, job.future, result)
+                except RuntimeError:
+                    pass
+
+    def pending(self):
+        with self._cond:
+            return len(self._jobs)
+
+
+_batcher = None
+_batcher_lock = threading.Lock()
+
+
+def get_recognition_batcher():
+    global _batcher
+    with _batcher_lock:
+        if _batcher is None:
+            from server.control import get_runtime
+
+            _batcher = RecognitionBatcher(get_runtime)
+        return _batcher
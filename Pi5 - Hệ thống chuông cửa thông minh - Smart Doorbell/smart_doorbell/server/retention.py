@@ -0,0 +1,281 @@
+import ctypes
+import os
+import platform
+import threading
+import time
+
+try:
+    from config import (
+        EVENT_MEDIA_DIR,
+        EVENT_RETENTION_ENABLED,
+        EVENT_RETENTION_DAYS,
+        EVENT_RETENTION_MAX_FILES,
+        EVENT_RETENTION_MAX_MB,
+        EVENT_RETENTION_INTERVAL_SEC,
+    )
+except Exception:
+    EVENT_MEDIA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "media")
+    EVENT_RETENTION_ENABLED = True
+    EVENT_RETENTION_DAYS = 30.0
+    EVENT_RETENTION_MAX_FILES = 5000
+    EVENT_RETENTION_MAX_MB = 2048.0
+    EVENT_RETENTION_INTERVAL_SEC = 600.0
+
+MEDIA_EXTS = (".jpg", ".jpeg", ".png", ".mp4", ".avi", ".mkv", ".webm")
+CLIP_EXTS = (".mp4", ".avi", ".mkv", ".webm")
+
+# ioprio_set(2) syscall numbers; absent from the os module.
+_SYS_IOPRIO_SET = {"x86_64": 251, "aarch64": 30, "armv7l": 314, "i686": 289}
+_IOPRIO_WHO_PROCESS = 1
+_IOPRIO_CLASS_IDLE = 3
+_IOPRIO_CLASS_SHIFT = 13
+
+
+def lower_thread_priority():
+    """Best effort: idle I/O class + nice 19 for the calling thread only (Linux)."""
+    try:
+        tid = threading.get_native_id()
+    except Exception:
+        return False
+    ok = False
+    try:
+        os.setpriority(os.PRIO_PROCESS, tid, 19)
+        ok = True
+    except Exception:
+        pass
+    nr = _SYS_IOPRIO_SET.get(platform.machine())
+    if nr is not None:
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            if libc.syscall(nr, _IOPRIO_WHO_PROCESS, tid, _IOPRIO_CLASS_IDLE << _IOPRIO_CLASS_SHIFT) == 0:
+                ok = True
+        except Exception:
+            pass
+    return ok
+
+
+def event_id_from_filename(name):
+    # Snapshots are named "<eventId>_<YYYYmmdd_HHMMSS>.jpg" with eventId "evt_<hex>".
+    base = os.path.basename(name)
+    if not base.startswith("evt_"):
+        return None
+    parts = base.split("_")
+    return "_".join(parts[:2]) if len(parts) >= 2 else None
+
+
+class RetentionManager:
+    """Enforce age / count / size quotas on EVENT_MEDIA_DIR.
+
+    Oldest files go first. Events whose snapshot is deleted keep their log
+    and index rows, but their imageUrl is cleared (``meta.mediaPruned``) in
+    both EventStore and the event index so nothing links to a missing file.
+    """
+
+    def __init__(self, media_dir=EVENT_MEDIA_DIR, max_age_days=EVENT_RETENTION_DAYS,
+                 max_files=EVENT_RETENTION_MAX_FILES, max_mb=EVENT_RETENTION_MAX_MB,
+                 interval_sec=EVENT_RETENTION_INTERVAL_SEC, store=None):
+        self.media_dir = media_dir
+        self.max_age_sec = max(0.0, float(max_age_days)) * 86400.0
+        self.max_files = max(0, int(max_files))
+        self.max_bytes = max(0, int(float(max_mb) * 1024 * 1024))
+        self.interval_sec = max(10.0, float(interval_sec))
+        self.store = store
+        self._stop = threading.Event()
+        self._thread = None
+        self.last_run = None
+
+    # ------------------------------------------------------------
+    # Scan / prune
+    # ------------------------------------------------------------
+    def _scan(self):
+        files, stale_tmp = [], []
+        now = time.time()
+        for root, _, names in os.walk(self.media_dir):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                if ".tmp" in name:
+                    # Leftover from an interrupted atomic write.
+                    if now - st.st_mtime > 3600:
+                        stale_tmp.append(path)
+                    continue
+                if name.lower().endswith(MEDIA_EXTS):
+                    files.append((st.st_mtime, st.st_size, path))
+        files.sort()
+        return files, stale_tmp
+
+    def plan(self, files, now=None):
+        """Return the paths to delete from ``files`` (sorted oldest first)."""
+        now = time.time() if now is None else now
+        doomed = []
+        keep = list(files)
+        if self.max_age_sec:
+            cutoff = now - self.max_age_sec
+            while keep and keep[0][0] < cutoff:
+                doomed.append(keep.pop(0)[2])
+        total = sum(size for _, size, _ in keep)
+        while keep and (
+            (self.max_files and len(keep) > self.max_files)
+            or (self.max_bytes and total > self.max_bytes)
+        ):
+            _, size, path = keep.pop(0)
+            total -= size
+            doomed.append(path)
+        return doomed
+
+    def prune_once(self, dry_run=False):
+        started = time.monotonic()
+        files, stale_tmp = self._scan()
+        doomed = self.plan(files)
+        stats = {
+            "scanned": len(files),
+            "deleted": 0,
+            "freed_bytes": 0,
+            "tmp_removed": 0,
+            "dry_run": bool(dry_run),
+        }
+        if dry_run:
+            stats["would_delete"] = len(doomed)
+            return stats
+        sizes = {path: size for _, size, path in files}
+        pruned_ids, pruned_clips = [], []
+        for i, path in enumerate(doomed):
+            if self._stop.is_set():
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            stats["deleted"] += 1
+            stats["freed_bytes"] += sizes.get(path, 0)
+            event_id = event_id_from_filename(path)
+            if event_id:
+                # Clips share the snapshot's "<eventId>_<stamp>" name; only their clipUrl goes.
+                (pruned_clips if path.lower().endswith(CLIP_EXTS) else pruned_ids).append(event_id)
+            if i % 50 == 49:
+                # Let camera / event writes through between batches.
+                time.sleep(0.05)
+        for path in stale_tmp:
+            try:
+                os.remove(path)
+                stats["tmp_removed"] += 1
+            except OSError:
+                pass
+        self._remove_empty_dirs()
+        if (pruned_ids or pruned_clips) and self.store is not None:
+            try:
+                self.store.mark_media_pruned(pruned_ids)
+                self.store.mark_media_pruned(pruned_clips, field="clipUrl")
+            except Exception as exc:
+                print(f"[Retention] could not update events: {exc}")
+        if pruned_ids:
+            try:
+                from server.media_variants import get_media_cache
+
+                get_media_cache().drop(pruned_ids)
+            except Exception:
+                pass
+        stats["elapsed_sec"] = time.monotonic() - started
+        self.last_run = dict(stats, ts=time.time())
+        return stats
+
+    def reconcile(self):
+        """Clear imageUrl of indexed events whose file is already gone (e.g. deleted by hand,
+        or an index rebuilt from the log after an earlier prune)."""
+        index = getattr(self.store, "index", None)
+        if index is None:
+            return 0
+        files, _ = self._scan()
+        present = {os.path.relpath(path, self.media_dir).replace(os.sep, "/") for _, _, path in files}
+        missing = []
+        # Skip the last few minutes: their JPEGs may still be in the writer queue.
+        for event_id, url in index.media_refs(older_than=time.time() - 300):
+            rel = url.split("/media/", 1)[1] if "/media/" in url else None
+            if rel and rel not in present:
+                missing.append(event_id)
+        if missing:
+            self.store.mark_media_pruned(missing)
+        return len(missing)
+
+    def _remove_empty_dirs(self):
+        for root, dirs, names in os.walk(self.media_dir, topdown=False):
+            if root == self.media_dir or dirs or names:
+                continue
+            try:
+                os.rmdir(root)
+            except OSError:
+                pass
+
+    # ------------------------------------------------------------
+    # Background thread
+    # ------------------------------------------------------------
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="media-retention", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        lower_thread_priority()
+        # First pass shortly after startup, not during model loading.
+        if self._stop.wait(30.0):
+            return
+        try:
+            fixed = self.reconcile()
+            if fixed:
+                print(f"[Retention] {fixed} event(s) pointed at missing media")
+        except Exception as exc:
+            print(f"[Retention] reconcile failed: {exc}")
+        while not self._stop.is_set():
+            try:
+                stats = self.prune_once()
+                if stats["deleted"] or stats["tmp_removed"]:
+                    print(
+                        f"[Retention] removed {stats['deleted']} file(s), "
+                        f"{stats['freed_bytes'] / 1048576.0:.1f} MB freed"
+                    )
+            except Exception as exc:
+                print(f"[Retention] prune failed: {exc}")
+            self._stop.wait(self.interval_sec)
+
+    def stop(self, timeout=2.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+_retention = None
+_retention_lock = threading.Lock()
+
+
+def start_retention(store=None):
+    """Start the shared pruner once per process (no-op when disabled)."""
+    global _retention
+    if not EVENT_RETENTION_ENABLED:
+        return None
+    with _retention_lock:
+        if _retention is None:
+            if store is None:
+                try:
+                    from server.event_store import get_event_store
+
+                    store = get_event_store()
+                except Exception:
+                    store = None
+            _retention = RetentionManager(store=store)
+            _retention.start()
+        return _retention
+
+
+def get_retention():
+    return _retention
+
+
+def stop_retention():
+    if _retention is not None:
+        _retention.stop()
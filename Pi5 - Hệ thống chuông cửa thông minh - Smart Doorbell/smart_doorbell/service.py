@@ -0,0 +1,301 @@
+import threading
+import time
+
+from gui.alert import KnownPersonAlert
+from gui.door_control import build_door_controller
+from gui.doorbell_button import DoorbellRingButton
+from face.result import RecognitionResult
+from metrics import get_metrics
+from tracing import span
+from runtime import DoorbellRuntime
+from server.control import face_policy_command, get_door_executor
+from utils.lcd_i2c import get_lcd_display, lcd_person_from_result
+
+try:
+    from config import (
+        GUI_ENABLE_LIVENESS,
+        GUI_ENABLE_FACE,
+        GUI_AUTO_INFER,
+        N_DETECTION_FRAMES,
+        EVENT_CAPTURE_INTERVAL_SEC,
+        EVENT_CAPTURE_ENABLED,
+        HEADLESS_FRAME_INTERVAL_SEC,
+        IDLE_POLL_MS,
+    )
+except Exception:
+    GUI_ENABLE_LIVENESS = False
+    GUI_ENABLE_FACE = True
+    GUI_AUTO_INFER = True
+    N_DETECTION_FRAMES = 3
+    EVENT_CAPTURE_INTERVAL_SEC = 5.0
+    EVENT_CAPTURE_ENABLED = False
+    HEADLESS_FRAME_INTERVAL_SEC = 0.033
+    IDLE_POLL_MS = 200
+
+
+def _get_event_store():
+    try:
+        from server.event_store import get_event_store
+
+        return get_event_store()
+    except Exception:
+        return None
+
+
+class DoorbellService:
+    """Qt-free wiring of runtime, door, ring button, LCD and event store.
+
+    Recognition runs on its own thread; the GUI (if any) is just another client.
+    """
+
+    def __init__(self, runtime=None, enable_liveness=None, enable_face=None):
+        if runtime is None:
+            runtime = DoorbellRuntime(
+                enable_liveness=GUI_ENABLE_LIVENESS if enable_liveness is None else enable_liveness,
+                enable_face=GUI_ENABLE_FACE if enable_face is None else enable_face,
+            )
+        self.runtime = runtime
+        self.door = build_door_controller()
+        self.alert = KnownPersonAlert()
+        self.lcd = get_lcd_display()
+        self.ring_button = DoorbellRingButton(on_press=self._on_ring_pressed)
+
+        self.auto_infer = bool(GUI_AUTO_INFER)
+        self.frame_interval_sec = max(0.0, float(HEADLESS_FRAME_INTERVAL_SEC))
+        self.event_capture_enabled = bool(EVENT_CAPTURE_ENABLED)
+        self._event_interval = float(EVENT_CAPTURE_INTERVAL_SEC)
+        self._last_event_ts = 0.0
+        self._known_event_id = None
+        self._known_event_active = False
+
+        self.latest_frame = None
+        self.latest_result = None
+        self.last_event = None
+
+        self._stop = threading.Event()
+        self._thread = None
+        self._frame_counter = 0
+        self._attach_clip_recorder()
+
+    def _attach_clip_recorder(self):
+        try:
+            from server.clip_recorder import attach_clip_recorder
+
+            attach_clip_recorder(self.runtime, _get_event_store())
+        except Exception as exc:
+            print(f"[service] clip recorder disabled: {exc}")
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="doorbell-service", daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            start = time.perf_counter()
+            try:
+                self._step()
+            except Exception as exc:
+                print(f"[service] loop error: {exc}")
+                self._stop.wait(0.5)
+                continue
+            elapsed = time.perf_counter() - start
+            interval = self.frame_interval_sec
+            if self.runtime.is_idle():
+                interval = max(interval, IDLE_POLL_MS / 1000.0)
+            if interval > elapsed:
+                self._stop.wait(interval - elapsed)
+
+    def _step(self):
+        frame = self.runtime.read_frame()
+        if frame is None:
+            self._update_lcd(None)
+            self._stop.wait(0.5)
+            return
+        self.latest_frame = frame
+        if self.runtime.is_idle():
+            return
+
+        scheduler = getattr(self.runtime, "scheduler", None)
+        if scheduler is not None:
+            due = scheduler.should_infer()
+        else:
+            due = self._frame_counter % max(1, int(N_DETECTION_FRAMES)) == 0
+        if self.auto_infer and due:
+            start = time.perf_counter()
+            try:
+                result = self.runtime.infer_frame(frame)
+            except Exception as exc:
+                result = RecognitionResult.failed(f"infer failed: {exc}")
+            result = result.replace(latency_ms=int((time.perf_counter() - start) * 1000))
+            self.latest_result = result
+            self._handle_result(result)
+        elif self.auto_infer:
+            get_metrics().incr("frames_skipped")
+        self._frame_counter += 1
+
+    def _db_empty(self):
+        face = getattr(self.runtime, "face", None)
+        if face is None:
+            return True
+        try:
+            return len(getattr(face, "DB", {}) or {}) == 0
+        except Exception:
+            return True
+
+    def _handle_result(self, result):
+        if result.get("size_status") not in ("too_small", "too_large"):
+            door = self.door
+            door_open_before = bool(getattr(door, "_is_open", False))
+            if self.alert is not None:
+                self.alert.handle_result(result)
+            with span("door", cat="io"):
+                get_door_executor().submit(
+                    "face", face_policy_command(door, result, force_require_known=self._db_empty()),
+                    source="service", notify=False,
+                )
+            self._maybe_capture_event(result, door_open_before=door_open_before)
+        with span("lcd", cat="io"):
+            self._update_lcd(result)
+
+    def _update_lcd(self, result):
+        if self.lcd is None:
+            return
+        door_open = bool(getattr(self.door, "_is_open", False))
+        person_type, person_name = lcd_person_from_result(result)
+        try:
+            self.lcd.set_status(door_open=door_open, person_type=person_type, person_name=person_name)
+        except Exception:
+            return
+
+    def _snapshot_frame(self):
+        if self.latest_frame is not None:
+            return self.latest_frame.copy()
+        if getattr(self.runtime, "last_frame", None) is not None:
+            return self.runtime.last_frame.copy()
+        try:
+            return self.runtime.read_frame()
+        except Exception:
+            return None
+
+    def _maybe_capture_event(self, result, door_open_before=False):
+        if not self.event_capture_enabled:
+            return
+        if not result or not result.get("has_face"):
+            return
+        rid = result.get("id")
+        name = result.get("name")
+        score = result.get("score")
+        if not (rid and name and score is not None):
+            return
+
+        if not door_open_before:
+            self._known_event_active = False
+            self._known_event_id = None
+        if self._known_event_active and rid == self._known_event_id:
+            return
+
+        now = time.time()
+        if now - self._last_event_ts < self._event_interval:
+            return
+        frame = self._snapshot_frame()
+        if frame is None:
+            return
+        meta = {
+            "id": rid,
+            "name": name,
+            "score": score,
+            "is_real": result.get("is_real"),
+            "bbox": result.get("bbox"),
+        }
+        store = _get_event_store()
+        if store is None:
+            return
+        try:
+            event = store.add_event(
+                "KNOWN", frame, person_name=name, source="service", meta=meta,
+                embedding=result.get("embedding"),
+            )
+        except Exception:
+            return
+        if event:
+            self.last_event = event
+            self._last_event_ts = now
+            self._known_event_active = True
+            self._known_event_id = rid
+
+    def _on_ring_pressed(self):
+        frame = None
+        if self.runtime.wake("ring"):
+            try:
+                frame = self.runtime.read_frame()
+            except Exception:
+                frame = None
+        if frame is None:
+            frame = self._snapshot_frame()
+        if frame is None:
+            return
+
+        result = self.latest_result
+        if result is None or result.get("size_status") is None:
+            try:
+                result = self.runtime.infer_frame(frame)
+            except Exception:
+                result = result or {}
+
+        event_type = "RING"
+        person_name = None
+        meta = {"type": "doorbell"}
+        if result and result.get("has_face"):
+            rid = result.get("id")
+            name = result.get("name")
+            score = result.get("score")
+            if rid and name and score is not None:
+                event_type = "KNOWN"
+                person_name = name
+            else:
+                event_type = "UNKNOWN"
+            meta.update({
+                "id": rid,
+                "name": name,
+                "score": score,
+                "is_real": result.get("is_real"),
+                "bbox": result.get("bbox"),
+            })
+
+        store = _get_event_store()
+        if store is None:
+            return
+        try:
+            event = store.add_event(
+                event_type, frame, person_name=person_name, source="button", meta=meta,
+                embedding=result.get("embedding") if result else None,
+            )
+        except Exception:
+            return
+        if event:
+            self.last_event = event
+
+    def wait(self, timeout=None):
+        return self._stop.wait(timeout)
+
+    def stop(self):
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        self._thread = None
+
+    def shutdown(self):
+        self.stop()
+        if self.alert is not None:
+            self.alert.close()
+        get_door_executor().close()
+        if self.door is not None:
+            self.door.shutdown()
+        if self.ring_button is not None:
+            self.ring_button.close()
+        if self.runtime is not None:
+            self.runtime.close()
@@ -0,0 +1,231 @@
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+
+try:
+    import config as _config
+except Exception:
+    _config = None
+
+
+def _get_cfg(name, default):
+    if _config is None:
+        return default
+    return getattr(_config, name, default)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **args):
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("_tracer", "name", "cat", "args", "_start")
+
+    def __init__(self, tracer, name, cat, args):
+        self._tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self._start = 0
+
+    def set(self, **args):
+        if self.args is None:
+            self.args = {}
+        self.args.update(args)
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.set(error=exc_type.__name__)
+        self._tracer._record(self.name, self.cat, self._start, end - self._start, self.args)
+        return False
+
+
+class Tracer:
+    """Opt-in span recorder backed by a fixed-size ring.
+
+    Slots are claimed with ``next()`` on an itertools counter (atomic under
+    the GIL), so recording never takes a lock. Each span carries the frame
+    sequence number current on its thread.
+    """
+
+    def __init__(self, enabled=False, size=16384):
+        self.enabled = bool(enabled)
+        self.size = max(256, int(size))
+        self._slots = [None] * self.size
+        self._counter = itertools.count()
+        self._frames = itertools.count(1)
+        self._local = threading.local()
+        self._epoch_ns = time.perf_counter_ns()
+
+    # ------------------------------------------------------------
+    # Frame sequence
+    # ------------------------------------------------------------
+    def next_frame(self):
+        seq = next(self._frames)
+        self._local.frame = seq
+        return seq
+
+    def set_frame(self, seq):
+        self._local.frame = seq
+
+    def current_frame(self):
+        return getattr(self._local, "frame", None)
+
+    # ------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------
+    def span(self, name, cat="pipeline", **args):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat, args or None)
+
+    def _record(self, name, cat, start_ns, dur_ns, args):
+        idx = next(self._counter)
+        self._slots[idx % self.size] = (
+            name,
+            cat,
+            start_ns,
+            dur_ns,
+            threading.get_ident(),
+            threading.current_thread().name,
+            getattr(self._local, "frame", None),
+            args,
+        )
+
+    def clear(self):
+        self._slots = [None] * self.size
+
+    # ------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------
+    def to_chrome_trace(self):
+        records = [r for r in list(self._slots) if r is not None]
+        records.sort(key=lambda r: r[2])
+        pid = os.getpid()
+        events = []
+        threads = {}
+        for name, cat, start_ns, dur_ns, tid, tname, frame, args in records:
+            threads[tid] = tname
+            event_args = dict(args) if args else {}
+            if frame is not None:
+                event_args["frame"] = frame
+            events.append({
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": (start_ns - self._epoch_ns) / 1000.0,
+                "dur": dur_ns / 1000.0,
+                "pid": pid,
+                "tid": tid,
+                "args": event_args,
+            })
+        for tid, tname in threads.items():
+            events.append({
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": tid,
+                "args": {"name": tname},
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def dump(self, path=None):
+        if path is None:
+            folder = _get_cfg("TRACE_DUMP_DIR", "logs")
+            os.makedirs(folder, exist_ok=True)
+            path = os.path.join(folder, time.strftime("trace_%Y%m%d_%H%M%S.json"))
+        data = self.to_chrome_trace()
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+        return path
+
+
+_tracer = Tracer(
+    enabled=_get_cfg("TRACE_ENABLED", False),
+    size=_get_cfg("TRACE_BUFFER_SIZE", 16384),
+)
+
+
+def get_tracer():
+    return _tracer
+
+
+def span(name, cat="pipeline", **args):
+    """``with span("detect_faces"): ...`` — a shared no-op object when tracing is off."""
+    if not _tracer.enabled:
+        return _NULL_SPAN
+    return _Span(_tracer, name, cat, args or None)
+
+
+def traced(name=None, cat="pipeline"):
+    """Decorator form of span(); checks the enabled flag per call."""
+
+    def decorate(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _tracer.enabled:
+                return fn(*args, **kwargs)
+            with _Span(_tracer, label, cat, None):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def set_enabled(enabled):
+    _tracer.enabled = bool(enabled)
+    return _tracer.enabled
+
+
+def dump_trace(path=None):
+    return _tracer.dump(path)
+
+
+def install_signal_handler(signum=None):
+    """Dump the ring to TRACE_DUMP_DIR on SIGUSR1 (POSIX only)."""
+    import signal
+
+    if signum is None:
+        signum = getattr(signal, "SIGUSR1", None)
+    if signum is None:
+        return False
+
+    def _on_signal(_signum, _frame):
+        def _write():
+            try:
+                print(f"[trace] written to {dump_trace()}")
+            except Exception as exc:
+                print(f"[trace] dump failed: {exc}")
+
+        threading.Thread(target=_write, name="trace-dump", daemon=True).start()
+
+    try:
+        signal.signal(signum, _on_signal)
+    except Exception:
+        return False
+    return True
@@ -283,12 +283,13 @@ class LCDDisplay:
             if person_name is not None:
                 self._person_name = str(person_name)
 
-            now = time.time()
-            if self.min_interval and now - self._last_update_ts < self.min_interval:
-                return False
-
             line1, line2 = self._compose_lines()
             if (line1, line2) == self._last_lines:
+                # Already showing this; only throttling/driver errors return False.
+                return True
+
+            now = time.time()
+            if self.min_interval and now - self._last_update_ts < self.min_interval:
                 return False
 
             try:
@@ -325,3 +326,21 @@ def get_lcd_display():
     if _LCD_INSTANCE is None:
         _LCD_INSTANCE = LCDDisplay()
     return _LCD_INSTANCE
+
+
+def lcd_person_from_result(result):
+    if not result or not result.get("has_face"):
+        return "NONE", ""
+    size_status = result.get("size_status")
+    if size_status == "too_small":
+        return "MOVE_CLOSE", ""
+    if size_status == "too_large":
+        return "MOVE_FAR", ""
+    if result.get("is_real") is False:
+        return "SPOOF", ""
+    rid = result.get("id")
+    name = result.get("name")
+    score = result.get("score")
+    if rid and name and score is not None:
+        return "KNOWN", str(name)
+    return "UNKNOWN", ""